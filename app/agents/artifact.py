@@ -0,0 +1,335 @@
+"""
+Precompiled serving artifact.
+
+Everything the agents otherwise parse on every process start (the merged
+knowledge base, synonyms, severity weights, the symptom vocabulary and the
+NumPy model parameters) compiled into ONE file that is memory-mapped
+read-only. Loading it needs no pandas and no CSV parsing; the model arrays
+are views straight into the mapping, so every worker on the host shares the
+same page-cache pages.
+
+    python -m app.agents.artifact            # build ml_models/mediassist.artifact
+
+train_model.py rebuilds it after training. Layout:
+
+    8 bytes    MAGIC
+    8 bytes    header length, little-endian
+    header     UTF-8 JSON: sources, knowledge, synonyms, weights, vocabulary,
+               disease_symptoms, model
+    arrays     raw little-endian float64, each at a 64-byte aligned offset
+
+Every section records the size, mtime and SHA-1 of the files it was compiled
+from; an agent only uses a section whose sources are unchanged, and falls
+back to reading the sources otherwise. The file is always replaced with a
+new inode (write + rename), never rewritten in place, so a mapping held by
+an older snapshot stays valid across a hot reload.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "..", "data")
+MODEL_DIR = os.path.join(BASE_DIR, "..", "..", "ml_models")
+FILENAME = "mediassist.artifact"
+
+MAGIC = b"MEDIART\x00"
+FORMAT = 1
+_ALIGN = 64
+_PREAMBLE = struct.Struct("<8sQ")
+
+
+def default_path():
+    """MEDIASSIST_ARTIFACT overrides the location; "0" disables the artifact."""
+    return os.environ.get("MEDIASSIST_ARTIFACT", os.path.join(MODEL_DIR, FILENAME))
+
+
+def model_source(model_dir=MODEL_DIR):
+    """The model file SymptomAgent would load: the NumPy arrays, else the pickle."""
+    arrays_path = os.path.join(model_dir, "symptom_model.npz")
+    if os.path.exists(arrays_path):
+        return arrays_path
+    return os.path.join(model_dir, "symptom_model.pkl")
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _describe_source(path):
+    stat = os.stat(path)
+    return {"name": os.path.basename(path), "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns, "sha1": _sha1(path)}
+
+
+class Artifact:
+    """A mapped artifact file. Sections are read from the JSON header on demand."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_len = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a MediAssist artifact")
+        self.header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_len])
+        if self.header.get("format") != FORMAT:
+            raise ValueError(f"{path} has format {self.header.get('format')}, expected {FORMAT}")
+        self.version = self.header["version"]
+        self._fresh = {}
+
+    def matches(self, sources):
+        """
+        True if every {role: path} in `sources` is the file this artifact was
+        compiled from. A changed size/mtime falls back to comparing SHA-1s,
+        so copying a deployment around doesn't invalidate the artifact.
+        """
+        recorded = self.header["sources"]
+        for role, path in sources.items():
+            expected = recorded.get(role)
+            if expected is None or os.path.basename(path) != expected["name"]:
+                return False
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_size != expected["size"]:
+                return False
+            if stat.st_mtime_ns == expected["mtime_ns"]:
+                continue
+            key = (path, stat.st_mtime_ns, stat.st_size)
+            if key not in self._fresh:
+                self._fresh[key] = _sha1(path) == expected["sha1"]
+            if not self._fresh[key]:
+                return False
+        return True
+
+    @property
+    def knowledge(self):
+        """[(name, description, precautions)] as KnowledgeIndex takes them."""
+        return self.header["knowledge"]
+
+    @property
+    def synonyms(self):
+        return self.header["synonyms"]
+
+    @property
+    def severity_weights(self):
+        return self.header["severity_weights"]
+
+    @property
+    def vocabulary(self):
+        return self.header["vocabulary"]
+
+    @property
+    def disease_symptoms(self):
+        """{disease: symptoms} from dataset.csv; None in artifacts built before the index."""
+        return self.header.get("disease_symptoms")
+
+    @property
+    def has_model(self):
+        return self.header.get("model") is not None
+
+    def array(self, name):
+        """Read-only NumPy view of one stored array; no copy is made."""
+        import numpy as np
+
+        spec = self.header["arrays"][name]
+        count = 1
+        for dim in spec["shape"]:
+            count *= dim
+        return np.frombuffer(self._mmap, dtype=spec["dtype"], count=count,
+                             offset=spec["offset"]).reshape(spec["shape"])
+
+    def scorer(self):
+        """NaiveBayesScorer whose arrays live in the mapping."""
+        from app.agents.inference import NaiveBayesScorer
+
+        model = self.header["model"]
+        return NaiveBayesScorer(
+            vocabulary=model["vocabulary"],
+            idf=self.array("idf"),
+            feature_log_prob_t=self.array("feature_log_prob_t"),
+            class_log_prior=self.array("class_log_prior"),
+            classes=model["classes"],
+            stop_words=model["stop_words"],
+            ngram_range=model["ngram_range"],
+            sublinear_tf=model["sublinear_tf"],
+            norm=model["norm"],
+        )
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load(path=None):
+    """
+    The artifact at `path` (default_path()), or None if there is none or it
+    can't be read. Mapped once per file version and shared by every agent.
+    """
+    path = path or default_path()
+    if path == "0":
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            artifact = Artifact(path)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            # Reported like the agents' own load failures; they read their sources instead
+            print(f"Artifact: ignoring {path}, agents will read their source files: {e}")
+            artifact = None
+        _cache[path] = (key, artifact)
+        return artifact
+
+
+def build(path=None, data_dir=DATA_DIR, model_dir=MODEL_DIR):
+    """
+    Compiles the CSVs and the exported model into an artifact at `path`.
+    The model section is left out (and served from ml_models/ as before)
+    when the model can't be expressed by the NumPy scorer.
+    """
+    import numpy as np
+    from app.agents.disease_index import read_disease_symptoms
+    from app.agents.extraction import load_vocabulary
+    from app.agents.knowledge_agent import KnowledgeAgent
+    from app.agents.severity import read_weights
+
+    path = path or os.path.join(model_dir, FILENAME)
+    desc_path = os.path.join(data_dir, "symptom_Description.csv")
+    prec_path = os.path.join(data_dir, "symptom_precaution.csv")
+    severity_path = os.path.join(data_dir, "Symptom-severity.csv")
+    dataset_path = os.path.join(data_dir, "dataset.csv")
+
+    agent = KnowledgeAgent(desc_path=desc_path, prec_path=prec_path, use_artifact=False)
+    if agent.index is None:
+        raise ValueError("knowledge base could not be loaded")
+    knowledge = [[r["name"], r["description"], list(r["precautions"])] for r in agent.index.records.values()]
+
+    sources = {
+        "description": _describe_source(desc_path),
+        "precautions": _describe_source(prec_path),
+        "severity": _describe_source(severity_path),
+        "dataset": _describe_source(dataset_path),
+    }
+    header = {
+        "format": FORMAT,
+        "knowledge": knowledge,
+        "synonyms": agent.synonyms,
+        "severity_weights": read_weights(severity_path),
+        "vocabulary": sorted(load_vocabulary(data_dir)),
+        "disease_symptoms": read_disease_symptoms(dataset_path),
+        "model": None,
+        "arrays": {},
+    }
+
+    arrays = {}
+    scorer = _export_model(model_source(model_dir))
+    if scorer is not None:
+        sources["model"] = _describe_source(model_source(model_dir))
+        vocabulary = sorted(scorer.vocabulary, key=scorer.vocabulary.get)
+        header["model"] = {
+            "vocabulary": vocabulary,
+            "classes": [str(c) for c in scorer.classes_],
+            "stop_words": sorted(scorer.stop_words),
+            "ngram_range": list(scorer.ngram_range),
+            "sublinear_tf": scorer.sublinear_tf,
+            "norm": scorer.norm,
+        }
+        arrays = {
+            "idf": scorer.idf,
+            "feature_log_prob_t": scorer.feature_log_prob_t,
+            "class_log_prior": scorer.class_log_prior,
+        }
+
+    header["sources"] = sources
+    digest = hashlib.sha1(json.dumps(sources, sort_keys=True).encode())
+    digest.update(FILENAME.encode())
+    header["version"] = digest.hexdigest()[:12]
+
+    # Array offsets depend on the header length, which depends on the offsets:
+    # lay out relative to a header size rounded up generously, then fix it.
+    blobs = {name: np.ascontiguousarray(a, dtype="<f8") for name, a in arrays.items()}
+    reserve = 0
+    while True:
+        offset = _align(_PREAMBLE.size + reserve)
+        for name, blob in blobs.items():
+            header["arrays"][name] = {"offset": offset, "dtype": "<f8", "shape": list(blob.shape)}
+            offset = _align(offset + blob.nbytes)
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(encoded) <= reserve:
+            break
+        reserve = len(encoded) + 1024
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".artifact-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, len(encoded)))
+            f.write(encoded)
+            for name, blob in blobs.items():
+                f.write(b"\0" * (header["arrays"][name]["offset"] - f.tell()))
+                f.write(blob.tobytes())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates it owner-only
+        # New inode: processes that mapped the old file keep a valid mapping
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def _align(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _export_model(model_path):
+    """NaiveBayesScorer for the model file, or None if it can't be exported."""
+    from app.agents.inference import NaiveBayesScorer, export_pipeline
+
+    if not os.path.exists(model_path):
+        return None
+    if model_path.endswith(".npz"):
+        return NaiveBayesScorer.load(model_path)
+
+    import joblib
+    with tempfile.TemporaryDirectory() as tmp:
+        arrays_path = os.path.join(tmp, "symptom_model.npz")
+        if not export_pipeline(joblib.load(model_path), arrays_path):
+            return None
+        return NaiveBayesScorer.load(arrays_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the knowledge base and model into a mapped artifact.")
+    parser.add_argument("--output", default=None, help=f"Artifact path (default: <model-dir>/{FILENAME})")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory with the knowledge CSVs")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="Directory with symptom_model.npz/.pkl")
+    args = parser.parse_args(argv)
+
+    path = build(args.output, args.data_dir, args.model_dir)
+    artifact = Artifact(path)
+    model = "model included" if artifact.has_model else "no exportable model, served from ml_models/"
+    print(f"📦 Artifact {artifact.version} written to {os.path.normpath(path)} "
+          f"({os.path.getsize(path) / 1024:.1f} KB, {len(artifact.knowledge)} diseases, {model})")
+    return path
+
+
+if __name__ == "__main__":
+    main()
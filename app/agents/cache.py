@@ -0,0 +1,222 @@
+"""
+Response caches.
+
+ResponseCache is the per-process tier: an LRU dict, nanoseconds per hit.
+SQLiteCache is an optional shared tier behind it (MEDIASSIST_SHARED_CACHE=sqlite):
+one SQLite file in WAL mode that every worker on the host reads and writes, so
+a freshly forked or restarted worker starts warm and no two workers compute
+the same answer twice.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_message(message):
+    """Cache key: lowercase, single spaces, no trailing '?'/'.'."""
+    return " ".join(str(message).lower().split()).rstrip("? .")
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a time-to-live.
+    maxsize=0 disables caching entirely.
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        if not self.maxsize:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if self.ttl and expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if not self.maxsize:
+            return
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Invalidation hook: drops everything (e.g. after a model reload)."""
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Shared cache in a SQLite file (WAL mode: readers never block the writer).
+    Same get/set/clear/stats interface as ResponseCache; values must be JSON
+    serializable. Callers put everything the value depends on (model and
+    knowledge versions) into the key, so the file never needs clearing when
+    one worker reloads. Rows older than `ttl` and all but the `maxsize` most
+    recently written ones are pruned every `prune_every` writes. Hits don't
+    refresh a row: that would turn every read into a write.
+    """
+
+    def __init__(self, path, maxsize=100_000, ttl=3600, prune_every=512, clock=time.time):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self._clock = clock
+        self._local = threading.local()  # sqlite3 connections are per thread
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+        conn = self._connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS responses "
+                     "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_stored ON responses (stored)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute("SELECT value, stored FROM responses WHERE key = ?",
+                                         (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            if self.ttl and row[1] + self.ttl <= self._clock():
+                # Left for prune(): deleting here would take the write lock
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO responses (key, value, stored) VALUES (?, ?, ?)",
+                     (key, json.dumps(value), self._clock()))
+        with self._lock:
+            self.writes += 1
+            prune = self.writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        conn = self._connection()
+        if self.ttl:
+            conn.execute("DELETE FROM responses WHERE stored <= ?", (self._clock() - self.ttl,))
+        conn.execute("DELETE FROM responses WHERE key IN "
+                     "(SELECT key FROM responses ORDER BY stored DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+
+    def clear(self):
+        """Drops every row, for every worker sharing the file."""
+        self._connection().execute("DELETE FROM responses")
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self):
+        size = len(self)
+        with self._lock:
+            return {
+                "size": size,
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def create_shared_cache():
+    """Shared tier configured from the environment; None when disabled (the default)."""
+    backend = os.environ.get("MEDIASSIST_SHARED_CACHE", "off").lower()
+    if backend in ("off", "0", "none", ""):
+        return None
+    if backend != "sqlite":
+        raise ValueError(f"Unknown MEDIASSIST_SHARED_CACHE '{backend}'. Use 'off' or 'sqlite'.")
+    path = os.environ.get("MEDIASSIST_SHARED_CACHE_DB",
+                          os.path.join(tempfile.gettempdir(), "mediassist_cache.sqlite3"))
+    return SQLiteCache(
+        path,
+        maxsize=int(os.environ.get("MEDIASSIST_SHARED_CACHE_SIZE", 100_000)),
+        ttl=float(os.environ.get("MEDIASSIST_CACHE_TTL", 3600)),
+    )
+
+
+_shared = None
+_shared_created = False
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """Shared tier, opened on first use (after the fork under gunicorn), or None."""
+    global _shared, _shared_created
+    if not _shared_created:
+        with _shared_lock:
+            if not _shared_created:
+                _shared = create_shared_cache()
+                _shared_created = True
+    return _shared
@@ -1,71 +1,407 @@
-import re
-from app.agents.triage_agent import triage_agent
-from app.agents.symptom_agent import symptom_agent
-from app.agents.knowledge_agent import knowledge_agent
+import asyncio
+import functools
+import os
+from app.agents import events, metrics, providers, sessions, templates
+from app.agents.cache import ResponseCache, get_shared_cache, normalize_message
+from app.agents.providers import warmup  # noqa: F401  (re-exported for servers)
 
-def generate_response(user_message):
-    
-    # --- 1. SAFETY FIRST: Triage Check ---
-    triage_status, triage_msg = triage_agent.check_triage(user_message)
-    if triage_status == "EMERGENCY":
-        return triage_msg
+# Intent patterns live in app.agents.intent (compiled once, in the extractor's router)
+
+NO_ANALYSIS_MSG = templates.NO_ANALYSIS_MSG
+
+# --- RESPONSE CACHE ---
+# Only non-emergency answers are cached; triage always runs first.
+# Behind it, optionally, a cache shared by every worker (cache.get_shared_cache()).
+response_cache = ResponseCache(
+    maxsize=int(os.environ.get("MEDIASSIST_CACHE_SIZE", 1024)),
+    ttl=float(os.environ.get("MEDIASSIST_CACHE_TTL", 3600)),
+)
+events.subscribe(events.MODEL_RELOADED, response_cache.clear)
+events.subscribe(events.KNOWLEDGE_RELOADED, response_cache.clear)
+
+
+class _Pinned:
+    """
+    The knowledge/model snapshots one request runs against, so a hot reload
+    in the middle of a request can't mix old and new data.
+    """
+    __slots__ = ("knowledge", "model")
+
+    def __init__(self):
+        self.knowledge = providers.knowledge.get().snapshot
+        self.model = None  # pinned when the model is first needed
+
+    def model_snapshot(self):
+        if self.model is None:
+            self.model = providers.symptom.get().snapshot
+        return self.model
+
+    def is_current(self):
+        if self.knowledge is not providers.knowledge.get().snapshot:
+            return False
+        return self.model is None or self.model is providers.symptom.get().snapshot
 
-    # --- 2. INTENT CLASSIFICATION ---
-    knowledge_pattern = r"^(what is|what's|what are|how does|tell me about|define|explain)\b"
-    symptom_pattern = r"\b(i have|i feel|my \w+ hurts|pain|ache|fever|cough|rash|vomiting|stool)\b"
+    def versions(self):
+        """'knowledge/model' content versions, for keys that outlive a reload."""
+        return "/".join(snapshot.version if snapshot is not None else "-"
+                        for snapshot in (self.knowledge, self.model_snapshot()))
 
-    user_text_lower = user_message.lower().strip()
 
-    # --- CASE A: USER ASKS A QUESTION ---
-    if re.search(knowledge_pattern, user_text_lower):
-        topic = re.sub(knowledge_pattern, "", user_text_lower).strip("? .")
-        
+def _answer_knowledge(parsed, pinned, fmt=templates.MARKDOWN):
+    """Returns the knowledge answer for 'what is ...' style questions, or None."""
+    if parsed.topic is not None:
         # Get Info (Name, Desc, Precautions)
-        data = knowledge_agent.get_info(topic)
-        
+        data = providers.knowledge.get().get_info(parsed, snapshot=pinned.knowledge)
+
         if data:
-            # SUCCESS: Use the OFFICIAL NAME from 'data['name']'
-            response = f"**About {data['name']}:**\n{data['description']}\n"
-            if data['precautions']:
-                response += "\n**Precautions/Steps:**\n" + "\n".join([f"- {p}" for p in data['precautions']])
-            return response
-        else:
-            # FAIL: Pass through to symptom check just in case
-            pass 
+            # SUCCESS: the "About <official name>" block is prerendered
+            return pinned.knowledge.data.template(data).about[fmt]
+
+    # FAIL: Pass through to symptom check just in case
+    return None
+
 
-    # --- CASE B: SYMPTOM ANALYSIS ---
-    predictions = symptom_agent.predict_disease(user_message)
+def _has_prediction(predictions):
+    return bool(predictions) and "error" not in predictions
 
-    if not predictions or "error" in predictions:
-        return "I'm sorry, I couldn't analyze your input. Are you describing symptoms or asking for medical information? Please try being more specific."
 
+def _prediction_parts(predictions, pinned, fmt=templates.MARKDOWN, symptoms=()):
+    """
+    The symptom-analysis answer in display order: headline, overview, steps,
+    disclaimer. JSON answers also list which of the reported `symptoms` the
+    predicted condition is known for, and the conditions that best match
+    them by DiseaseIndex.rank, each with its score and matched symptoms.
+    """
     # Get top prediction
-    top_disease = list(predictions.keys())[0]
-    confidence = predictions[top_disease]
+    top_disease, confidence = next(iter(predictions.items()))
 
-    # Get Info for the predicted disease
-    data = knowledge_agent.get_info(top_disease)
+    # Get Info for the predicted disease; use its corrected name if we found it
+    data = providers.knowledge.get().get_info(top_disease, snapshot=pinned.knowledge)
+    if data:
+        template = pinned.knowledge.data.template(data)
+    else:
+        template = templates.DiseaseTemplate.missing(top_disease)
 
-    # Build Response
-    response = ""
+    headline = template.headline(confidence, fmt)
+    if fmt == templates.JSON:
+        index = providers.disease_index.get()
+        headline["matched_symptoms"] = list(index.matched(top_disease, symptoms))
+        headline["related_conditions"] = [
+            {"condition": match.disease, "score": round(match.score, 4), "matched_symptoms": list(match.matched)}
+            for match in index.rank(symptoms)
+        ]
+
+    return [
+        headline,
+        template.overview[fmt],
+        template.steps[fmt],
+        templates.disclaimer(fmt),
+    ]
+
+
+def _format_prediction(predictions, triage_status, triage_msg, pinned, fmt=templates.MARKDOWN, symptoms=()):
+    """Builds the symptom-analysis answer from a predict_disease result."""
+    if not _has_prediction(predictions):
+        return templates.message(NO_ANALYSIS_MSG, fmt)
+    parts = _prediction_parts(predictions, pinned, fmt, symptoms)
     if triage_status == "URGENT":
-        response += f"⚠️ **{triage_msg}**\n\n"
+        parts.insert(0, templates.urgent_warning(triage_msg, fmt))
+    return templates.join(parts, fmt)
 
-    # Use the corrected name if we found data, otherwise use the prediction raw string
-    display_name = data['name'] if data else top_disease
 
-    response += f"Based on your symptoms, a likely condition is **{display_name}** ({int(confidence*100)}% match).\n\n"
-    
-    if data:
-        response += f"**Overview:** {data['description']}\n\n"
-        response += "**Recommended Steps:**\n"
-        if data['precautions']:
-            for p in data['precautions']:
-                response += f"- {p}\n"
+def _cache_key(user_message, fmt):
+    key = normalize_message(user_message)
+    return key if fmt == templates.MARKDOWN else (fmt, key)
+
+
+def _shared_key(cache_key, pinned):
+    fmt, key = cache_key if isinstance(cache_key, tuple) else (templates.MARKDOWN, cache_key)
+    return f"{pinned.versions()}/{fmt}/{key}"
+
+
+def _lookup(cache_key, pinned):
+    """
+    (response or None, "hit" | "shared_hit" | "miss"). Read-through: a hit in
+    the shared tier is kept in this process's cache for next time.
+    """
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached, "hit"
+    shared = get_shared_cache()
+    if shared is not None:
+        cached = shared.get(_shared_key(cache_key, pinned))
+        if cached is not None:
+            if pinned.is_current():
+                response_cache.set(cache_key, cached)
+            return cached, "shared_hit"
+    return None, "miss"
+
+
+def generate_response(user_message, session_id=None, fmt=templates.MARKDOWN):
+    """
+    Answers one chat message. With a `session_id`, symptoms reported in
+    earlier turns of that session count towards the prediction too.
+    `fmt` is a templates format: markdown (default), text or json (a dict).
+    """
+    return templates.join(_traced(user_message, session_id, fmt), fmt)
+
+
+def iter_response(user_message, session_id=None, fmt=templates.MARKDOWN):
+    """
+    Streaming version of generate_response: yields the answer in parts as
+    soon as each one is known. Emergency and URGENT warnings go out right
+    after triage, before any model work; then the prediction headline, the
+    overview and the recommended steps. JSON parts are copies the caller may
+    modify.
+    """
+    return templates.copies(_traced(user_message, session_id, fmt), fmt)
+
+
+def _traced(user_message, session_id, fmt):
+    """_respond, timed and counted as one request."""
+    trace = metrics.start_request()
+    try:
+        intent = yield from _respond(user_message, session_id, fmt, trace)
+    except GeneratorExit:
+        # Client went away mid-stream
+        trace.finish("disconnected")
+        raise
+    trace.finish(intent)
+
+
+def _respond(user_message, session_id, fmt, trace):
+    """Yields the response parts; returns the request's intent."""
+    # --- 0. Parse once; every agent below reads the same ParsedMessage ---
+    with trace.span("extract"):
+        parsed = providers.extractor.get().parse(user_message)
+
+    # --- 1. SAFETY FIRST: Triage Check ---
+    with trace.span("triage"):
+        triage_status, triage_msg = providers.triage.get().check_triage(parsed)
+    if triage_status == "EMERGENCY":
+        yield templates.emergency(triage_msg, fmt)
+        return "emergency"
+
+    # Greetings & co. need no cache, knowledge or model work
+    if parsed.intent.short_circuit:
+        yield templates.message(parsed.intent.reply, fmt)
+        return parsed.intent.name
+
+    if session_id is not None:
+        return (yield from _answer_in_session(parsed, session_id, triage_status, triage_msg, fmt, trace))
+
+    pinned = _Pinned()
+
+    # --- 2. CACHE (safe: emergencies never reach this point) ---
+    with trace.span("cache"):
+        cache_key = _cache_key(user_message, fmt)
+        cached, result = _lookup(cache_key, pinned)
+    metrics.registry.inc("mediassist_cache_requests_total", {"result": result})
+    if cached is not None:
+        yield cached
+        return "cached"
+
+    # --- 3. CASE A: USER ASKS A QUESTION ---
+    # (URGENT symptom loads go straight to analysis so the warning is shown)
+    parts = []
+    if triage_status != "URGENT":
+        with trace.span("knowledge"):
+            answer = _answer_knowledge(parsed, pinned, fmt)
+        if answer:
+            yield answer
+            _remember(cache_key, answer, pinned)
+            return "knowledge"
     else:
-        response += f"**Overview:** I couldn't find specific details for '{display_name}' in the knowledge base, but please consult a doctor.\n"
-        response += "**Recommended Steps:**\n- Consult a doctor for specific advice.\n"
+        parts.append(templates.urgent_warning(triage_msg, fmt))
+        yield parts[0]
+
+    # --- 4. CASE B: SYMPTOM ANALYSIS ---
+    with trace.span("predict"):
+        predictions = providers.symptom.get().predict_disease(parsed, snapshot=pinned.model_snapshot())
+    if not _has_prediction(predictions):
+        yield templates.message(NO_ANALYSIS_MSG, fmt)
+        return "unknown"
+    with trace.span("format"):
+        parts.extend(_prediction_parts(predictions, pinned, fmt, parsed.symptoms))
+    yield from parts[1 if triage_status == "URGENT" else 0:]
+
+    _remember(cache_key, templates.join(parts, fmt), pinned)
+    return "urgent" if triage_status == "URGENT" else "symptom"
+
+
+def _answer_in_session(parsed, session_id, triage_status, triage_msg, fmt, trace):
+    """
+    Multi-turn variant of steps 3-4. Answers depend on earlier turns, so the
+    response cache is bypassed. Yields the response parts; returns the intent.
+    """
+    pinned = _Pinned()
+    if triage_status != "URGENT":
+        with trace.span("knowledge"):
+            answer = _answer_knowledge(parsed, pinned, fmt)
+        if answer:
+            yield answer
+            return "knowledge"
+    else:
+        yield templates.urgent_warning(triage_msg, fmt)
+
+    # Nothing is yielded while the lock is held: the next part may be
+    # requested from another thread (ASGI streaming)
+    def add_turn(session):
+        with trace.span("predict"):
+            # Only this turn's terms are added to the session's running NB sums
+            predictions = providers.symptom.get().predict_session(
+                session, parsed, snapshot=pinned.model_snapshot()
+            )
+        session.turns += 1
+        session.add_symptoms(parsed.symptoms)
+        return predictions
+
+    with sessions.session_lock(session_id):
+        session, predictions = sessions.get_store().update(session_id, add_turn)
+
+    if not _has_prediction(predictions):
+        yield templates.message(NO_ANALYSIS_MSG, fmt)
+        return "unknown"
+
+    # Severity counts everything reported so far, not just this message
+    if triage_status == "SAFE":
+        urgent = providers.triage.get().check_urgent(session.symptoms)
+        if urgent:
+            triage_status, triage_msg = urgent
+            yield templates.urgent_warning(triage_msg, fmt)
+
+    with trace.span("format"):
+        parts = _prediction_parts(predictions, pinned, fmt, session.symptoms)
+    if session.turns > 1 and session.symptoms:
+        yield templates.session_note(session.symptoms, fmt)
+    yield from parts
+    return "urgent" if triage_status == "URGENT" else "symptom"
+
+
+def _remember(cache_key, response, pinned):
+    # Nothing computed from a snapshot replaced mid-request is cached.
+    # (Failures may be transient, e.g. model missing; callers don't pass them.)
+    if pinned.is_current():
+        response_cache.set(cache_key, response)
+        shared = get_shared_cache()
+        if shared is not None:
+            shared.set(_shared_key(cache_key, pinned), response)
+
+
+# Messages per /api/chat/batch request, so one request can't hold a worker for long
+MAX_BATCH = int(os.environ.get("MEDIASSIST_MAX_BATCH", 100))
+
+
+def message_from_request(data):
+    """
+    Reads the "message" of a chat request body.
+    Returns (stripped message, None, 200), or (None, error, HTTP status).
+    """
+    if not isinstance(data, dict):
+        return None, "Expected a JSON object.", 400
+    message = data.get("message", "")
+    if not isinstance(message, str):
+        return None, "'message' must be a string.", 400
+    return message.strip(), None, 200
+
+
+def batch_from_request(data):
+    """
+    Reads the "messages" of a batch request body.
+    Returns (stripped messages, None, 200), or (None, error, HTTP status).
+    """
+    if not isinstance(data, dict):
+        return None, "Expected a JSON object.", 400
+    messages = data.get("messages", [])
+    if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+        return None, "'messages' must be a list of strings.", 400
+    if len(messages) > MAX_BATCH:
+        return None, f"Too many messages: at most {MAX_BATCH} per batch.", 413
+    return [m.strip() for m in messages], None, 200
+
+
+def generate_responses(user_messages, fmt=templates.MARKDOWN):
+    """
+    Batch version of generate_response.
+    Triage and knowledge questions are answered per message; everything left
+    goes through the model in ONE predict_disease_batch call.
+    """
+    responses = [None] * len(user_messages)
+    pending = []  # (parsed, index, cache_key, triage_status, triage_msg)
+    pinned = None
+    extractor = providers.extractor.get()
+
+    for i, user_message in enumerate(user_messages):
+        parsed = extractor.parse(user_message)
+        triage_status, triage_msg = providers.triage.get().check_triage(parsed)
+        if triage_status == "EMERGENCY":
+            responses[i] = templates.emergency(triage_msg, fmt)
+            continue
+        if parsed.intent.short_circuit:
+            responses[i] = templates.message(parsed.intent.reply, fmt)
+            continue
+
+        pinned = pinned or _Pinned()
+        cache_key = _cache_key(user_message, fmt)
+        cached, _ = _lookup(cache_key, pinned)
+        if cached is not None:
+            responses[i] = templates.copy(cached, fmt)
+            continue
+
+        answer = _answer_knowledge(parsed, pinned, fmt) if triage_status != "URGENT" else None
+        if answer:
+            responses[i] = templates.copy(answer, fmt)
+            _remember(cache_key, answer, pinned)
+            continue
+
+        pending.append((parsed, i, cache_key, triage_status, triage_msg))
+
+    if pending:
+        batch = providers.symptom.get().predict_disease_batch(
+            [parsed for parsed, _, _, _, _ in pending], snapshot=pinned.model_snapshot()
+        )
+        for (parsed, i, cache_key, triage_status, triage_msg), predictions in zip(pending, batch):
+            response = _format_prediction(predictions, triage_status, triage_msg, pinned, fmt, parsed.symptoms)
+            if _has_prediction(predictions):
+                _remember(cache_key, response, pinned)
+            responses[i] = templates.copy(response, fmt)
+
+    return responses
+
+
+class CoordinatorAgent:
+    """
+    In-process chat interface, for UIs that import the agents directly
+    (streamlit_app.py) instead of calling the HTTP API: no network hop, no
+    JSON round trip. Same answers as /api/chat.
+    """
+
+    def __init__(self, executor=None):
+        self.executor = executor  # for process_message_async; None = the loop's default
+
+    def warmup(self):
+        """Loads the model and knowledge base now instead of on the first message."""
+        warmup()
+        return self
+
+    def process_message(self, message, session_id=None, fmt=templates.MARKDOWN):
+        return generate_response(message, session_id, fmt)
+
+    def iter_message(self, message, session_id=None, fmt=templates.MARKDOWN):
+        """The answer in parts, as iter_response streams them."""
+        return iter_response(message, session_id, fmt)
+
+    async def process_message_async(self, message, session_id=None, fmt=templates.MARKDOWN):
+        """process_message in a worker thread, so the event loop isn't blocked by inference."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(generate_response, message, session_id, fmt)
+        )
+
+    def process_messages(self, messages, fmt=templates.MARKDOWN):
+        """Batch version: one model call for every message that needs one."""
+        return generate_responses(messages, fmt)
 
-    response += "\n*Disclaimer: I am an AI, not a doctor. This is for informational purposes only.*"
 
-    return response 
+# Agents load lazily: importing this doesn't read the model until first use
+coordinator_agent = CoordinatorAgent()
@@ -0,0 +1,173 @@
+"""
+Disease-symptom inverted index.
+
+dataset.csv has ~4.9k rows but only a few hundred distinct disease/symptom
+combinations. They are folded once, at load time, into:
+
+    symptom -> posting list of the diseases listing it
+    disease -> its set of symptoms, and their total severity weight
+
+The candidate diseases for a message are the union of a few posting lists,
+and ranking them is one weight sum per shared symptom: microseconds, and
+every result says which of the reported symptoms it matched. SymptomAgent
+can use the candidates as a prefilter, so only plausible classes are scored
+by the model (MEDIASSIST_PREFILTER=1).
+
+Posting lists rather than bitsets (a Python int per symptom, OR-ed
+together): both rank() and the prefilter need the candidates one by one,
+and walking the set bits of an int as wide as the catalog was about twice
+as slow as walking the postings, from 47 up to 50k diseases.
+"""
+import csv
+import heapq
+import os
+
+from app.agents import artifact, events, providers
+from app.agents.extraction import DATA_DIR, NOT_SYMPTOMS, canonical_symptom
+from app.agents.severity import DEFAULT_PATH as SEVERITY_PATH, SeverityScorer, read_weights
+
+DATASET_PATH = os.path.join(DATA_DIR, "dataset.csv")
+
+
+def read_disease_symptoms(path=DATASET_PATH):
+    """{disease: sorted canonical symptoms} over every row of dataset.csv."""
+    table = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if not row or not row[0]:
+                continue
+            table.setdefault(row[0], set()).update(canonical_symptom(cell) for cell in row[1:])
+    return {disease: sorted(symptoms - NOT_SYMPTOMS - {""}) for disease, symptoms in table.items()}
+
+
+def default_disease_symptoms():
+    """read_disease_symptoms(), served from the compiled artifact when it is current."""
+    compiled = artifact.load()
+    if compiled is not None and compiled.disease_symptoms is not None and compiled.matches({"dataset": DATASET_PATH}):
+        return compiled.disease_symptoms
+    return read_disease_symptoms()
+
+
+def default_weights():
+    """Severity weights by canonical symptom, as the triage agent reads them."""
+    compiled = artifact.load()
+    if compiled is not None and compiled.matches({"severity": SEVERITY_PATH}):
+        return SeverityScorer(compiled.severity_weights).weights
+    return SeverityScorer(read_weights()).weights
+
+
+class DiseaseMatch:
+    __slots__ = ("disease", "score", "matched")
+
+    def __init__(self, disease, score, matched):
+        self.disease = disease
+        self.score = score            # severity-weighted Jaccard, 0..1
+        self.matched = matched        # reported symptoms this disease lists, in report order
+
+    def __repr__(self):
+        return f"DiseaseMatch({self.disease!r}, {self.score:.3f}, matched={self.matched!r})"
+
+
+class DiseaseIndex:
+    def __init__(self, disease_symptoms=None, weights=None, default_weight=1.0):
+        if disease_symptoms is None:
+            disease_symptoms = default_disease_symptoms()
+        if weights is None:
+            weights = default_weights()
+        self.diseases = tuple(disease_symptoms)
+        self.position = {disease: i for i, disease in enumerate(self.diseases)}
+        self.symptom_sets = tuple(frozenset(symptoms) for symptoms in disease_symptoms.values())
+        self.weights = {symptom: float(weight) for symptom, weight in weights.items()}
+        self.default_weight = float(default_weight)
+        self.totals = tuple(sum(self.weight(s) for s in symptoms) for symptoms in self.symptom_sets)
+
+        postings = {}
+        for i, symptoms in enumerate(self.symptom_sets):
+            for symptom in symptoms:
+                postings.setdefault(symptom, []).append(i)
+        self.postings = {symptom: tuple(diseases) for symptom, diseases in postings.items()}
+
+        self._columns = (None, None)  # (model classes, ({symptom: columns}, unindexed columns))
+
+    def __len__(self):
+        return len(self.diseases)
+
+    def weight(self, symptom):
+        return self.weights.get(symptom, self.default_weight)
+
+    def matched(self, disease, symptoms):
+        """The reported `symptoms` that `disease` lists (empty if it isn't indexed)."""
+        position = self.position.get(disease)
+        if position is None:
+            return ()
+        listed = self.symptom_sets[position]
+        return tuple(symptom for symptom in symptoms if symptom in listed)
+
+    def rank(self, symptoms, top_k=3):
+        """
+        Top-k DiseaseMatch by severity-weighted Jaccard between the reported
+        symptoms and each disease's symptoms. Only candidate diseases (at
+        least one shared symptom) are looked at.
+        """
+        reported = tuple(dict.fromkeys(symptoms))
+        hits = {}    # disease position -> matched symptoms
+        shared = {}  # disease position -> their summed weight
+        for symptom in reported:
+            weight = self.weight(symptom)
+            for i in self.postings.get(symptom, ()):
+                if i in hits:
+                    hits[i].append(symptom)
+                    shared[i] += weight
+                else:
+                    hits[i] = [symptom]
+                    shared[i] = weight
+        if not hits:
+            return []
+
+        reported_weight = sum(self.weight(s) for s in reported)
+        totals = self.totals
+        scored = [(shared[i] / (reported_weight + totals[i] - shared[i]), -i) for i in hits]
+        return [DiseaseMatch(self.diseases[-neg], score, tuple(hits[-neg]))
+                for score, neg in heapq.nlargest(top_k, scored)]
+
+    def columns(self, symptoms, classes):
+        """
+        Sorted column indices into `classes` (a model's classes_) worth
+        scoring for `symptoms`: the candidate diseases, plus any class the
+        index doesn't know and so can't rule out. None when there are no
+        candidates, i.e. nothing to narrow down.
+        """
+        known_classes, lookup = self._columns
+        if known_classes is not classes:
+            lookup = self._column_lookup(classes)
+            self._columns = (classes, lookup)
+        by_symptom, unindexed = lookup
+
+        cols = None
+        for symptom in symptoms:
+            listed = by_symptom.get(symptom)
+            if listed is not None:
+                if cols is None:
+                    cols = set(unindexed)
+                cols.update(listed)
+        return sorted(cols) if cols else None
+
+    def _column_lookup(self, classes):
+        column = {str(c): col for col, c in enumerate(classes)}
+        by_disease = [column.pop(disease, None) for disease in self.diseases]
+        by_symptom = {
+            symptom: tuple(by_disease[i] for i in diseases if by_disease[i] is not None)
+            for symptom, diseases in self.postings.items()
+        }
+        return by_symptom, tuple(column.values())  # left over: classes not indexed
+
+
+def get_disease_index():
+    """Shared instance, created on first use."""
+    return providers.disease_index.get()
+
+
+# A retrained model comes with a new dataset.csv
+events.subscribe(events.MODEL_RELOADED, providers.disease_index.reset)
@@ -0,0 +1,26 @@
+"""
+Tiny in-process pub/sub used to tell caches that agent data changed.
+"""
+import threading
+
+MODEL_RELOADED = "model_reloaded"
+KNOWLEDGE_RELOADED = "knowledge_reloaded"
+
+_listeners = {}
+_lock = threading.Lock()
+
+
+def subscribe(event, callback):
+    """Calls callback() every time `event` is published."""
+    with _lock:
+        _listeners.setdefault(event, []).append(callback)
+
+
+def publish(event):
+    with _lock:
+        callbacks = list(_listeners.get(event, ()))
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error in '{event}' listener: {e}")
@@ -0,0 +1,157 @@
+"""
+Message extraction stage.
+
+Every message is normalized and scanned ONCE here; triage, the symptom model
+and the knowledge agent all read the resulting ParsedMessage instead of
+re-lowercasing and re-scanning the raw text on their own.
+"""
+import csv
+import os
+import re
+
+from app.agents import artifact, providers
+from app.agents.intent import QUESTION_PATTERN, IntentRouter  # noqa: F401  (QUESTION_PATTERN re-exported)
+from app.agents.matcher import PhraseMatcher
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+_APOSTROPHE_RE = re.compile(r"['’]")
+# Punctuation and underscores become spaces ("skin_rash," -> "skin rash")
+_PUNCT_RE = re.compile(r"[^\w\s]|_")
+_SPACE_RE = re.compile(r"\s+")
+
+# Typos in the CSVs, and entries that aren't symptoms
+SPELLING_FIXES = {"foul_smell_ofurine": "foul_smell_of_urine"}
+NOT_SYMPTOMS = {"prognosis"}
+
+# Everyday wording -> canonical symptom the model was trained on
+ALIASES = {
+    "throwing up": "vomiting", "threw up": "vomiting", "puking": "vomiting", "vomit": "vomiting",
+    "tired": "fatigue", "exhausted": "fatigue",
+    "itchy": "itching", "itchiness": "itching",
+    "stomach ache": "stomach_pain", "stomachache": "stomach_pain", "tummy ache": "stomach_pain",
+    "tummy pain": "stomach_pain", "belly ache": "belly_pain",
+    "stuffy nose": "congestion", "blocked nose": "congestion",
+    "sneezing": "continuous_sneezing",
+    "dizzy": "dizziness",
+    "rash": "skin_rash",
+    "short of breath": "breathlessness", "out of breath": "breathlessness",
+    "joint ache": "joint_pain", "aching joints": "joint_pain",
+    "muscle ache": "muscle_pain", "body ache": "muscle_pain", "body aches": "muscle_pain",
+    "loose motion": "diarrhoea", "loose motions": "diarrhoea", "loose stools": "diarrhoea",
+    "yellow skin": "yellowish_skin", "yellow eyes": "yellowing_of_eyes",
+    "no appetite": "loss_of_appetite",
+    "head ache": "headache", "head pain": "headache",
+    "blurry vision": "blurred_and_distorted_vision",
+    "gained weight": "weight_gain", "lost weight": "weight_loss",
+    "shivers": "shivering",
+    "constipated": "constipation",
+    "nauseous": "nausea", "nauseated": "nausea",
+    "anxious": "anxiety", "depressed": "depression",
+    "sweaty": "sweating", "sweats": "sweating",
+}
+
+
+def canonical_symptom(name):
+    """'Skin_Rash ' / 'dischromic _patches' -> 'skin_rash' / 'dischromic_patches'."""
+    key = "_".join(str(name).replace("_", " ").lower().split())
+    return SPELLING_FIXES.get(key, key)
+
+
+def normalize(text):
+    """Lowercase, no punctuation/underscores, single spaces."""
+    text = _APOSTROPHE_RE.sub("", str(text).lower())
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def load_vocabulary(data_dir=DATA_DIR):
+    """Canonical symptoms from dataset.csv and Symptom-severity.csv."""
+    vocabulary = set()
+    with open(os.path.join(data_dir, "dataset.csv"), newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            vocabulary.update(canonical_symptom(cell) for cell in row[1:])
+    with open(os.path.join(data_dir, "Symptom-severity.csv"), newline="", encoding="utf-8") as f:
+        vocabulary.update(canonical_symptom(row["Symptom"]) for row in csv.DictReader(f))
+    vocabulary.discard("")
+    return vocabulary - NOT_SYMPTOMS
+
+
+def default_vocabulary():
+    """load_vocabulary(), served from the compiled artifact when it is current."""
+    compiled = artifact.load()
+    sources = {
+        "dataset": os.path.join(DATA_DIR, "dataset.csv"),
+        "severity": os.path.join(DATA_DIR, "Symptom-severity.csv"),
+    }
+    if compiled is not None and compiled.matches(sources):
+        return set(compiled.vocabulary)
+    return load_vocabulary()
+
+
+class ParsedMessage:
+    __slots__ = ("raw", "lower", "text", "topic", "symptoms", "model_text", "intent")
+
+    def __init__(self, raw, lower, text, topic, symptoms, model_text, intent=None):
+        self.raw = raw
+        self.lower = lower            # lowercase, whitespace collapsed (intent regexes)
+        self.text = text              # normalize(raw): what the phrase matchers scan
+        self.topic = topic            # "what is X" -> "x"; None if not a question
+        self.symptoms = symptoms      # canonical symptoms mentioned, text order, unique
+        self.model_text = model_text  # text with everyday wording mapped to training terms
+        self.intent = intent          # intent.Intent from the router
+
+    def __repr__(self):
+        return f"ParsedMessage({self.raw!r}, symptoms={self.symptoms!r})"
+
+
+class SymptomExtractor:
+    def __init__(self, vocabulary=None, aliases=ALIASES, router=None):
+        if vocabulary is None:
+            vocabulary = default_vocabulary()
+        self.vocabulary = frozenset(vocabulary)
+
+        phrases = {symptom.replace("_", " "): symptom for symptom in self.vocabulary}
+        for alias, symptom in aliases.items():
+            if symptom in self.vocabulary:
+                phrases.setdefault(alias, symptom)
+        self.matcher = PhraseMatcher(phrases)
+        self.router = router or IntentRouter()
+
+    def parse(self, message):
+        raw = str(message)
+        lower = " ".join(raw.lower().split())
+        text = normalize(raw)
+
+        symptoms = []
+        seen = set()
+        pieces = []
+        copied_until = 0
+        covered_until = -1
+        for symptom, phrase, start, end in self.matcher.find_all(text):
+            # Skip phrases inside a longer match ("fever" in "high fever")
+            if end <= covered_until:
+                continue
+            covered_until = end
+            if symptom not in seen:
+                seen.add(symptom)
+                symptoms.append(symptom)
+            # Rewrite aliases to the training wording, whole words only
+            canonical = symptom.replace("_", " ")
+            if phrase != canonical and start >= copied_until and (end == len(text) or text[end] == " "):
+                pieces.append(text[copied_until:start])
+                pieces.append(canonical)
+                copied_until = end
+        model_text = "".join(pieces) + text[copied_until:] if pieces else text
+
+        intent = self.router.classify(lower, symptoms)
+        return ParsedMessage(raw, lower, text, intent.topic, tuple(symptoms), model_text, intent)
+
+
+def parse(message):
+    """ParsedMessage for `message` (returned as-is if it is one already)."""
+    if isinstance(message, ParsedMessage):
+        return message
+    return providers.extractor.get().parse(message)
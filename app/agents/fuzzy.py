@@ -0,0 +1,123 @@
+import difflib
+import heapq
+from collections import Counter
+from itertools import chain
+
+import numpy as np
+
+
+class DifflibMatcher:
+    """The original behaviour: difflib.get_close_matches over every name."""
+
+    def __init__(self, choices):
+        self.choices = list(dict.fromkeys(choices))
+
+    def match(self, query, limit=1, cutoff=0.5):
+        matches = difflib.get_close_matches(query, self.choices, n=limit, cutoff=cutoff)
+        # ratio() isn't symmetric: score the way get_close_matches ranked them
+        return [(m, difflib.SequenceMatcher(None, m, query).ratio()) for m in matches]
+
+
+class NGramMatcher:
+    """
+    Fuzzy matcher backed by a character n-gram inverted index, with the same
+    results as DifflibMatcher (difflib's ratio() and cutoff).
+
+    Names sharing the most n-grams with the query are scored first, which
+    usually finds the best match right away. Every other name is then only
+    scored if its quick_ratio() upper bound, computed for the whole catalog
+    at once from per-character counts, could still beat the current results.
+    """
+
+    def __init__(self, choices, n=2, max_candidates=64):
+        self.n = n
+        self.max_candidates = max_candidates
+        self.choices = list(dict.fromkeys(choices))
+        self.lengths = [len(c) for c in self.choices]
+
+        self.postings = {}
+        for idx, choice in enumerate(self.choices):
+            for gram in set(self._grams(choice)):
+                self.postings.setdefault(gram, []).append(idx)
+
+        # character -> how often it occurs in every choice (one column per character)
+        self._length_array = np.array(self.lengths, dtype=np.float64)
+        self._char_counts = {}
+        for idx, choice in enumerate(self.choices):
+            for char, count in Counter(choice).items():
+                column = self._char_counts.get(char)
+                if column is None:
+                    column = self._char_counts[char] = np.zeros(len(self.choices), dtype=np.uint16)
+                column[idx] = count
+
+    def _grams(self, text):
+        padded = f" {text} "
+        n = self.n
+        if len(padded) <= n:
+            return [padded]
+        return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+    def _shortlist(self, query, cutoff):
+        """Up to max_candidates choices sharing the most n-grams with the query."""
+        postings = self.postings
+        overlap = Counter(chain.from_iterable(
+            postings[gram] for gram in set(self._grams(query)) if gram in postings
+        ))
+        # Upper bound on similarity from lengths alone (difflib's real_quick_ratio)
+        q_len = len(query)
+        lengths = self.lengths
+        return [-neg_idx for _, neg_idx in heapq.nlargest(
+            self.max_candidates,
+            (
+                (count, -idx) for idx, count in overlap.items()
+                if 2.0 * min(q_len, lengths[idx]) / (q_len + lengths[idx]) >= cutoff
+            ),
+        )]
+
+    def _upper_bounds(self, query):
+        """difflib's quick_ratio() of the query against every choice."""
+        common = np.zeros(len(self.choices))
+        for char, count in Counter(query).items():
+            column = self._char_counts.get(char)
+            if column is not None:
+                common += np.minimum(column, count)
+        return 2.0 * common / (len(query) + self._length_array)
+
+    def match(self, query, limit=1, cutoff=0.5):
+        """Returns up to `limit` (choice, score) pairs with score >= cutoff, best first."""
+        if not query or not self.choices or limit <= 0:
+            return []
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        best = []  # min-heap of the `limit` best (score, choice); ties go to the larger string, as in difflib
+
+        def consider(idx):
+            choice = self.choices[idx]
+            matcher.set_seq1(choice)
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                return
+            score = matcher.ratio()
+            if score < cutoff:
+                return
+            if len(best) < limit:
+                heapq.heappush(best, (score, choice))
+            else:
+                heapq.heappushpop(best, (score, choice))
+
+        bounds = self._upper_bounds(query)
+        shortlist = np.array(self._shortlist(query, cutoff), dtype=np.intp)
+        rest = np.ones(len(self.choices), dtype=bool)
+        rest[shortlist] = False
+        # Shortlist first (usually holds the best match), then everything else;
+        # each most promising first, while it can still make the results
+        floor = cutoff
+        for candidates in (shortlist, np.flatnonzero(rest & (bounds >= floor))):
+            for idx in candidates[np.argsort(-bounds[candidates], kind="stable")]:
+                if bounds[idx] < floor:
+                    break
+                consider(idx)
+                if len(best) == limit:
+                    floor = best[0][0]
+
+        return [(choice, score) for score, choice in sorted(best, reverse=True)]
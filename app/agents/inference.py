@@ -0,0 +1,235 @@
+import re
+import numpy as np
+
+# Same default token pattern TfidfVectorizer uses
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+class NaiveBayesScorer:
+    """
+    NumPy-only replacement for the TF-IDF + MultinomialNB pipeline.
+
+    Loads the fitted vocabulary, IDF weights and NB log-probabilities that
+    train_model.py exports, and exposes the same `classes_` / `predict_proba`
+    interface as the sklearn Pipeline, so SymptomAgent can use either.
+    """
+
+    def __init__(self, vocabulary, idf, feature_log_prob=None, class_log_prior=None, classes=(),
+                 stop_words=(), ngram_range=(1, 1), sublinear_tf=False, norm="l2", feature_log_prob_t=None):
+        self.vocabulary = {str(token): i for i, token in enumerate(vocabulary)}
+        # Contiguous float64 input (e.g. a view into a mapped artifact) is used as-is, not copied
+        self.idf = np.ascontiguousarray(idf, dtype=np.float64)
+        # (n_features, n_classes): one row gather per token at scoring time
+        if feature_log_prob_t is None:
+            feature_log_prob_t = np.asarray(feature_log_prob, dtype=np.float64).T
+        self.feature_log_prob_t = np.ascontiguousarray(feature_log_prob_t, dtype=np.float64)
+        self.class_log_prior = np.asarray(class_log_prior, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.stop_words = frozenset(str(w) for w in stop_words)
+        self.ngram_range = (int(ngram_range[0]), int(ngram_range[1]))
+        self.sublinear_tf = bool(sublinear_tf)
+        self.norm = norm or None
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            norm = str(data["norm"])
+            return cls(
+                vocabulary=data["vocabulary"].tolist(),
+                idf=data["idf"],
+                feature_log_prob=data["feature_log_prob"],
+                class_log_prior=data["class_log_prior"],
+                classes=data["classes"],
+                stop_words=data["stop_words"].tolist(),
+                ngram_range=tuple(data["ngram_range"].tolist()),
+                sublinear_tf=bool(data["sublinear_tf"]),
+                norm=norm if norm != "none" else None,
+            )
+
+    def _tokens(self, text):
+        words = [w for w in _TOKEN_RE.findall(str(text).lower()) if w not in self.stop_words]
+        low, high = self.ngram_range
+        if high == 1:
+            return words
+
+        tokens = words if low == 1 else []
+        for n in range(max(low, 2), high + 1):
+            tokens.extend(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+        return tokens
+
+    def _term_counts(self, text):
+        """{feature index: raw count} for the in-vocabulary terms of one text."""
+        counts = {}
+        vocabulary = self.vocabulary
+        for token in self._tokens(text):
+            idx = vocabulary.get(token)
+            if idx is not None:
+                counts[idx] = counts.get(idx, 0) + 1
+        return counts
+
+    def transform(self, text):
+        """Sparse TF-IDF row for one text, as (feature indices, weights)."""
+        counts = self._term_counts(text)
+        if not counts:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.sublinear_tf:
+            values = np.log(values) + 1.0
+        values *= self.idf[indices]
+        if self.norm == "l2":
+            values /= np.sqrt(values @ values)
+        elif self.norm == "l1":
+            values /= np.abs(values).sum()
+        return indices, values
+
+    def joint_log_likelihood(self, texts):
+        jll = np.tile(self.class_log_prior, (len(texts), 1))
+        for row, text in enumerate(texts):
+            indices, values = self.transform(text)
+            if len(indices):
+                jll[row] += values @ self.feature_log_prob_t[indices]
+        return jll
+
+    def predict_proba(self, texts):
+        return _softmax(self.joint_log_likelihood(texts))
+
+    def predict_proba_columns(self, text, columns):
+        """
+        predict_proba for one text over the given class columns only, e.g.
+        DiseaseIndex candidates: shape (1, len(columns)), same order. Nothing
+        as wide as the full class list is touched.
+        """
+        columns = np.asarray(columns, dtype=np.intp)
+        jll = self.class_log_prior[columns]
+        indices, values = self.transform(text)
+        if len(indices):
+            jll = jll + values @ self.feature_log_prob_t[np.ix_(indices, columns)]
+        return _softmax(jll[np.newaxis, :])
+
+    # --- Incremental scoring of multi-turn conversations ---
+
+    @property
+    def incremental(self):
+        """
+        True if accumulate() turn by turn scores the same as the joined
+        turns. Not with n-grams of two words or more: those spanning two
+        turns would be missed.
+        """
+        return self.ngram_range[1] == 1
+
+    def new_evidence(self):
+        return Evidence(len(self.classes_))
+
+    def _weight(self, idx, count):
+        tf = np.log(count) + 1.0 if self.sublinear_tf else float(count)
+        return tf * self.idf[idx]
+
+    def accumulate(self, evidence, text):
+        """
+        Folds one more message into `evidence`. Only the terms of the new
+        message are touched: their TF-IDF weight change is added to the
+        running feature_log_prob sum, so scoring the whole conversation never
+        re-reads earlier turns.
+        """
+        for idx, added in self._term_counts(text).items():
+            old = evidence.counts.get(idx, 0)
+            new = old + added
+            w_old = self._weight(idx, old) if old else 0.0
+            w_new = self._weight(idx, new)
+            delta = w_new - w_old
+            evidence.weighted += delta * self.feature_log_prob_t[idx]
+            evidence.sumsq += w_new * w_new - w_old * w_old
+            evidence.total += delta
+            evidence.counts[idx] = new
+
+    def evidence_proba(self, evidence):
+        """predict_proba for everything accumulated so far, shape (1, n_classes)."""
+        jll = self.class_log_prior.copy()
+        if evidence.counts:
+            if self.norm == "l2":
+                scale = 1.0 / np.sqrt(evidence.sumsq)
+            elif self.norm == "l1":
+                scale = 1.0 / evidence.total  # TF-IDF weights are never negative
+            else:
+                scale = 1.0
+            jll += evidence.weighted * scale
+        return _softmax(jll[np.newaxis, :])
+
+
+class Evidence:
+    """
+    Running sums for one conversation: raw term counts, and the unnormalized
+    TF-IDF row already multiplied into feature_log_prob (one value per class).
+    Normalizing at the end only needs the sum of squares (l2) or the sum (l1).
+    """
+    __slots__ = ("counts", "weighted", "sumsq", "total")
+
+    def __init__(self, n_classes):
+        self.counts = {}
+        self.weighted = np.zeros(n_classes, dtype=np.float64)
+        self.sumsq = 0.0
+        self.total = 0.0
+
+    def to_dict(self):
+        return {
+            "counts": {str(idx): count for idx, count in self.counts.items()},
+            "weighted": self.weighted.tolist(),
+            "sumsq": float(self.sumsq),
+            "total": float(self.total),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        evidence = cls(len(data["weighted"]))
+        evidence.counts = {int(idx): count for idx, count in data["counts"].items()}
+        evidence.weighted = np.asarray(data["weighted"], dtype=np.float64)
+        evidence.sumsq = data["sumsq"]
+        evidence.total = data["total"]
+        return evidence
+
+
+def _softmax(jll):
+    jll -= jll.max(axis=1, keepdims=True)
+    np.exp(jll, out=jll)
+    jll /= jll.sum(axis=1, keepdims=True)
+    return jll
+
+
+def export_pipeline(pipeline, path):
+    """
+    Writes the arrays NaiveBayesScorer needs to a compact .npz file.
+    Returns False (and writes nothing) if the pipeline can't be expressed
+    by the scorer, e.g. a non-NB classifier or a custom tokenizer.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+
+    if len(pipeline.steps) != 2:
+        return False
+    vectorizer, clf = pipeline.steps[0][1], pipeline.steps[1][1]
+    if type(vectorizer) is not TfidfVectorizer or type(clf) is not MultinomialNB:
+        return False
+    if (vectorizer.analyzer != "word" or not vectorizer.lowercase
+            or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None
+            or vectorizer.token_pattern != r"(?u)\b\w\w+\b" or not vectorizer.use_idf
+            or vectorizer.strip_accents is not None or vectorizer.binary):
+        return False
+
+    vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    stop_words = sorted(vectorizer.get_stop_words() or ())
+
+    np.savez_compressed(
+        path,
+        vocabulary=np.array(vocabulary, dtype=str),
+        idf=vectorizer.idf_,
+        feature_log_prob=clf.feature_log_prob_,
+        class_log_prior=clf.class_log_prior_,
+        classes=np.array(clf.classes_, dtype=str),
+        stop_words=np.array(stop_words, dtype=str),
+        ngram_range=np.array(vectorizer.ngram_range),
+        sublinear_tf=np.array(vectorizer.sublinear_tf),
+        norm=np.array(vectorizer.norm or "none"),
+    )
+    return True
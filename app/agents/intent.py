@@ -0,0 +1,139 @@
+"""
+Intent routing.
+
+Every intent rule is compiled once into a named-group alternation, so a
+message is classified with a single scan of its lowercased text: the rule
+that matched is read off the group name, and the topic of a "what is X"
+question is simply the text after the match (no second regex pass).
+
+Rules are pluggable: an IntentRouter takes any sequence of IntentRule. A
+rule with a canned `reply` (greetings, thanks) answers the message on its
+own, so the coordinator can short-circuit before the cache and the model.
+"""
+import re
+
+from app.agents import templates
+
+KNOWLEDGE = "knowledge"
+SYMPTOM = "symptom"
+GREETING = "greeting"
+UNKNOWN = "unknown"
+
+QUESTION_PATTERN = r"^(what is|what's|what are|how does|tell me about|define|explain)\b"
+SYMPTOM_PATTERN = r"\b(i have|i feel|my \w+ hurts|pain|ache|fever|cough|rash|vomiting|stool)\b"
+# Whole-message patterns only: "hi, I have a fever" is not a greeting
+GREETING_PATTERN = (r"^(?:hi|hello|hey|hiya|greetings|namaste|good (?:morning|afternoon|evening))"
+                    r"(?: there)?[\s!.,]*$")
+CLOSING_PATTERN = (r"^(?:ok(?:ay)? )?(?:thanks|thank you|thx|bye|goodbye)"
+                   r"(?: (?:a lot|so much|very much))?[\s!.,]*$")
+
+# The symptom extractor found vocabulary terms: as sure as a question cue
+EXTRACTED_SYMPTOMS_CONFIDENCE = 0.9
+# Rules at least this sure with a reply answer the message by themselves
+SHORT_CIRCUIT_CONFIDENCE = 0.9
+
+
+class IntentRule:
+    """
+    One intent cue. `pattern` runs against the lowercased, whitespace-collapsed
+    message and must not use named groups. With `topic`, the rest of the
+    message after the match is the question's topic.
+    """
+    __slots__ = ("intent", "pattern", "confidence", "topic", "reply")
+
+    def __init__(self, intent, pattern, confidence, topic=False, reply=None):
+        self.intent = intent
+        self.pattern = pattern
+        self.confidence = confidence
+        self.topic = topic
+        self.reply = reply
+
+    def __repr__(self):
+        return f"IntentRule({self.intent!r}, {self.pattern!r}, {self.confidence})"
+
+
+class Intent:
+    __slots__ = ("name", "confidence", "topic", "span", "reply")
+
+    def __init__(self, name, confidence, topic=None, span=None, reply=None):
+        self.name = name
+        self.confidence = confidence
+        self.topic = topic            # "what is X" -> "x"; None if no topic rule matched
+        self.span = span              # (start, end) of the deciding match in the lowercased text
+        self.reply = reply            # canned answer, for intents that need no agent
+
+    @property
+    def short_circuit(self):
+        """True if the intent is answered by its reply alone."""
+        return self.reply is not None and self.confidence >= SHORT_CIRCUIT_CONFIDENCE
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, {self.confidence}, topic={self.topic!r})"
+
+
+DEFAULT_RULES = (
+    IntentRule(GREETING, GREETING_PATTERN, 1.0, reply=templates.GREETING_MSG),
+    IntentRule(GREETING, CLOSING_PATTERN, 1.0, reply=templates.CLOSING_MSG),
+    IntentRule(KNOWLEDGE, QUESTION_PATTERN, 0.9, topic=True),
+    IntentRule(SYMPTOM, SYMPTOM_PATTERN, 0.6),
+)
+
+
+class IntentRouter:
+    """
+    Rules whose pattern starts with "^" are tried once, at the start of the
+    message; the others are scanned for from where that match ended. So the
+    text is still walked once, without retrying the anchored rules at every
+    position.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = tuple(rules)
+        self._by_group = {f"r{i}": rule for i, rule in enumerate(self.rules)}
+        anchored = [(i, rule.pattern[1:]) for i, rule in enumerate(self.rules) if rule.pattern.startswith("^")]
+        floating = [(i, rule.pattern) for i, rule in enumerate(self.rules) if not rule.pattern.startswith("^")]
+        self._anchored = _alternation(anchored)
+        self._floating = _alternation(floating)
+        # Once a floating match this sure is found, the rest can't beat it
+        self._floating_best = max((self.rules[i].confidence for i, _ in floating), default=0.0)
+
+    def classify(self, lower, symptoms=()):
+        """
+        Intent of a message, from its lowercased text and the symptoms the
+        extractor found in it. The most confident rule wins; ties go to the
+        earlier match.
+        """
+        best = None
+        best_match = None
+        topic = None
+        pos = 0
+
+        match = self._anchored.match(lower) if self._anchored else None
+        if match:
+            best, best_match = self._by_group[match.lastgroup], match
+            pos = match.end()
+            if best.topic:
+                topic = " ".join(lower[pos:].strip("? .").split())
+
+        if self._floating and (best is None or best.confidence < self._floating_best):
+            for match in self._floating.finditer(lower, pos):
+                rule = self._by_group[match.lastgroup]
+                if rule.topic and topic is None:
+                    topic = " ".join(lower[match.end():].strip("? .").split())
+                if best is None or rule.confidence > best.confidence:
+                    best, best_match = rule, match
+                    if rule.confidence >= self._floating_best:
+                        break
+
+        if symptoms and (best is None or best.confidence < EXTRACTED_SYMPTOMS_CONFIDENCE):
+            return Intent(SYMPTOM, EXTRACTED_SYMPTOMS_CONFIDENCE, topic)
+        if best is None:
+            return Intent(UNKNOWN, 0.0)
+        return Intent(best.intent, best.confidence, topic, best_match.span(), best.reply)
+
+
+def _alternation(patterns):
+    """One regex over [(rule index, pattern)]; the matching rule is match.lastgroup."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?P<r{i}>{pattern})" for i, pattern in patterns))
@@ -1,11 +1,135 @@
-import pandas as pd
+import bisect
 import os
-import difflib
+import threading
+from types import MappingProxyType
+from app.agents import artifact, events, metrics, providers
+from app.agents.extraction import ParsedMessage
+from app.agents.fuzzy import NGramMatcher
+from app.agents.snapshots import Snapshot
+from app.agents.templates import DiseaseTemplate, build_templates
+
+class SubstringIndex:
+    """
+    Which record's name contains a given text, first name (in CSV order)
+    wins. A suffix array: one (name, start) entry per character of every
+    name, sorted by the suffix it starts, so memory is linear in the total
+    name length and a lookup is a binary search for the suffixes the text
+    is a prefix of. The first HEAD characters of every suffix are kept as
+    plain strings, so most searches never slice a name.
+    """
+    HEAD = 8
+
+    def __init__(self, names, records):
+        self.names = tuple(names)
+        self.records = tuple(records)
+        suffixes = sorted(((i, start) for i, name in enumerate(self.names) for start in range(len(name))),
+                          key=lambda entry: self.names[entry[0]][entry[1]:])
+        self._name = tuple(i for i, _ in suffixes)
+        self._start = tuple(start for _, start in suffixes)
+        self._heads = [self.names[i][start:start + self.HEAD] for i, start in suffixes]
+
+    def get(self, text, default=None):
+        if not text:
+            return default
+        heads = self._heads
+        if len(text) < self.HEAD:
+            # Every head starting with `text` sorts between it and text + the last code point
+            lo = bisect.bisect_left(heads, text)
+            hi = bisect.bisect_left(heads, text + "\U0010ffff", lo=lo)
+        else:
+            head = text[:self.HEAD]
+            lo = bisect.bisect_left(heads, head)
+            hi = bisect.bisect_right(heads, head, lo=lo)
+            if lo < hi and len(text) > self.HEAD:
+                names, starts, n = self.names, self._start, len(text)
+
+                def prefix(pos):
+                    start = starts[pos]
+                    return names[self._name[pos]][start:start + n]
+
+                positions = range(len(starts))
+                lo, hi = (bisect.bisect_left(positions, text, lo=lo, hi=hi, key=prefix),
+                          bisect.bisect_right(positions, text, lo=lo, hi=hi, key=prefix))
+        if lo >= hi:
+            return default
+        return self.records[min(self._name[lo:hi])]
+
+
+class KnowledgeIndex:
+    """
+    Read-only lookup tables built ONCE from the merged knowledge base.
+    Every record is prebuilt, so a lookup is a dict hit with no pandas and
+    no per-request allocation.
+    """
+
+    def __init__(self, rows, synonyms, matcher_factory=NGramMatcher):
+        # rows: iterable of (disease, description, [precaution values]) in CSV order
+        records = {}
+        for disease, description, raw_precautions in rows:
+            key = str(disease).lower().strip()
+            if key in records:
+                continue  # first row wins, like the old .iloc[0]
+
+            # Extract precautions safely
+            precautions = tuple(
+                str(p).capitalize()
+                for p in raw_precautions
+                if p is not None and p == p and str(p).strip()  # p == p is False for NaN
+            )
+            records[key] = MappingProxyType({
+                "name": disease,
+                "description": description,
+                "precautions": precautions,
+            })
+
+        # Lowercase disease names in CSV order (used by the fuzzy matcher)
+        self.all_diseases = list(records)
+        self.matcher = matcher_factory(self.all_diseases)
+
+        # Synonyms map straight to their record when the target exists;
+        # otherwise the topic is rewritten and goes on to fuzzy matching.
+        lookup = dict(records)
+        rewrites = {}
+        for synonym, target in synonyms.items():
+            target_key = target.lower()
+            if target_key in records:
+                lookup[synonym] = records[target_key]
+            else:
+                lookup.pop(synonym, None)
+                rewrites[synonym] = target_key
+
+        # Partial matches: the first disease (in CSV order) whose name contains the topic
+        partial = SubstringIndex(records, records.values())
+
+        self.records = MappingProxyType(records)
+        # Answer fragments rendered once per format (see templates.py)
+        self.templates = MappingProxyType(build_templates(records))
+        # Records live as long as the index, so their ids are stable keys
+        self._template_by_record = {id(records[key]): template for key, template in self.templates.items()}
+        self.lookup = MappingProxyType(lookup)
+        self.rewrites = MappingProxyType(rewrites)
+        self.partial = partial
+
+    def __len__(self):
+        return len(self.records)
+
+    def template(self, record):
+        """Prerendered fragments for a record returned by get_info."""
+        template = self._template_by_record.get(id(record))
+        return template or DiseaseTemplate(record["name"], record["description"], record["precautions"])
 
 class KnowledgeAgent:
-    def __init__(self):
-        self.knowledge_base = pd.DataFrame()
-        self.all_diseases = []
+    def __init__(self, matcher_factory=NGramMatcher, desc_path=None, prec_path=None, use_artifact=True):
+        # Any class with match(query, limit, cutoff) -> [(name, score)]
+        # e.g. fuzzy.DifflibMatcher for the old behaviour
+        self.matcher_factory = matcher_factory
+        self.use_artifact = use_artifact
+        self.snapshot = None
+        self._reload_lock = threading.Lock()
+
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        self.desc_path = desc_path or os.path.join(base_path, '..', 'data', 'symptom_Description.csv')
+        self.prec_path = prec_path or os.path.join(base_path, '..', 'data', 'symptom_precaution.csv')
         
         # --- SYNONYM DICTIONARY ---
         self.synonyms = {
@@ -41,14 +165,50 @@ class KnowledgeAgent:
             "dengue": "Dengue"
         }
 
-        try:
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            desc_path = os.path.join(base_path, '..', 'data', 'symptom_Description.csv')
-            prec_path = os.path.join(base_path, '..', 'data', 'symptom_precaution.csv')
+        self.snapshot = self._build_snapshot()
+
+    @property
+    def index(self):
+        snapshot = self.snapshot
+        return snapshot.data if snapshot else None
+
+    @property
+    def all_diseases(self):
+        index = self.index
+        return index.all_diseases if index else []
+
+    def _build_snapshot(self):
+        """Reads + validates the CSVs into a new Snapshot, or returns None."""
+        with metrics.timed_load("knowledge") as timer:
+            index = self._read_artifact() if self.use_artifact else None
+            if index is None:
+                index = self._read_knowledge_base()
+        if index is None:
+            return None
+        if not len(index):
+            print("Error: Knowledge base is empty; not loading it.")
+            return None
+        return Snapshot(index, [self.desc_path, self.prec_path], load_seconds=timer.seconds)
+
+    def _read_artifact(self):
+        """KnowledgeIndex from the compiled artifact if it matches the CSVs, else None."""
+        compiled = artifact.load()
+        if compiled is None or compiled.synonyms != self.synonyms:
+            return None
+        if not compiled.matches({"description": self.desc_path, "precautions": self.prec_path}):
+            return None
+        index = KnowledgeIndex(compiled.knowledge, self.synonyms, self.matcher_factory)
+        print(f"KnowledgeAgent: Loaded {len(index)} diseases from {os.path.basename(compiled.path)}.")
+        return index
+
+    def _read_knowledge_base(self):
+        """Parses the CSVs into a KnowledgeIndex (None on failure)."""
+        import pandas as pd  # only needed while loading
 
-            if os.path.exists(desc_path) and os.path.exists(prec_path):
-                df_desc = pd.read_csv(desc_path)
-                df_prec = pd.read_csv(prec_path)
+        try:
+            if os.path.exists(self.desc_path) and os.path.exists(self.prec_path):
+                df_desc = pd.read_csv(self.desc_path)
+                df_prec = pd.read_csv(self.prec_path)
                 
                 # --- CRITICAL FIX: CLEANING BEFORE MERGE ---
                 # Remove accidental spaces from the 'Disease' column
@@ -57,62 +217,100 @@ class KnowledgeAgent:
 
                 # --- CRITICAL FIX: LEFT MERGE ---
                 # how='left' ensures we keep the Description even if Precautions are missing
-                self.knowledge_base = pd.merge(df_desc, df_prec, on="Disease", how='left')
-                
-                # Create a lowercase column for easier searching
-                self.knowledge_base['Disease_Lower'] = self.knowledge_base['Disease'].str.lower().str.strip()
-                self.all_diseases = self.knowledge_base['Disease_Lower'].tolist()
-                
-                print(f"KnowledgeAgent: Loaded {len(self.knowledge_base)} diseases successfully.")
+                knowledge_base = pd.merge(df_desc, df_prec, on="Disease", how='left')
+
+                # Precompute the lookup tables so get_info never touches pandas
+                precaution_cols = [f"Precaution_{i}" for i in range(1, 5) if f"Precaution_{i}" in knowledge_base]
+                index = KnowledgeIndex(
+                    zip(
+                        knowledge_base['Disease'],
+                        knowledge_base['Description'],
+                        knowledge_base[precaution_cols].itertuples(index=False, name=None),
+                    ),
+                    self.synonyms,
+                    self.matcher_factory,
+                )
+
+                print(f"KnowledgeAgent: Loaded {len(knowledge_base)} diseases successfully.")
+                return index
             else:
                 print("Error: Knowledge CSV files not found.")
         except Exception as e:
             print(f"Error loading Knowledge base: {e}")
+        return None
+
+    def reload(self):
+        """
+        Builds a new snapshot and swaps it in with one assignment.
+        Keeps serving the old knowledge base if loading fails.
+        """
+        with self._reload_lock:
+            snapshot = self._build_snapshot()
+            if snapshot is None:
+                metrics.registry.inc("mediassist_reloads_total", {"agent": "knowledge", "result": "failed"})
+                return False
+            self.snapshot = snapshot
+        metrics.registry.inc("mediassist_reloads_total", {"agent": "knowledge", "result": "ok"})
+        events.publish(events.KNOWLEDGE_RELOADED)
+        return True
 
-    def _find_closest_match(self, user_text):
+    def is_stale(self):
+        snapshot = self.snapshot
+        return snapshot is None or snapshot.is_stale()
+
+    def _find_closest_match(self, user_text, cutoff=0.5, index=None):
         """Smart Spell Checker"""
-        matches = difflib.get_close_matches(user_text, self.all_diseases, n=1, cutoff=0.5)
-        return matches[0] if matches else None
+        index = index or self.index
+        matches = index.matcher.match(user_text, limit=1, cutoff=cutoff)
+        return matches[0][0] if matches else None
 
-    def get_info(self, topic):
-        if self.knowledge_base.empty:
+    def get_info(self, topic, snapshot=None):
+        """
+        Returns the {name, description, precautions} record for a topic
+        (a disease name, or a ParsedMessage asking "what is ...").
+        Pass `snapshot` to pin a request to the knowledge version it started with.
+        """
+        snapshot = snapshot or self.snapshot
+        index = snapshot.data if snapshot else None
+        if not index:
             return None
-        
+
+        if isinstance(topic, ParsedMessage):
+            if topic.topic is None:
+                return None
+            topic = topic.topic
+
         clean_topic = str(topic).lower().strip()
+        if not clean_topic:
+            return None
 
-        # 1. Check Synonyms
-        if clean_topic in self.synonyms:
-            clean_topic = self.synonyms[clean_topic].lower()
+        # 1. Exact name or synonym (one dict hit)
+        record = index.lookup.get(clean_topic)
+        if record is not None:
+            metrics.registry.inc("mediassist_knowledge_lookups_total", {"match": "exact"})
+            return record
 
-        # 2. Try Exact Match
-        match = self.knowledge_base[self.knowledge_base['Disease_Lower'] == clean_topic]
-        
-        # 3. Fuzzy Match
-        if match.empty:
-            closest_disease = self._find_closest_match(clean_topic)
-            if closest_disease:
-                match = self.knowledge_base[self.knowledge_base['Disease_Lower'] == closest_disease]
-
-        # 4. Partial Match
-        if match.empty:
-            match = self.knowledge_base[self.knowledge_base['Disease_Lower'].str.contains(clean_topic, regex=False, na=False)]
-
-        if not match.empty:
-            row = match.iloc[0]
-            
-            # Extract precautions safely
-            precautions = []
-            for i in range(1, 5):
-                col = f"Precaution_{i}"
-                if col in row and pd.notna(row[col]) and str(row[col]).strip():
-                    precautions.append(str(row[col]).capitalize())
-
-            return {
-                "name": row['Disease'],
-                "description": row['Description'],
-                "precautions": precautions
-            }
-            
-        return None
+        # Synonym whose target isn't in the knowledge base
+        clean_topic = index.rewrites.get(clean_topic, clean_topic)
+
+        # 2. Fuzzy Match
+        closest_disease = self._find_closest_match(clean_topic, index=index)
+        if closest_disease:
+            metrics.registry.inc("mediassist_knowledge_lookups_total", {"match": "fuzzy"})
+            return index.records[closest_disease]
+
+        # 3. Partial Match
+        record = index.partial.get(clean_topic)
+        metrics.registry.inc("mediassist_knowledge_lookups_total", {"match": "partial" if record else "miss"})
+        return record
+
+def get_knowledge_agent():
+    """Shared instance, created on first use."""
+    return providers.knowledge.get()
 
-knowledge_agent = KnowledgeAgent()
\ No newline at end of file
+def __getattr__(attr):
+    # Keeps `from app.agents.knowledge_agent import knowledge_agent` working without
+    # loading anything at import time
+    if attr == "knowledge_agent":
+        return get_knowledge_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
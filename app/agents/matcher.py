@@ -0,0 +1,73 @@
+import re
+
+
+def _trie_pattern(node):
+    """Turns a char trie into a prefix-factored regex (no backtracking blow-up)."""
+    branches = []
+    for char in sorted(k for k in node if k):
+        token = r"\s+" if char == " " else re.escape(char)
+        branches.append(token + _trie_pattern(node[char]))
+
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # Phrase may end here; the greedy "?" still prefers the longer phrase
+        pattern = "(?:" + pattern + ")?"
+    return pattern
+
+
+class PhraseMatcher:
+    """
+    Precompiled multi-phrase matcher.
+
+    All phrases are compiled into ONE trie-shaped regex, so a message is
+    scanned a single time and the cost stays flat as the phrase list grows.
+    Each phrase maps to a label (e.g. the emergency category it belongs to).
+    """
+
+    def __init__(self, phrases):
+        # phrases: dict {phrase: label}  (or an iterable of (phrase, label))
+        items = phrases.items() if isinstance(phrases, dict) else phrases
+
+        self.labels = {}
+        for phrase, label in items:
+            key = " ".join(str(phrase).lower().split())
+            if key and key not in self.labels:
+                self.labels[key] = label
+
+        if self.labels:
+            trie = {}
+            for phrase in self.labels:
+                node = trie
+                for char in phrase:
+                    node = node.setdefault(char, {})
+                node[""] = True
+            # Leading word boundary only: "hives" must not fire inside "archives",
+            # but inflections like "seizures" / "poisoning" still count.
+            # The lookahead lets overlapping phrases starting at different
+            # words ("shortness of breath" and "breath") both be reported.
+            # Longest phrase wins at each position ("coughing up blood").
+            self._pattern = re.compile(r"\b(?=(" + _trie_pattern(trie) + r"))")
+        else:
+            self._pattern = None
+
+    def find_all(self, text):
+        """
+        Returns every match as (label, phrase, start, end), in text order.
+        `text` is expected to be normalized (lowercase) already.
+        """
+        if self._pattern is None:
+            return []
+        labels = self.labels
+        results = []
+        for m in self._pattern.finditer(text):
+            phrase = m.group(1)
+            label = labels.get(phrase)
+            if label is None:
+                label = labels[" ".join(phrase.split())]
+            results.append((label, phrase, m.start(1), m.end(1)))
+        return results
+
+    def __len__(self):
+        return len(self.labels)
@@ -0,0 +1,204 @@
+"""
+Lightweight in-process metrics: counters, gauges, histograms and per-request
+stage timings, rendered in the Prometheus text format.
+
+Set MEDIASSIST_METRICS=0 to turn everything into no-ops.
+"""
+import bisect
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("MEDIASSIST_METRICS", "1") != "0"
+SLOW_REQUEST_MS = float(os.environ.get("MEDIASSIST_SLOW_REQUEST_MS", 500))
+
+# Seconds; tuned for a pipeline where most stages take micro- to milliseconds
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _label_str(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Registry:
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._meta = {}        # name -> (type, help)
+        self._values = {}      # (name, labels) -> float   (counters / gauges)
+        self._histograms = {}  # (name, labels) -> _Histogram
+
+    def describe(self, name, kind, help_text):
+        self._meta[name] = (kind, help_text)
+
+    def inc(self, name, labels=None, value=1):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, labels=None):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            self._values[key] = value
+
+    def observe(self, name, value, labels=None, buckets=DEFAULT_BUCKETS):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(buckets)
+            hist.observe(value)
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            values = sorted(self._values.items())
+            histograms = sorted(
+                (key, list(h.counts), h.total, h.count, h.buckets)
+                for key, h in self._histograms.items()
+            )
+
+        lines = []
+        described = set()
+
+        def header(name, default_kind):
+            if name in described:
+                return
+            described.add(name)
+            kind, help_text = self._meta.get(name, (default_kind, name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in values:
+            header(name, "untyped")
+            lines.append(f"{name}{_label_str(labels)} {value}")
+
+        for (name, labels), counts, total, count, buckets in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(buckets + ("+Inf",), counts):
+                cumulative += n
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{name}_bucket{_label_str(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_label_str(labels)} {total}")
+            lines.append(f"{name}_count{_label_str(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+registry.describe("mediassist_request_seconds", "histogram", "End-to-end generate_response latency.")
+registry.describe("mediassist_stage_seconds", "histogram", "Latency of each generate_response stage.")
+registry.describe("mediassist_intent_total", "counter", "Requests by intent branch taken.")
+registry.describe("mediassist_cache_requests_total", "counter", "Response cache lookups by result (hit, shared_hit, miss).")
+registry.describe("mediassist_knowledge_lookups_total", "counter", "KnowledgeAgent.get_info results by match type.")
+registry.describe("mediassist_model_load_seconds", "gauge", "Time spent loading agent data at (re)load.")
+registry.describe("mediassist_reloads_total", "counter", "Hot reloads by agent and result.")
+registry.describe("mediassist_slow_requests_total", "counter", "Requests slower than the slow-request threshold.")
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.stages.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+class RequestTrace:
+    """Collects stage timings for one request; finish() records them."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = []
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def finish(self, intent):
+        total = time.perf_counter() - self.start
+        registry.observe("mediassist_request_seconds", total)
+        registry.inc("mediassist_intent_total", {"intent": intent})
+        for name, seconds in self.stages:
+            registry.observe("mediassist_stage_seconds", seconds, {"stage": name})
+
+        if total * 1000 >= SLOW_REQUEST_MS:
+            registry.inc("mediassist_slow_requests_total")
+            breakdown = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.stages)
+            print(f"SlowRequest: {total * 1000:.1f}ms intent={intent} {breakdown}")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _NullTrace:
+    """Stand-in used when metrics are disabled: every call is a no-op."""
+    __slots__ = ()
+    _span = _NullSpan()
+
+    def span(self, name):
+        return self._span
+
+    def finish(self, intent):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+def start_request():
+    return RequestTrace() if registry.enabled else NULL_TRACE
+
+
+class timed_load:
+    """Context manager recording how long an agent took to load its data."""
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        registry.set("mediassist_model_load_seconds", self.seconds, {"agent": self.agent})
+        return False
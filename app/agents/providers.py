@@ -0,0 +1,51 @@
+"""
+Lazy agent providers.
+
+Agents are built on first use instead of at import time, so tools that only
+need triage never import pandas/sklearn or read the CSVs. Servers that want
+everything loaded up front call warmup().
+"""
+import importlib
+import threading
+
+
+class LazyAgent:
+    """Creates `module.class_name()` the first time get() is called (thread-safe)."""
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+        self._agent = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        agent = self._agent
+        if agent is None:
+            with self._lock:
+                if self._agent is None:
+                    cls = getattr(importlib.import_module(self.module), self.class_name)
+                    self._agent = cls()
+                agent = self._agent
+        return agent
+
+    @property
+    def loaded(self):
+        return self._agent is not None
+
+    def reset(self):
+        """Drops the instance; the next get() builds a fresh one."""
+        with self._lock:
+            self._agent = None
+
+
+extractor = LazyAgent("app.agents.extraction", "SymptomExtractor")
+triage = LazyAgent("app.agents.triage_agent", "TriageAgent")
+symptom = LazyAgent("app.agents.symptom_agent", "SymptomAgent")
+knowledge = LazyAgent("app.agents.knowledge_agent", "KnowledgeAgent")
+disease_index = LazyAgent("app.agents.disease_index", "DiseaseIndex")
+
+
+def warmup():
+    """Eagerly loads every agent (model + knowledge base)."""
+    for provider in (extractor, triage, symptom, knowledge, disease_index):
+        provider.get()
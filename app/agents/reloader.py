@@ -0,0 +1,151 @@
+"""
+Hot reload of the model and knowledge base without restarting the server.
+
+    reload_agents("all")            # rebuild + validate + swap, returns versions
+    start_watcher(interval=5)       # poll the source files, reload on change
+
+Only agents that are already loaded are reloaded; a lazy agent that nobody
+used yet will read the new files on first use anyway.
+"""
+import hmac
+import os
+import threading
+import time
+
+from app.agents import providers
+from app.agents.snapshots import file_signature
+
+TARGETS = {
+    "model": providers.symptom,
+    "knowledge": providers.knowledge,
+}
+
+ADMIN_TOKEN_ENV = "MEDIASSIST_ADMIN_TOKEN"
+
+
+def versions():
+    """Current snapshot info per loaded agent."""
+    info = {}
+    for name, provider in TARGETS.items():
+        if provider.loaded:
+            snapshot = provider.get().snapshot
+            info[name] = snapshot.describe() if snapshot else None
+    return info
+
+
+def reload_agents(target="all"):
+    """
+    Rebuilds the selected snapshots (blocking) and swaps them in.
+    Returns {name: {"ok": bool, "seconds": float, ...snapshot info}}.
+    """
+    if target != "all" and target not in TARGETS:
+        raise ValueError(f"Unknown reload target '{target}'. Use one of: all, {', '.join(TARGETS)}")
+
+    results = {}
+    for name, provider in TARGETS.items():
+        if target != "all" and name != target:
+            continue
+        if not provider.loaded:
+            results[name] = {"ok": True, "skipped": "not loaded yet"}
+            continue
+
+        agent = provider.get()
+        start = time.perf_counter()
+        ok = agent.reload()
+        result = {"ok": ok, "seconds": round(time.perf_counter() - start, 4)}
+        if agent.snapshot:
+            result.update(agent.snapshot.describe())
+        results[name] = result
+    return results
+
+
+def reload_in_background(target="all"):
+    """Starts reload_agents() on a daemon thread and returns immediately."""
+    if target != "all" and target not in TARGETS:
+        raise ValueError(f"Unknown reload target '{target}'. Use one of: all, {', '.join(TARGETS)}")
+    thread = threading.Thread(target=reload_agents, args=(target,), name="reload", daemon=True)
+    thread.start()
+    return thread
+
+
+def handle_admin_reload(token, payload):
+    """
+    Shared logic for the POST /admin/reload endpoint of both servers.
+    Returns (status_code, json_payload).
+    """
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    if not expected:
+        return 403, {"error": f"Admin endpoint disabled; set {ADMIN_TOKEN_ENV} to enable it."}
+    if not token or not hmac.compare_digest(str(token), expected):
+        return 401, {"error": "Invalid admin token."}
+
+    payload = payload if isinstance(payload, dict) else {}
+    target = payload.get("target", "all")
+    try:
+        if payload.get("wait", True):
+            results = reload_agents(target)
+            status = 200 if all(r["ok"] for r in results.values()) else 500
+            return status, {"reloaded": results}
+        reload_in_background(target)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    return 202, {"status": "reload started", "current": versions()}
+
+
+class FileWatcher(threading.Thread):
+    """Polls the snapshot source files and reloads agents whose files changed."""
+
+    def __init__(self, interval=5.0):
+        super().__init__(name="reload-watcher", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._failed = {}  # name -> file signature that failed to load
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for name, provider in TARGETS.items():
+                if provider.loaded:
+                    self._check(name, provider.get())
+
+    def _check(self, name, agent):
+        snapshot = agent.snapshot
+        if snapshot is None or not snapshot.is_stale():
+            return
+        # Don't retry the same broken files every interval
+        signature = file_signature(snapshot.watched)
+        if self._failed.get(name) == signature:
+            return
+        print(f"Reloader: change detected, reloading {name}...")
+        try:
+            ok = agent.reload()
+        except Exception as e:
+            print(f"Reloader: failed to reload {name}: {e}")
+            ok = False
+        if ok:
+            self._failed.pop(name, None)
+        else:
+            self._failed[name] = signature
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def start_watcher(interval=None):
+    """
+    Starts the file watcher once per process. Without an explicit interval it
+    reads MEDIASSIST_WATCH_INTERVAL (seconds) and does nothing if unset.
+    """
+    global _watcher
+    if interval is None:
+        interval = float(os.environ.get("MEDIASSIST_WATCH_INTERVAL", 0) or 0)
+    if interval <= 0:
+        return None
+    with _watcher_lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = FileWatcher(interval)
+            _watcher.start()
+    return _watcher
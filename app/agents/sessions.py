@@ -0,0 +1,260 @@
+"""
+Server-side chat sessions.
+
+A Session remembers what a user reported across turns: the canonical
+symptoms, the model text of every turn, and the symptom model's running
+Evidence, so each new message only adds its own terms to the prediction.
+
+Stores are bounded (LRU + TTL) and pluggable:
+
+    MEDIASSIST_SESSION_BACKEND=memory   per process (default)
+    MEDIASSIST_SESSION_BACKEND=sqlite   on disk, shared by every worker on the host
+"""
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from app.agents.cache import ResponseCache
+
+# Turns kept verbatim (needed to rebuild the evidence after a model reload)
+MAX_TURNS = 50
+
+_SESSION_ID_RE = re.compile(r"^[\w-]{1,64}$")
+
+
+def new_session_id():
+    return uuid.uuid4().hex
+
+
+def valid_session_id(session_id):
+    return isinstance(session_id, str) and bool(_SESSION_ID_RE.match(session_id))
+
+
+def session_from_request(data):
+    """
+    Reads the optional "session_id" of a chat request body.
+    Returns (session_id, error): no key -> no session; null or "" -> a new one.
+    """
+    if "session_id" not in data:
+        return None, None
+    session_id = data["session_id"]
+    if session_id in (None, ""):
+        return new_session_id(), None
+    if not valid_session_id(session_id):
+        return None, "'session_id' must be 1-64 letters, digits, '-' or '_'."
+    return session_id, None
+
+
+class Session:
+    __slots__ = ("session_id", "turns", "symptoms", "texts", "evidence", "model_version")
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.turns = 0
+        self.symptoms = []         # canonical symptoms reported so far, in order
+        self.texts = []            # model text of each turn with symptom content
+        self.evidence = None       # inference.Evidence for model_version
+        self.model_version = None
+
+    def add_symptoms(self, symptoms):
+        known = set(self.symptoms)
+        self.symptoms.extend(s for s in symptoms if s not in known)
+
+    def add_text(self, text):
+        self.texts.append(text)
+        del self.texts[:-MAX_TURNS]
+
+    def to_dict(self):
+        return {
+            "session_id": self.session_id,
+            "turns": self.turns,
+            "symptoms": self.symptoms,
+            "texts": self.texts,
+            "evidence": self.evidence.to_dict() if self.evidence is not None else None,
+            "model_version": self.model_version,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        session = cls(data["session_id"])
+        session.turns = data["turns"]
+        session.symptoms = list(data["symptoms"])
+        session.texts = list(data["texts"])
+        if data.get("evidence") is not None:
+            from app.agents.inference import Evidence  # NumPy only when needed
+            session.evidence = Evidence.from_dict(data["evidence"])
+            session.model_version = data.get("model_version")
+        return session
+
+
+class MemorySessionStore:
+    """Sessions held in this process, LRU + TTL bounded."""
+
+    def __init__(self, maxsize=10_000, ttl=1800, clock=time.monotonic):
+        self._sessions = ResponseCache(maxsize=maxsize, ttl=ttl, clock=clock)
+
+    def get(self, session_id):
+        return self._sessions.get(session_id)
+
+    def save(self, session):
+        self._sessions.set(session.session_id, session)
+
+    def update(self, session_id, apply):
+        """
+        Read-modify-write of one session: `apply(session)` changes it in
+        place. Returns (session, what apply returned). Atomic only under
+        session_lock(), which every caller in this process takes.
+        """
+        session = self.get(session_id) or Session(session_id)
+        result = apply(session)
+        self.save(session)
+        return session, result
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionStore:
+    """
+    Sessions in a SQLite file (WAL mode), so all gunicorn workers on a host
+    see the same conversations. Expired and least recently used rows are
+    pruned every `prune_every` writes.
+
+    Every row carries a version. update() writes back only if the version is
+    still the one it read, so two workers answering turns of the same
+    session can't overwrite each other's evidence (session_lock() only
+    serializes threads of one process).
+    """
+
+    def __init__(self, path, maxsize=100_000, ttl=1800, prune_every=256, clock=time.time):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self._clock = clock
+        self._local = threading.local()  # sqlite3 connections are per thread
+        self._writes = 0
+
+        conn = self._connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                     "last_used REAL NOT NULL, version INTEGER NOT NULL DEFAULT 0)")
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_used ON sessions (last_used)")
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+        if "version" not in columns:  # file written before versions existed
+            try:
+                conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass  # another worker added it first
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id):
+        conn = self._connection()
+        row = conn.execute("SELECT data, last_used FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        if self.ttl and row[1] + self.ttl <= self._clock():
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            return None
+        return Session.from_dict(json.loads(row[0]))
+
+    def save(self, session):
+        conn = self._connection()
+        conn.execute("INSERT INTO sessions (id, data, last_used) VALUES (?, ?, ?) "
+                     "ON CONFLICT (id) DO UPDATE SET data = excluded.data, "
+                     "last_used = excluded.last_used, version = version + 1",
+                     (session.session_id, json.dumps(session.to_dict()), self._clock()))
+        self._written()
+
+    def update(self, session_id, apply):
+        """
+        Read-modify-write of one session: `apply(session)` changes it in
+        place. Returns (session, what apply returned). If another process
+        saved the session in the meantime, apply runs again on its version;
+        no lock is held while it runs.
+        """
+        conn = self._connection()
+        while True:
+            row = conn.execute("SELECT data, last_used, version FROM sessions WHERE id = ?",
+                               (session_id,)).fetchone()
+            if row is None or (self.ttl and row[1] + self.ttl <= self._clock()):
+                session = Session(session_id)
+            else:
+                session = Session.from_dict(json.loads(row[0]))
+            result = apply(session)
+
+            data = json.dumps(session.to_dict())
+            if row is None:
+                cursor = conn.execute("INSERT OR IGNORE INTO sessions (id, data, last_used) VALUES (?, ?, ?)",
+                                      (session_id, data, self._clock()))
+            else:
+                cursor = conn.execute("UPDATE sessions SET data = ?, last_used = ?, version = version + 1 "
+                                      "WHERE id = ? AND version = ?", (data, self._clock(), session_id, row[2]))
+            if cursor.rowcount == 1:
+                break
+        self._written()
+        return session, result
+
+    def _written(self):
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self):
+        conn = self._connection()
+        if self.ttl:
+            conn.execute("DELETE FROM sessions WHERE last_used <= ?", (self._clock() - self.ttl,))
+        conn.execute("DELETE FROM sessions WHERE id IN "
+                     "(SELECT id FROM sessions ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def create_store():
+    """Session store configured from the environment."""
+    backend = os.environ.get("MEDIASSIST_SESSION_BACKEND", "memory").lower()
+    maxsize = int(os.environ.get("MEDIASSIST_SESSION_SIZE", 10_000))
+    ttl = float(os.environ.get("MEDIASSIST_SESSION_TTL", 1800))
+    if backend == "sqlite":
+        path = os.environ.get("MEDIASSIST_SESSION_DB",
+                              os.path.join(tempfile.gettempdir(), "mediassist_sessions.sqlite3"))
+        return SQLiteSessionStore(path, maxsize=maxsize, ttl=ttl)
+    if backend != "memory":
+        raise ValueError(f"Unknown MEDIASSIST_SESSION_BACKEND '{backend}'. Use 'memory' or 'sqlite'.")
+    return MemorySessionStore(maxsize=maxsize, ttl=ttl)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+# Turns of the same session are serialized; different sessions run in parallel.
+# These locks only cover this process: across gunicorn workers the SQLite
+# store's update() keeps concurrent turns from losing each other's writes.
+_session_locks = [threading.Lock() for _ in range(64)]
+
+
+def get_store():
+    """Shared store, created on first use (after the fork under gunicorn)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_store()
+    return _store
+
+
+def session_lock(session_id):
+    return _session_locks[hash(session_id) % len(_session_locks)]
@@ -0,0 +1,102 @@
+import csv
+import os
+
+from app.agents.extraction import canonical_symptom
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "Symptom-severity.csv")
+
+# Weights in Symptom-severity.csv run from 1 (itching) to 7 (coma, chest pain).
+# URGENT on either of two rules:
+#   - at least URGENT_CRITICAL critical symptoms are mentioned together;
+#   - the summed weight of the serious symptoms (SERIOUS_WEIGHT and up)
+#     reaches URGENT_SCORE, e.g. seven symptoms of weight 5.
+# Lighter symptoms don't count towards the score: summed over everything, it
+# grows with the number of symptoms listed, and the dataset's own rows (whole
+# symptom profiles) would mostly be URGENT. Together the two rules flag ~9.5%
+# of dataset.csv rows, all of them Tuberculosis, Hepatitis E, Pneumonia and
+# Common Cold bar one; the score rule adds rows of those same diseases only.
+URGENT_CRITICAL = 2
+CRITICAL_WEIGHT = 7
+URGENT_SCORE = 35
+SERIOUS_WEIGHT = 5
+
+# Symptoms in dataset.csv that have no row in the weight table borrow the
+# weight of their closest equivalent
+WEIGHT_EQUIVALENTS = {
+    "stomach_cramps": "cramps",
+    "diarrhea": "diarrhoea",
+    "fever": "mild_fever",
+    "tiredness": "fatigue",
+    "weakness": "muscle_weakness",
+    "difficulty_breathing": "breathlessness",
+    "shortness_of_breath": "breathlessness",
+    "dry_cough": "cough",
+    "sore_throat": "throat_irritation",
+    "blurred_vision": "blurred_and_distorted_vision",
+    "irregular_heartbeat": "palpitations",
+    "cold_hands": "cold_hands_and_feets",
+    "cold_feet": "cold_hands_and_feets",
+}
+
+
+def read_weights(path=DEFAULT_PATH):
+    """{symptom: weight} as written in Symptom-severity.csv."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row["Symptom"]: row["weight"] for row in csv.DictReader(f) if row.get("Symptom")}
+
+
+class SeverityResult:
+    __slots__ = ("symptoms", "score", "critical", "level")
+
+    def __init__(self, symptoms, score, critical, level):
+        self.symptoms = symptoms      # [(symptom, weight)] for the weighted symptoms, in order
+        self.score = score            # summed weight of the distinct serious ones (>= SERIOUS_WEIGHT)
+        self.critical = critical      # how many distinct ones are critical (>= CRITICAL_WEIGHT)
+        self.level = level            # "URGENT" | "NORMAL"
+
+    @property
+    def urgent(self):
+        return self.level == "URGENT"
+
+
+class SeverityScorer:
+    """
+    Scores the symptoms a message mentions by their Symptom-severity.csv
+    weights. The CSV is read once; scoring is a dict lookup per symptom on
+    the canonical symptoms the extraction stage already found.
+    """
+
+    def __init__(self, weights, urgent_critical=URGENT_CRITICAL, critical_weight=CRITICAL_WEIGHT,
+                 urgent_score=URGENT_SCORE, serious_weight=SERIOUS_WEIGHT):
+        # weights: {symptom: weight}; "skin_rash" and "Skin Rash" are the same symptom
+        self.weights = {}
+        for symptom, weight in weights.items():
+            key = canonical_symptom(symptom)
+            if key:
+                self.weights.setdefault(key, int(weight))
+        for symptom, equivalent in WEIGHT_EQUIVALENTS.items():
+            if symptom not in self.weights and equivalent in self.weights:
+                self.weights[symptom] = self.weights[equivalent]
+        self.urgent_critical = urgent_critical
+        self.critical_weight = critical_weight
+        self.urgent_score = urgent_score
+        self.serious_weight = serious_weight
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, **kwargs):
+        return cls(read_weights(path), **kwargs)
+
+    def score(self, symptoms):
+        """`symptoms`: canonical symptom names, e.g. ParsedMessage.symptoms."""
+        weights = self.weights
+        weighted = [(symptom, weights[symptom]) for symptom in symptoms if symptom in weights]
+
+        # Each symptom counts once, however often it was mentioned
+        distinct = dict(weighted).values()
+        score = sum(weight for weight in distinct if weight >= self.serious_weight)
+        critical = sum(1 for weight in distinct if weight >= self.critical_weight)
+        urgent = critical >= self.urgent_critical or score >= self.urgent_score
+        return SeverityResult(weighted, score, critical, "URGENT" if urgent else "NORMAL")
+
+    def __len__(self):
+        return len(self.weights)
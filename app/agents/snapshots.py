@@ -0,0 +1,59 @@
+"""
+Versioned, immutable snapshots of the data an agent serves from.
+
+An agent holds exactly one reference to its current Snapshot. Reloading
+builds a new one off to the side and swaps it in with a single assignment,
+so requests that already grabbed the old snapshot finish on it untouched.
+"""
+import hashlib
+import os
+import time
+
+
+def file_signature(paths):
+    """(path, mtime_ns, size) per path; missing files count too."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def content_version(paths):
+    """Short content hash of the files a snapshot was built from."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class Snapshot:
+    __slots__ = ("data", "version", "sources", "watched", "signature", "loaded_at", "load_seconds")
+
+    def __init__(self, data, sources, watched=None, load_seconds=0.0):
+        # sources: files the data was built from; watched: files whose change
+        # should trigger a reload (defaults to the sources)
+        self.data = data
+        self.sources = tuple(sources)
+        self.watched = tuple(watched or sources)
+        self.signature = file_signature(self.watched)
+        self.version = content_version(self.sources)
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+
+    def is_stale(self):
+        return file_signature(self.watched) != self.signature
+
+    def describe(self):
+        return {
+            "version": self.version,
+            "sources": [os.path.normpath(p) for p in self.sources],
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+        }
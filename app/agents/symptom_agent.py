@@ -1,54 +1,208 @@
-import joblib
-import re
+import numpy as np
 import os
+import threading
+from app.agents import artifact, events, metrics, providers
+from app.agents.extraction import parse
+from app.agents.inference import NaiveBayesScorer
+from app.agents.snapshots import Snapshot
+
+# Sanity check a freshly loaded model must pass before it is swapped in
+PROBE_TEXT = "itching skin rash nodal skin eruptions"
+
+# Score only the diseases listing a reported symptom (disease_index). Off by
+# default: confidences are then relative to the candidates, not every class.
+PREFILTER = os.environ.get("MEDIASSIST_PREFILTER", "0") == "1"
 
 class SymptomAgent:
     def __init__(self):
-        self.model = None
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        model_dir = os.path.join(base_path, '..', '..', 'ml_models')
+        self.arrays_path = os.path.join(model_dir, 'symptom_model.npz')
+        self.model_path = os.path.join(model_dir, 'symptom_model.pkl')
+
+        self._reload_lock = threading.Lock()
+        self.snapshot = self._build_snapshot()
+
+    @property
+    def model(self):
+        snapshot = self.snapshot
+        return snapshot.data if snapshot else None
+
+    def _build_snapshot(self):
+        """Loads + validates the model into a new Snapshot, or returns None."""
+        with metrics.timed_load("symptom") as timer:
+            source, model = self._read_model()
+        if model is None:
+            return None
+        try:
+            self._validate(model)
+        except Exception as e:
+            print(f"Error: Symptom model failed validation: {e}")
+            return None
+        return Snapshot(model, [source], watched=[self.arrays_path, self.model_path, artifact.default_path()],
+                        load_seconds=timer.seconds)
+
+    def _read_model(self):
+        """Returns (path, model) for the model found in ml_models/, or (None, None)."""
         try:
-            # Locate the model in the 'ml_models' folder at the project root
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(base_path, '..', '..', 'ml_models', 'symptom_model.pkl')
-            
-            if os.path.exists(model_path):
-                self.model = joblib.load(model_path)
+            source = self.arrays_path if os.path.exists(self.arrays_path) else self.model_path
+            compiled = artifact.load()
+            if compiled is not None and compiled.has_model and compiled.matches({"model": source}):
+                # Arrays are views into the mapped file, shared by every worker
+                model = compiled.scorer()
+                print(f"SymptomAgent: ML Model loaded successfully (NumPy scorer, {os.path.basename(compiled.path)}).")
+                return source, model
+            if os.path.exists(self.arrays_path):
+                # Lean NumPy scorer: no sklearn import in the serving process
+                model = NaiveBayesScorer.load(self.arrays_path)
+                print("SymptomAgent: ML Model loaded successfully (NumPy scorer).")
+                return self.arrays_path, model
+            elif os.path.exists(self.model_path):
+                import joblib
+                model = joblib.load(self.model_path)
                 print("SymptomAgent: ML Model loaded successfully.")
+                return self.model_path, model
             else:
-                print(f"Error: Model not found at {model_path}. Please run train_model.py.")
+                print(f"Error: Model not found at {self.model_path}. Please run train_model.py.")
         except Exception as e:
             print(f"Error loading Symptom model: {e}")
+        return None, None
 
-    def _clean_text(self, text):
-        """Cleans text to match the training format."""
-        text = str(text).strip().lower()
-        text = re.sub(r'_', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+    def _validate(self, model):
+        probs = np.asarray(model.predict_proba([PROBE_TEXT]))
+        if probs.shape != (1, len(model.classes_)) or not len(model.classes_):
+            raise ValueError(f"unexpected probability shape {probs.shape}")
+        if not np.isfinite(probs).all() or abs(probs.sum() - 1.0) > 1e-6:
+            raise ValueError("probabilities are not a valid distribution")
 
-    def predict_disease(self, user_input):
-        if not self.model:
-            return {"error": "Model not loaded"}
+    def reload(self):
+        """
+        Builds a new snapshot and swaps it in with one assignment.
+        Keeps serving the old model if loading or validation fails.
+        """
+        with self._reload_lock:
+            snapshot = self._build_snapshot()
+            if snapshot is None:
+                metrics.registry.inc("mediassist_reloads_total", {"agent": "symptom", "result": "failed"})
+                return False
+            self.snapshot = snapshot
+        metrics.registry.inc("mediassist_reloads_total", {"agent": "symptom", "result": "ok"})
+        events.publish(events.MODEL_RELOADED)
+        return True
+
+    def is_stale(self):
+        snapshot = self.snapshot
+        return snapshot is None or snapshot.is_stale()
+
+    def predict_disease(self, user_input, snapshot=None):
+        return self.predict_disease_batch([user_input], snapshot=snapshot)[0]
+
+    def predict_disease_batch(self, texts, top_k=3, threshold=0.1, snapshot=None, prefilter=None):
+        """
+        Scores many messages (raw text or ParsedMessage) with ONE predict_proba call.
+        Returns one {disease: confidence} dict (top-k, > threshold) per input.
+        Pass `snapshot` to pin a request to the model version it started with.
+        With `prefilter` (default: MEDIASSIST_PREFILTER) the NumPy scorer only
+        scores the diseases that list one of the message's symptoms.
+        """
+        snapshot = snapshot or self.snapshot
+        if not snapshot:
+            return [{"error": "Model not loaded"} for _ in texts]
+        model = snapshot.data
 
-        cleaned_input = self._clean_text(user_input)
-        if not cleaned_input:
-            return {}
+        parsed = [parse(t) for t in texts]
+        # Normalized text with everyday wording mapped to the training vocabulary
+        cleaned = [p.model_text for p in parsed]
+        results = [{} for _ in cleaned]
+
+        # Empty messages keep their empty result and skip the model
+        rows = [i for i, text in enumerate(cleaned) if text]
+        if not rows:
+            return results
 
         try:
-            # The pipeline expects a list of strings
-            probs = self.model.predict_proba([cleaned_input])[0]
-            classes = self.model.classes_
-
-            # Filter results with > 10% confidence
-            results = {
-                disease: prob 
-                for disease, prob in zip(classes, probs) 
-                if prob > 0.1
-            }
-            
-            # Sort by confidence
-            sorted_results = dict(sorted(results.items(), key=lambda item: item[1], reverse=True)[:3])
-            return sorted_results
+            if (PREFILTER if prefilter is None else prefilter) and isinstance(model, NaiveBayesScorer):
+                index = providers.disease_index.get()
+                unfiltered = []
+                for i in rows:
+                    columns = index.columns(parsed[i].symptoms, model.classes_)
+                    if columns is None:
+                        unfiltered.append(i)  # no known symptom: nothing to rule out
+                        continue
+                    probs = model.predict_proba_columns(cleaned[i], columns)
+                    results[i] = _rank(probs, model.classes_[columns], top_k, threshold)[0]
+                rows = unfiltered
+                if not rows:
+                    return results
+            probs = model.predict_proba([cleaned[i] for i in rows])
+            for i, ranked in zip(rows, _rank(probs, model.classes_, top_k, threshold)):
+                results[i] = ranked
+            return results
+        except Exception as e:
+            return [{"error": str(e)} for _ in texts]
+
+    def predict_session(self, session, message, snapshot=None, top_k=3, threshold=0.1):
+        """
+        Adds one turn to `session` (sessions.Session) and scores everything
+        reported so far. With the NumPy scorer only the new turn's terms are
+        folded into the session's running sums; the sklearn fallback, and
+        n-gram models (NaiveBayesScorer.incremental), rescore the joined
+        transcript.
+        """
+        snapshot = snapshot or self.snapshot
+        if not snapshot:
+            return {"error": "Model not loaded"}
+        model = snapshot.data
+        text = parse(message).model_text
+
+        try:
+            if getattr(model, "incremental", False):
+                if session.evidence is None or session.model_version != snapshot.version:
+                    # New session, or the model was reloaded since: replay the kept turns
+                    session.evidence = model.new_evidence()
+                    for past in session.texts:
+                        model.accumulate(session.evidence, past)
+                    session.model_version = snapshot.version
+                if text:
+                    model.accumulate(session.evidence, text)
+                    session.add_text(text)
+                if not session.texts:
+                    return {}
+                probs = model.evidence_proba(session.evidence)
+            else:
+                if text:
+                    session.add_text(text)
+                if not session.texts:
+                    return {}
+                probs = model.predict_proba([" ".join(session.texts)])
+            return _rank(probs, model.classes_, top_k, threshold)[0]
         except Exception as e:
             return {"error": str(e)}
 
-symptom_agent = SymptomAgent()
\ No newline at end of file
+def _rank(probs, classes, top_k, threshold):
+    """One {disease: confidence} dict (top-k, > threshold) per row of probs."""
+    # Top-k per row without sorting every class
+    k = min(top_k, probs.shape[1])
+    top = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    top_probs = np.take_along_axis(probs, top, axis=1)
+
+    # Sort only the k survivors by confidence
+    order = np.argsort(-top_probs, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_probs = np.take_along_axis(top_probs, order, axis=1)
+
+    return [
+        {classes[c]: float(p) for c, p in zip(top_row, probs_row) if p > threshold}
+        for top_row, probs_row in zip(top, top_probs)
+    ]
+
+def get_symptom_agent():
+    """Shared instance, created on first use."""
+    return providers.symptom.get()
+
+def __getattr__(attr):
+    # Keeps `from app.agents.symptom_agent import symptom_agent` working without
+    # loading anything at import time
+    if attr == "symptom_agent":
+        return get_symptom_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
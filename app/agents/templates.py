@@ -0,0 +1,179 @@
+"""
+Response templates.
+
+Everything static in an answer (a disease's overview, its precaution list,
+the "About X" knowledge answer, the disclaimer) is rendered ONCE per format
+when the knowledge base is loaded. A request only joins those fragments with
+the few dynamic pieces: the confidence, the triage warning, the session note.
+
+Formats:
+    markdown   the chat UI (default)
+    text       markdown emphasis removed, e.g. for PDF export
+    json       dict fragments, merged into one object
+"""
+import re
+from functools import lru_cache
+
+MARKDOWN = "markdown"
+TEXT = "text"
+JSON = "json"
+FORMATS = (MARKDOWN, TEXT, JSON)
+
+NO_ANALYSIS_MSG = "I'm sorry, I couldn't analyze your input. Are you describing symptoms or asking for medical information? Please try being more specific."
+GREETING_MSG = ("Hello! I'm MediAssist AI. Describe your symptoms (e.g. \"I have a headache and fever\") "
+                "or ask about a condition (e.g. \"What is malaria?\").")
+CLOSING_MSG = "Take care! Please see a doctor if your symptoms get worse or don't improve."
+DISCLAIMER = "I am an AI, not a doctor. This is for informational purposes only."
+
+# **bold**, *italic*, _italic_
+_EMPHASIS_RE = re.compile(r"\*\*(.+?)\*\*|\*(.+?)\*|(?<!\w)_(.+?)_(?!\w)", re.S)
+
+
+@lru_cache(maxsize=1024)
+def markdown_to_text(markdown):
+    """Drops markdown emphasis; bullets and line breaks are kept."""
+    return _EMPHASIS_RE.sub(lambda m: m.group(1) or m.group(2) or m.group(3), markdown)
+
+
+def format_from_request(data):
+    """Reads the optional "format" of a chat request body; returns (format, error)."""
+    fmt = data.get("format", MARKDOWN)
+    if fmt not in FORMATS:
+        return None, f"'format' must be one of: {', '.join(FORMATS)}."
+    return fmt, None
+
+
+def _fresh(value):
+    if isinstance(value, dict):
+        return {key: _fresh(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_fresh(item) for item in value]
+    return value
+
+
+def copy(part, fmt):
+    """
+    A JSON fragment the caller may modify: prerendered fragments and cached
+    answers are shared by every request, so they never leave as they are.
+    Strings are immutable and returned unchanged.
+    """
+    return _fresh(part) if fmt == JSON else part
+
+
+def copies(parts, fmt):
+    """Yields copy() of each of `parts`, a generator; returns what it returns."""
+    if fmt != JSON:
+        return (yield from parts)
+    try:
+        while True:
+            try:
+                part = next(parts)
+            except StopIteration as stop:
+                return stop.value
+            yield _fresh(part)
+    finally:
+        parts.close()
+
+
+def join(parts, fmt):
+    """Assembles rendered fragments into one new response."""
+    if fmt == JSON:
+        response = {}
+        for part in parts:
+            for key, value in part.items():
+                response[key] = _fresh(value)
+        return response
+    return "".join(parts)
+
+
+def _rendered(markdown, fields):
+    return {MARKDOWN: markdown, TEXT: markdown_to_text(markdown), JSON: fields}
+
+
+def _text_or_none(value):
+    return value if isinstance(value, str) else None  # NaN descriptions from pandas
+
+
+class DiseaseTemplate:
+    """Prerendered fragments for one knowledge-base disease, in every format."""
+    __slots__ = ("name", "about", "overview", "steps")
+
+    def __init__(self, name, description, precautions, overview=None, steps=None):
+        self.name = name
+
+        about = f"**About {name}:**\n{description}\n"
+        if precautions:
+            about += "\n**Precautions/Steps:**\n" + "\n".join([f"- {p}" for p in precautions])
+        self.about = _rendered(about, {
+            "name": name,
+            "description": _text_or_none(description),
+            "precautions": tuple(precautions),
+        })
+
+        if overview is None:
+            overview = f"**Overview:** {description}\n\n"
+        self.overview = _rendered(overview, {"description": _text_or_none(description)})
+
+        if steps is None:
+            steps = "**Recommended Steps:**\n" + "".join(f"- {p}\n" for p in precautions)
+        self.steps = _rendered(steps, {"precautions": tuple(precautions)})
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def missing(cls, name):
+        """Fragments for a predicted disease the knowledge base has no entry for."""
+        return cls(
+            name, None, (),
+            overview=f"**Overview:** I couldn't find specific details for '{name}' in the knowledge base, but please consult a doctor.\n",
+            steps="**Recommended Steps:**\n- Consult a doctor for specific advice.\n",
+        )
+
+    def headline(self, confidence, fmt=MARKDOWN):
+        if fmt == JSON:
+            return {"condition": self.name, "confidence": round(float(confidence), 4)}
+        name = f"**{self.name}**" if fmt == MARKDOWN else self.name
+        return f"Based on your symptoms, a likely condition is {name} ({int(confidence*100)}% match).\n\n"
+
+
+def build_templates(records):
+    """{key: DiseaseTemplate} for KnowledgeIndex records."""
+    return {
+        key: DiseaseTemplate(record["name"], record["description"], record["precautions"])
+        for key, record in records.items()
+    }
+
+
+_DISCLAIMER = _rendered(f"\n*Disclaimer: {DISCLAIMER}*", {"disclaimer": DISCLAIMER})
+
+
+def disclaimer(fmt=MARKDOWN):
+    return _DISCLAIMER[fmt]
+
+
+def message(text, fmt=MARKDOWN):
+    """A plain one-line answer such as NO_ANALYSIS_MSG."""
+    return {"message": text} if fmt == JSON else text
+
+
+def emergency(triage_msg, fmt=MARKDOWN):
+    if fmt == MARKDOWN:
+        return triage_msg
+    text = markdown_to_text(triage_msg)
+    return {"triage": "EMERGENCY", "message": text} if fmt == JSON else text
+
+
+def urgent_warning(triage_msg, fmt=MARKDOWN):
+    if fmt == JSON:
+        return {"triage": "URGENT", "warning": triage_msg}
+    if fmt == MARKDOWN:
+        return f"⚠️ **{triage_msg}**\n\n"
+    return f"⚠️ {triage_msg}\n\n"
+
+
+def session_note(symptoms, fmt=MARKDOWN):
+    """Reminds the user which earlier symptoms the answer takes into account."""
+    if fmt == JSON:
+        return {"session_symptoms": list(symptoms)}
+    names = ", ".join(symptom.replace("_", " ") for symptom in symptoms)
+    note = f"Taking into account everything you've told me so far: {names}."
+    return f"_{note}_\n\n" if fmt == MARKDOWN else f"{note}\n\n"
@@ -1,4 +1,7 @@
-import re
+from app.agents import artifact, providers
+from app.agents.extraction import parse
+from app.agents.matcher import PhraseMatcher
+from app.agents.severity import DEFAULT_PATH as SEVERITY_PATH, SeverityScorer
 
 class TriageAgent:
     def __init__(self):
@@ -43,24 +46,109 @@ class TriageAgent:
             "milk", "soy", "seafood"
         ]
 
-    def _normalize(self, text):
-        text = text.lower()
-        text = re.sub(r"[^\w\s]", "", text)
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        # 🔴 AIRWAY CUES (allergen + any of these = anaphylaxis)
+        self.airway_cues = ["throat", "breath", "swelling"]
+
+        # ⚡ Compile everything into ONE matcher (single pass per message)
+        phrases = {}
+        for category, keywords in self.emergency_keywords.items():
+            for keyword in keywords:
+                phrases.setdefault(keyword, category)
+        for food in self.allergy_triggers:
+            phrases.setdefault(food, "allergen")
+        for cue in self.airway_cues:
+            phrases.setdefault(cue, "airway")
+        self.matcher = PhraseMatcher(phrases)
+
+        # Category priority follows the dict order above
+        self._category_rank = {c: i for i, c in enumerate(self.emergency_keywords)}
+
+        # 🟠 SEVERITY WEIGHTS (Symptom-severity.csv or the compiled artifact, read once here)
+        try:
+            self.severity = self._load_severity()
+        except (OSError, KeyError, ValueError) as e:
+            print(f"TriageAgent: severity weights unavailable, URGENT level disabled: {e}")
+            self.severity = None
+
+    def _load_severity(self):
+        compiled = artifact.load()
+        if compiled is not None and compiled.matches({"severity": SEVERITY_PATH}):
+            return SeverityScorer(compiled.severity_weights)
+        return SeverityScorer.load()
+
+    def find_matches(self, message):
+        """
+        Single pass over the (parsed) message.
+        Returns a list of (category, phrase, start, end) for every hit.
+        """
+        return self.matcher.find_all(parse(message).text)
+
+    def assess_severity(self, message):
+        """SeverityResult for the symptoms mentioned in the message, or None."""
+        if self.severity is None:
+            return None
+        return self.severity.score(parse(message).symptoms)
 
     def check_triage(self, message):
         """
+        `message`: raw text or a ParsedMessage.
         Returns:
         (STATUS, RESPONSE_MESSAGE)
-        STATUS → EMERGENCY | SAFE
+        STATUS → EMERGENCY | URGENT | SAFE
         """
-        text = self._normalize(message)
+        parsed = parse(message)
+        emergency = self._check_emergency(self.matcher.find_all(parsed.text))
+        if emergency:
+            return emergency
+
+        # 🟠 URGENT: no emergency keyword, but a heavy symptom load
+        urgent = self.check_urgent(parsed.symptoms)
+        if urgent:
+            return urgent
+
+        # ✅ SAFE TO CONTINUE
+        return "SAFE", ""
+
+    def check_urgent(self, symptoms):
+        """("URGENT", message) if the canonical symptoms are a severe combination, else None."""
+        if self.severity is None:
+            return None
+        result = self.severity.score(symptoms)
+        if not result.urgent:
+            return None
+        # Name the symptoms behind the rule that fired
+        if result.critical >= self.severity.urgent_critical:
+            heavy = self.severity.critical_weight
+        else:
+            heavy = self.severity.serious_weight
+        names = ", ".join(dict.fromkeys(symptom.replace("_", " ") for symptom, weight in result.symptoms
+                                        if weight >= heavy))
+        return (
+            "URGENT",
+            f"URGENT: the symptoms you describe ({names}) are a severe combination. "
+            "Please see a doctor within 24 hours."
+        )
+
+    def _check_emergency(self, matches):
+        """(EMERGENCY, message) for emergency keyword matches, else None."""
+        if not matches:
+            return None
+
+        has_allergen = False
+        has_airway = False
+        category = None
+        for label, phrase, _, _ in matches:
+            if label == "allergen":
+                has_allergen = True
+            elif label != "airway":
+                if category is None or self._category_rank[label] < self._category_rank[category]:
+                    category = label
+            # Longer phrases ("throat closing") still count as airway cues
+            if not has_airway and any(cue in phrase for cue in self.airway_cues):
+                has_airway = True
 
         # 🚨 1️⃣ ANAPHYLAXIS (HIGHEST PRIORITY)
-        if any(food in text for food in self.allergy_triggers) and (
-            "throat" in text or "breath" in text or "swelling" in text
-        ):
+        if has_allergen and has_airway:
             return (
                 "EMERGENCY",
                 "🚨 **EMERGENCY: Possible ANAPHYLAXIS (severe allergic reaction)**\n\n"
@@ -71,18 +159,25 @@ class TriageAgent:
             )
 
         # 🚨 2️⃣ CATEGORY-BASED EMERGENCY CHECK
-        for category, keywords in self.emergency_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return (
-                        "EMERGENCY",
-                        f"🚨 **EMERGENCY DETECTED**\n\n"
-                        f"Your symptoms suggest a serious **{category.upper()} emergency**.\n\n"
-                        "👉 **Call emergency services (112/911) immediately** or go to the nearest ER.\n\n"
-                        "*Do not rely on this chatbot for life-threatening situations.*"
-                    )
-
-        # ✅ 3️⃣ SAFE TO CONTINUE
-        return "SAFE", ""
+        if category is not None:
+            return (
+                "EMERGENCY",
+                f"🚨 **EMERGENCY DETECTED**\n\n"
+                f"Your symptoms suggest a serious **{category.upper()} emergency**.\n\n"
+                "👉 **Call emergency services (112/911) immediately** or go to the nearest ER.\n\n"
+                "*Do not rely on this chatbot for life-threatening situations.*"
+            )
+
+        return None
+
+def get_triage_agent():
+    """Shared instance, created on first use."""
+    return providers.triage.get()
+
+def __getattr__(attr):
+    # Keeps `from app.agents.triage_agent import triage_agent` working without
+    # loading anything at import time
+    if attr == "triage_agent":
+        return get_triage_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
-triage_agent = TriageAgent()
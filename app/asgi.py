@@ -0,0 +1,228 @@
+"""
+Production entry point (ASGI).
+
+    gunicorn -c gunicorn.conf.py app.asgi:app
+
+Agents are loaded once in the gunicorn master (preload) and shared
+copy-on-write with every forked worker. CPU-bound work runs in a bounded
+thread pool so the event loop keeps accepting requests.
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app import sse
+from app.agents import metrics, reloader, sessions, templates
+from app.agents.coordinator import (
+    batch_from_request, generate_response, generate_responses, iter_response, message_from_request, warmup,
+)
+
+# Threads per worker running inference, and how many requests may wait for one
+INFERENCE_THREADS = int(os.environ.get("MEDIASSIST_INFERENCE_THREADS", 4))
+MAX_PENDING = int(os.environ.get("MEDIASSIST_MAX_PENDING", 64))
+MAX_BODY_BYTES = 64 * 1024
+
+_executor = None
+_slots = None
+
+# Load everything now: under gunicorn's preload this happens once in the
+# master, before the workers are forked.
+warmup()
+
+
+def _start():
+    # Created per worker process, after the fork (threads don't survive it)
+    global _executor, _slots
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=INFERENCE_THREADS, thread_name_prefix="inference")
+        _slots = asyncio.Semaphore(MAX_PENDING)
+        reloader.start_watcher()
+
+
+def _stop():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+async def _read_json(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if len(body) > MAX_BODY_BYTES:
+            raise ValueError("Request body too large.")
+    return json.loads(body or b"{}")
+
+
+async def _send(send, status, body, content_type):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status, payload):
+    await _send(send, status, json.dumps(payload).encode("utf-8"), b"application/json")
+
+
+async def _run(func, *args):
+    """Runs func in the inference pool; None means the worker is saturated."""
+    if _slots.locked():
+        return None
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+
+
+async def _chat(data):
+    user_message, error, status = message_from_request(data)
+    if error:
+        return status, {"error": error}
+    session_id, error = sessions.session_from_request(data)
+    fmt, format_error = templates.format_from_request(data)
+    if error or format_error:
+        return 400, {"error": error or format_error}
+
+    if not user_message:
+        payload = {"response": templates.message("Please enter a message.", fmt)}
+    else:
+        response = await _run(generate_response, user_message, session_id, fmt)
+        if response is None:
+            return 503, {"error": "Server busy, please retry."}
+        payload = {"response": response}
+    if session_id is not None:
+        payload["session_id"] = session_id
+    return 200, payload
+
+
+async def _chat_batch(data):
+    messages, error, status = batch_from_request(data)
+    if error:
+        return status, {"error": error}
+    fmt, error = templates.format_from_request(data)
+    if error:
+        return 400, {"error": error}
+
+    answers = await _run(generate_responses, [m for m in messages if m], fmt)
+    if answers is None:
+        return 503, {"error": "Server busy, please retry."}
+
+    answers = iter(answers)
+    empty = templates.message("Please enter a message.", fmt)
+    return 200, {"responses": [next(answers) if m else empty for m in messages]}
+
+
+async def _chat_stream(data, send):
+    """Server-sent events: every part is sent as soon as the coordinator yields it."""
+    user_message, error, status = message_from_request(data)
+    if error:
+        await _send_json(send, status, {"error": error})
+        return
+    session_id, error = sessions.session_from_request(data)
+    fmt, format_error = templates.format_from_request(data)
+    if error or format_error:
+        await _send_json(send, 400, {"error": error or format_error})
+        return
+    if _slots.locked():
+        await _send_json(send, 503, {"error": "Server busy, please retry."})
+        return
+
+    if user_message:
+        parts = iter_response(user_message, session_id, fmt)
+    else:
+        parts = iter([templates.message("Please enter a message.", fmt)])
+    events = sse.stream_events(parts, session_id)
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        headers = [(b"content-type", sse.CONTENT_TYPE.encode())]
+        headers += [(name.lower().encode(), value.encode()) for name, value in sse.HEADERS.items()]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        try:
+            while True:
+                # Each step may run the model, so it goes to the inference pool
+                event = await loop.run_in_executor(_executor, next, events, None)
+                if event is None:
+                    break
+                await send({"type": "http.response.body", "body": event.encode("utf-8"), "more_body": True})
+        finally:
+            events.close()
+        await send({"type": "http.response.body", "body": b""})
+
+
+ROUTES = {
+    "/api/chat": _chat,
+    "/api/chat/batch": _chat_batch,
+}
+
+# Handlers that write the response themselves
+STREAMING_ROUTES = {
+    "/api/chat/stream": _chat_stream,
+}
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                _start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                _stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    if scope["path"] == "/metrics" and scope["method"] == "GET":
+        body = metrics.registry.render().encode("utf-8")
+        await _send(send, 200, body, b"text/plain; version=0.0.4")
+        return
+
+    if scope["path"] == "/admin/reload" and scope["method"] == "POST":
+        headers = dict(scope.get("headers") or [])
+        token = headers.get(b"x-admin-token", b"").decode("latin-1")
+        try:
+            data = await _read_json(receive)
+        except ValueError:
+            data = {}
+        loop = asyncio.get_running_loop()
+        # Building a snapshot is blocking work; keep it off the event loop
+        status, payload = await loop.run_in_executor(None, reloader.handle_admin_reload, token, data)
+        await _send_json(send, status, payload)
+        return
+
+    handler = ROUTES.get(scope["path"]) or STREAMING_ROUTES.get(scope["path"])
+    if handler is None:
+        await _send_json(send, 404, {"error": "Not found."})
+        return
+    if scope["method"] != "POST":
+        await _send_json(send, 405, {"error": "Method not allowed."})
+        return
+
+    _start()  # servers without lifespan support
+    try:
+        data = await _read_json(receive)
+    except ValueError as e:
+        await _send_json(send, 400, {"error": str(e)})
+        return
+    if not isinstance(data, dict):
+        await _send_json(send, 400, {"error": "Expected a JSON object."})
+        return
+
+    if scope["path"] in STREAMING_ROUTES:
+        await handler(data, send)
+        return
+    status, payload = await handler(data)
+    await _send_json(send, status, payload)
@@ -1,19 +1,87 @@
-from flask import Flask, request, jsonify
-from app.agents.coordinator import generate_response
+import os
+
+from flask import Flask, Response, request, jsonify
+from app import sse
+from app.agents import metrics, reloader, sessions, templates
+from app.agents.coordinator import (
+    batch_from_request, generate_response, generate_responses, iter_response, message_from_request, warmup,
+)
 
 app = Flask(__name__)
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
     data = request.get_json(force=True)
-    user_message = data.get('message', '').strip()
+    user_message, error, status = message_from_request(data)
+    if error:
+        return jsonify({"error": error}), status
+
+    session_id, error = sessions.session_from_request(data)
+    fmt, format_error = templates.format_from_request(data)
+    if error or format_error:
+        return jsonify({"error": error or format_error}), 400
+
+    if not user_message:
+        payload = {"response": templates.message("Please enter a message.", fmt)}
+    else:
+        payload = {"response": generate_response(user_message, session_id, fmt)}
+    if session_id is not None:
+        payload["session_id"] = session_id
+    return jsonify(payload)
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    data = request.get_json(force=True)
+    user_message, error, status = message_from_request(data)
+    if error:
+        return jsonify({"error": error}), status
+
+    session_id, error = sessions.session_from_request(data)
+    fmt, format_error = templates.format_from_request(data)
+    if error or format_error:
+        return jsonify({"error": error or format_error}), 400
 
     if not user_message:
-        return jsonify({"response": "Please enter a message."})
+        parts = [templates.message("Please enter a message.", fmt)]
+    else:
+        parts = iter_response(user_message, session_id, fmt)
+    return Response(sse.stream_events(parts, session_id), content_type=sse.CONTENT_TYPE, headers=sse.HEADERS)
+
+@app.route('/api/chat/batch', methods=['POST'])
+def chat_batch():
+    data = request.get_json(force=True)
+    messages, error, status = batch_from_request(data)
+    if error:
+        return jsonify({"error": error}), status
+    fmt, error = templates.format_from_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    non_empty = [m for m in messages if m]
+    answers = iter(generate_responses(non_empty, fmt))
+
+    empty = templates.message("Please enter a message.", fmt)
+    responses = [next(answers) if m else empty for m in messages]
+    return jsonify({"responses": responses})
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    status, payload = reloader.handle_admin_reload(
+        request.headers.get('X-Admin-Token'), request.get_json(silent=True)
+    )
+    return jsonify(payload), status
 
-    response = generate_response(user_message)
-    return jsonify({"response": response})
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
 
 if __name__ == '__main__':
-    print("🚀 MediAssist Backend running on http://127.0.0.1:5000")
+    # debug=True runs this module twice: a parent that only watches the code
+    # for changes, and the child serving requests (WERKZEUG_RUN_MAIN set).
+    # Only the child loads the agents and watches the model/CSV files.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warmup()
+        reloader.start_watcher()
+    else:
+        print("🚀 MediAssist Backend running on http://127.0.0.1:5000")
     app.run(host='127.0.0.1', port=5000, debug=True)
@@ -0,0 +1,36 @@
+"""
+Server-sent events for /api/chat/stream, shared by the Flask and ASGI apps.
+
+Each part of the answer is one event, then a final "done" event:
+
+    data: {"delta": "⚠️ **URGENT: ...**\n\n"}
+
+    data: {"delta": "Based on your symptoms, ..."}
+
+    event: done
+    data: {"session_id": "..."}
+"""
+import json
+
+CONTENT_TYPE = "text/event-stream; charset=utf-8"
+HEADERS = {
+    "Cache-Control": "no-cache",
+    # Tell nginx not to buffer the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_event(payload, event=None):
+    # JSON keeps newlines in the markdown out of the SSE framing
+    data = json.dumps(payload)
+    if event:
+        return f"event: {event}\ndata: {data}\n\n"
+    return f"data: {data}\n\n"
+
+
+def stream_events(parts, session_id=None):
+    """Yields one SSE frame per response part, then the closing "done" frame."""
+    for part in parts:
+        yield format_event({"delta": part})
+    done = {"session_id": session_id} if session_id is not None else {}
+    yield format_event(done, event="done")
@@ -0,0 +1,77 @@
+"""
+Benchmark CLI.
+
+    python -m benchmarks                         # run everything, print a table
+    python -m benchmarks --case triage --case knowledge
+    python -m benchmarks --out results.json --baseline benchmarks/baseline.json
+    python -m benchmarks --save-baseline         # record the current numbers
+
+Exits with status 1 when a case regresses past --threshold vs the baseline.
+"""
+import argparse
+import os
+import sys
+
+from benchmarks import harness
+from benchmarks.suites import CASES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def run_cases(selected, n, repeat):
+    results = {"environment": harness.environment(), "cases": {}}
+    for name, setup in CASES.items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        try:
+            func, inputs = setup(n)
+        except Exception as e:  # e.g. optional dependency missing
+            results["cases"][name] = {"skipped": f"{type(e).__name__}: {e}"}
+            continue
+        results["cases"][name] = harness.measure(func, inputs, repeat=repeat)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="MediAssist AI benchmarks.")
+    parser.add_argument("--case", action="append", default=[],
+                        help="Run only cases whose name starts with this prefix (repeatable).")
+    parser.add_argument("--list", action="store_true", help="List available cases and exit.")
+    parser.add_argument("-n", "--messages", type=int, default=500, help="Synthetic inputs per case.")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the inputs per case.")
+    parser.add_argument("--out", help="Write results as JSON to this path.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown as a fraction before a case is flagged (default 0.25).")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+
+    results = run_cases(args.case, args.messages, args.repeat)
+    print(harness.format_table(results))
+
+    if args.out:
+        harness.save(results, args.out)
+        print(f"\nResults written to {args.out}")
+
+    if args.save_baseline:
+        harness.save(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        regressions = harness.compare(results, harness.load(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs {args.baseline}:")
+            for name, metric, before, now in regressions:
+                print(f"  {name}: {metric} {before:.1f} -> {now:.1f}")
+            return 1
+        print(f"\n✅ No regressions vs {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Cold start: a fresh interpreter loading every agent, with and without the
+compiled artifact (python -m app.agents.artifact).
+
+    python -m benchmarks.coldstart --runs 5
+
+Each run is a new process, so imports and file reads are included. Reports
+warmup time, peak RSS and whether pandas/sklearn had to be imported.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.loadtest import percentile
+
+_PROBE = """
+import contextlib, io, json, resource, sys, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    from app.agents.providers import warmup
+    warmup()
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "pandas": "pandas" in sys.modules,
+    "sklearn": "sklearn" in sys.modules,
+}))
+"""
+
+
+def _probe(env):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=root, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run(runs=5):
+    from app.agents import artifact
+
+    modes = {"sources": "0"}
+    if artifact.load() is not None:
+        modes["artifact"] = artifact.default_path()
+
+    results = {}
+    for mode, setting in modes.items():
+        env = dict(os.environ, MEDIASSIST_ARTIFACT=setting, MEDIASSIST_METRICS="0")
+        probes = [_probe(env) for _ in range(runs)]
+        seconds = sorted(p["seconds"] for p in probes)
+        results[mode] = {
+            "p50_ms": percentile(seconds, 50) * 1000,
+            "min_ms": seconds[0] * 1000,
+            "max_rss_mb": max(p["max_rss_kb"] for p in probes) / 1024,
+            "pandas": probes[0]["pandas"],
+            "sklearn": probes[0]["sklearn"],
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time agent warmup in fresh processes, with and without the artifact.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    if "artifact" not in results:
+        print("No artifact found; build one with `python -m app.agents.artifact` to compare.")
+    print(f"{'mode':<10}{'p50 ms':>10}{'min ms':>10}{'peak RSS MB':>13}{'pandas':>8}{'sklearn':>9}")
+    for mode, r in results.items():
+        print(f"{mode:<10}{r['p50_ms']:>10.1f}{r['min_ms']:>10.1f}{r['max_rss_mb']:>13.1f}"
+              f"{str(r['pandas']):>8}{str(r['sklearn']):>9}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
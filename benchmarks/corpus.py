@@ -0,0 +1,151 @@
+"""
+Synthetic message corpora built from app/data/dataset.csv (stdlib only).
+All generators are seeded, so every run benchmarks the same inputs.
+"""
+import csv
+import os
+import random
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app", "data")
+
+SYMPTOM_TEMPLATES = [
+    "I have {a}",
+    "I have {a} and {b}",
+    "I feel {a}, {b} and {c}",
+    "{a} and {b} since yesterday",
+    "my problem is {a} with {b}, also {c} and {d}",
+]
+
+QUESTION_TEMPLATES = ["what is {t}", "tell me about {t}", "explain {t}", "what are {t}?"]
+
+EMERGENCY_MESSAGES = [
+    "I have crushing chest pain",
+    "my father has slurred speech and face drooping",
+    "ate peanuts and my throat is closing",
+    "severe bleeding from a deep cut",
+    "she fainted and is unresponsive",
+]
+
+GREETING_MESSAGES = ["hi", "Hello!", "hey there", "good morning", "thanks", "thank you so much", "ok bye"]
+
+OFF_TOPIC_MESSAGES = ["what time is it", "my dog is cute", "asdf qwerty", "can you book a taxi"]
+
+
+def load_disease_symptoms(path=None):
+    """{disease: sorted list of readable symptoms} from dataset.csv."""
+    path = path or os.path.join(DATA_DIR, "dataset.csv")
+    diseases = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if not row:
+                continue
+            symptoms = diseases.setdefault(row[0].strip(), set())
+            for cell in row[1:]:
+                cell = " ".join(cell.replace("_", " ").split())
+                if cell:
+                    symptoms.add(cell)
+    return {d: sorted(s) for d, s in diseases.items()}
+
+
+def load_disease_names(path=None):
+    path = path or os.path.join(DATA_DIR, "symptom_Description.csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(dict.fromkeys(row["Disease"].strip() for row in csv.DictReader(f)))
+
+
+def _typo(rng, word):
+    chars = list(word)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        elif op < 0.7 and len(chars) > 3:
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+    return "".join(chars)
+
+
+def symptom_messages(n, seed=0):
+    rng = random.Random(seed)
+    diseases = load_disease_symptoms()
+    names = sorted(diseases)
+    messages = []
+    for _ in range(n):
+        symptoms = diseases[rng.choice(names)]
+        picks = rng.sample(symptoms, min(4, len(symptoms)))
+        picks += [picks[-1]] * (4 - len(picks))
+        template = rng.choice(SYMPTOM_TEMPLATES)
+        messages.append(template.format(a=picks[0], b=picks[1], c=picks[2], d=picks[3]))
+    return messages
+
+
+def knowledge_topics(kind, n, seed=0, synonyms=()):
+    """Topics for KnowledgeAgent.get_info: exact | synonym | fuzzy | miss."""
+    rng = random.Random(seed)
+    names = load_disease_names()
+    if kind == "exact":
+        pool = names
+    elif kind == "synonym":
+        pool = list(synonyms) or names
+    elif kind == "fuzzy":
+        pool = [_typo(rng, name.lower()) for name in names for _ in range(5)]
+    elif kind == "miss":
+        pool = ["".join(rng.choice("qwxzjk") for _ in range(rng.randint(5, 12))) for _ in range(50)]
+    else:
+        raise ValueError(f"Unknown topic kind: {kind}")
+    return [rng.choice(pool) for _ in range(n)]
+
+
+_SYLLABLES = ["ma", "la", "ri", "a", "hep", "ti", "tis", "gas", "tro", "en", "ter", "itis", "ne",
+              "phro", "card", "io", "my", "o", "path", "y", "syn", "drome", "os", "teo", "ar",
+              "thr", "cho", "le", "cys", "derm", "at", "pso"]
+
+
+def synthetic_disease_names(n, seed=0):
+    """n unique made-up disease names, for scaling the fuzzy matcher."""
+    rng = random.Random(seed)
+    names = {}
+    while len(names) < n:
+        words = ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(1, 3))]
+        names[" ".join(words)] = None
+    return list(names)
+
+
+def fuzzy_queries(names, n, seed=0):
+    rng = random.Random(seed)
+    return [_typo(rng, rng.choice(names)) for _ in range(n)]
+
+
+def chat_messages(n, seed=0):
+    """Mixed traffic: ~70% symptoms, ~20% questions, ~10% emergencies."""
+    rng = random.Random(seed)
+    symptoms = symptom_messages(n, seed)
+    names = load_disease_names()
+    messages = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.7:
+            messages.append(symptoms[i])
+        elif roll < 0.9:
+            messages.append(rng.choice(QUESTION_TEMPLATES).format(t=rng.choice(names).lower()))
+        else:
+            messages.append(rng.choice(EMERGENCY_MESSAGES))
+    return messages
+
+
+def mixed_messages(n, seed=0):
+    """chat_messages() with small talk mixed in: ~10% greetings, ~5% off-topic."""
+    rng = random.Random(seed + 1)
+    messages = chat_messages(n, seed)
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.10:
+            messages[i] = rng.choice(GREETING_MESSAGES)
+        elif roll < 0.15:
+            messages[i] = rng.choice(OFF_TOPIC_MESSAGES)
+    return messages
@@ -0,0 +1,128 @@
+"""
+Candidate prefilter vs full scoring as the disease catalog grows.
+
+    python -m benchmarks.disease_index --classes 47 500 5000
+
+For each catalog size a synthetic catalog is generated: every disease lists
+4-8 of 2000 symptoms, and a NaiveBayesScorer has one class per disease. It
+then times, per symptom message:
+
+    rank       DiseaseIndex.rank(): explainable top-3 by weighted Jaccard
+    full       predict_proba over every class
+    prefilter  predict_proba_columns over the index's candidate columns only
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.loadtest import percentile
+
+
+def synthetic_catalog(n_diseases, n_symptoms=2000, seed=0):
+    """({disease: symptoms}, {symptom: weight}, scorer) with one class per disease."""
+    from app.agents.inference import NaiveBayesScorer
+
+    rng = random.Random(seed)
+    symptoms = [f"symptom_{i}" for i in range(n_symptoms)]
+    table = {f"disease_{i}": sorted(rng.sample(symptoms, rng.randint(4, 8))) for i in range(n_diseases)}
+    weights = {s: rng.randint(1, 7) for s in symptoms}
+
+    # NB trained on the table: listed symptoms are likely, everything else smoothed
+    vocabulary = [s.replace("_", "") for s in symptoms]
+    counts = np.full((n_diseases, n_symptoms), 0.01)
+    position = {s: i for i, s in enumerate(symptoms)}
+    for row, listed in enumerate(table.values()):
+        counts[row, [position[s] for s in listed]] += 1.0
+    feature_log_prob = np.log(counts / counts.sum(axis=1, keepdims=True))
+    scorer = NaiveBayesScorer(
+        vocabulary=vocabulary,
+        idf=np.ones(n_symptoms),
+        feature_log_prob=feature_log_prob,
+        class_log_prior=np.full(n_diseases, -np.log(n_diseases)),
+        classes=list(table),
+    )
+    return table, weights, scorer
+
+
+def _messages(table, n, seed=0):
+    """(reported symptoms, model text) pairs: 2-4 symptoms of one disease."""
+    rng = random.Random(seed)
+    diseases = list(table)
+    messages = []
+    for _ in range(n):
+        listed = table[rng.choice(diseases)]
+        reported = rng.sample(listed, min(len(listed), rng.randint(2, 4)))
+        messages.append((reported, " ".join(s.replace("_", "") for s in reported)))
+    return messages
+
+
+def _p50(func, inputs):
+    samples = []
+    for x in inputs:
+        start = time.perf_counter()
+        func(x)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return percentile(samples, 50)
+
+
+def run(sizes=(47, 500, 5000), n=500):
+    from app.agents.disease_index import DiseaseIndex
+
+    results = []
+    for size in sizes:
+        table, weights, scorer = synthetic_catalog(size)
+        start = time.perf_counter()
+        index = DiseaseIndex(table, weights)
+        build_s = time.perf_counter() - start
+        messages = _messages(table, n)
+
+        def full(message):
+            return scorer.predict_proba([message[1]])
+
+        def prefiltered(message):
+            columns = index.columns(message[0], scorer.classes_)
+            return scorer.predict_proba_columns(message[1], columns), columns
+
+        def top1_same(message):
+            probs, columns = prefiltered(message)
+            return int(np.argmax(full(message))) == columns[int(np.argmax(probs))]
+
+        index.columns((), scorer.classes_)  # builds the per-model column lookup
+        top1 = sum(top1_same(m) for m in messages) / len(messages)
+        results.append({
+            "classes": size,
+            "build_ms": build_s * 1000,
+            "rank_us": _p50(lambda m: index.rank(m[0]), messages) * 1e6,
+            "full_us": _p50(full, messages) * 1e6,
+            "prefilter_us": _p50(prefiltered, messages) * 1e6,
+            "candidates": sum(len(index.columns(m[0], scorer.classes_)) for m in messages) / len(messages),
+            "top1_agreement": top1,
+        })
+    return results
+
+
+def format_table(results):
+    lines = [f"{'classes':>8}{'build ms':>10}{'rank us':>9}{'full us':>10}{'prefilter us':>14}"
+             f"{'candidates':>12}{'top-1 same':>12}"]
+    for r in results:
+        lines.append(f"{r['classes']:>8}{r['build_ms']:>10.1f}{r['rank_us']:>9.1f}{r['full_us']:>10.1f}"
+                     f"{r['prefilter_us']:>14.1f}{r['candidates']:>12.1f}{r['top1_agreement']:>12.1%}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Disease index prefilter vs full scoring by catalog size.")
+    parser.add_argument("--classes", type=int, nargs="+", default=[47, 500, 5000])
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    results = run(args.classes, args.messages)
+    print(format_table(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Timing, reporting and baseline comparison shared by every benchmark.
+"""
+import json
+import platform
+import time
+
+from benchmarks.loadtest import percentile
+
+
+def measure(func, inputs, repeat=1, warmup=20):
+    """
+    Calls func(x) for every input (`repeat` times) and returns throughput and
+    latency percentiles in microseconds.
+    """
+    for x in inputs[:warmup]:
+        func(x)
+
+    timer = time.perf_counter_ns
+    latencies = []
+    started = timer()
+    for _ in range(repeat):
+        for x in inputs:
+            t0 = timer()
+            func(x)
+            latencies.append(timer() - t0)
+    elapsed = (timer() - started) / 1e9
+
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_us": sum(latencies) / len(latencies) / 1e3,
+        "p50_us": percentile(latencies, 50) / 1e3,
+        "p90_us": percentile(latencies, 90) / 1e3,
+        "p99_us": percentile(latencies, 99) / 1e3,
+        "max_us": latencies[-1] / 1e3,
+    }
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=0.25):
+    """
+    Flags cases whose throughput dropped, or whose p50 latency grew, by more
+    than `threshold` (a fraction) compared to the baseline.
+    Returns a list of (case, metric, baseline_value, current_value).
+    """
+    regressions = []
+    for name, current in results.get("cases", {}).items():
+        before = baseline.get("cases", {}).get(name)
+        if not before or "ops_per_sec" not in current or "ops_per_sec" not in before:
+            continue
+        if current["ops_per_sec"] < before["ops_per_sec"] * (1 - threshold):
+            regressions.append((name, "ops_per_sec", before["ops_per_sec"], current["ops_per_sec"]))
+        if current["p50_us"] > before["p50_us"] * (1 + threshold):
+            regressions.append((name, "p50_us", before["p50_us"], current["p50_us"]))
+    return regressions
+
+
+def format_table(results):
+    lines = [f"{'case':<40}{'ops/s':>12}{'p50 us':>11}{'p90 us':>11}{'p99 us':>11}"]
+    for name, r in results.get("cases", {}).items():
+        if "skipped" in r:
+            lines.append(f"{name:<40}  skipped: {r['skipped']}")
+            continue
+        lines.append(f"{name:<40}{r['ops_per_sec']:>12.1f}{r['p50_us']:>11.1f}{r['p90_us']:>11.1f}{r['p99_us']:>11.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""
+In-process agent calls vs the HTTP API, per chat message.
+
+    python -m benchmarks.inprocess --messages 500
+
+Starts the Flask app on a local port in a background thread and times the
+same messages (response cache cleared before each) through:
+
+    in-process       CoordinatorAgent.process_message (streamlit_app.py)
+    http pooled      one keep-alive requests.Session (frontend/app.py)
+    http per call    requests.post, a new connection every message (before)
+    async x8         process_message_async, 8 messages in flight at once
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import threading
+import time
+
+from benchmarks.corpus import chat_messages
+from benchmarks.loadtest import percentile
+
+
+def _serve():
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app.main import app
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"  # werkzeug defaults to 1.0: a new connection per request
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/api/chat"
+
+
+def _time_each(func, messages):
+    from app.agents.coordinator import response_cache
+
+    samples = []
+    for message in messages:
+        response_cache.clear()
+        start = time.perf_counter()
+        func(message)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+def _summary(samples):
+    return {
+        "msgs_per_s": len(samples) / sum(samples),
+        "p50_us": percentile(samples, 50) * 1e6,
+        "p90_us": percentile(samples, 90) * 1e6,
+    }
+
+
+async def _gather(agent, messages, concurrency):
+    from app.agents.coordinator import response_cache
+
+    response_cache.clear()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(message):
+        async with slots:
+            return await agent.process_message_async(message)
+
+    return await asyncio.gather(*(one(m) for m in messages))
+
+
+def run(n=500):
+    import requests
+    from app.agents.coordinator import CoordinatorAgent
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = CoordinatorAgent().warmup()
+        server, url = _serve()
+    messages = chat_messages(n)
+    session = requests.Session()
+
+    def pooled(message):
+        return session.post(url, json={"message": message}, timeout=(5, 60)).json()
+
+    def per_call(message):
+        return requests.post(url, json={"message": message}, timeout=(5, 60)).json()
+
+    try:
+        for func in (agent.process_message, pooled, per_call):
+            func(messages[0])  # warm up
+        results = {
+            "in-process": _summary(_time_each(agent.process_message, messages)),
+            "http pooled": _summary(_time_each(pooled, messages)),
+            "http per call": _summary(_time_each(per_call, messages)),
+        }
+        start = time.perf_counter()
+        asyncio.run(_gather(agent, messages, 8))
+        results["async x8"] = {"msgs_per_s": len(messages) / (time.perf_counter() - start)}
+        same = all(agent.process_message(m) == pooled(m)["response"] for m in messages[:50])
+    finally:
+        server.shutdown()
+        session.close()
+    return results, same
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="In-process agent calls vs the HTTP API.")
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    results, same = run(args.messages)
+    print(f"{'mode':<16}{'msgs/s':>10}{'p50 us':>10}{'p90 us':>10}")
+    for mode, r in results.items():
+        p50 = f"{r['p50_us']:>10.1f}" if "p50_us" in r else f"{'-':>10}"
+        p90 = f"{r['p90_us']:>10.1f}" if "p90_us" in r else f"{'-':>10}"
+        print(f"{mode:<16}{r['msgs_per_s']:>10,.0f}{p50}{p90}")
+    print(f"same answers in-process and over HTTP: {same}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Intent routing throughput over a mixed message corpus.
+
+    python -m benchmarks.intent --messages 2000
+
+Compares, per message of corpus.mixed_messages():
+
+    adhoc      the coordinator's old routing: lowercase, re.search the
+               question pattern, re.sub it away for the topic, re.search
+               the symptom pattern
+    router     IntentRouter.classify(): one scan, topic from the match end
+
+and then end to end (generate_response, cache cleared) with the default
+rules vs the same rules without the greeting short-circuit, overall and
+for the small-talk messages alone. Prints the intent mix too.
+"""
+import argparse
+import contextlib
+import io
+import re
+import time
+from collections import Counter
+
+from benchmarks.corpus import mixed_messages
+from benchmarks.loadtest import percentile
+
+
+def adhoc_classify(message):
+    """What the coordinator did per message before the router."""
+    from app.agents.intent import QUESTION_PATTERN, SYMPTOM_PATTERN
+
+    lower = message.lower()
+    if re.search(QUESTION_PATTERN, lower):
+        topic = re.sub(QUESTION_PATTERN, "", lower).strip("? .")
+        return "knowledge", topic
+    if re.search(SYMPTOM_PATTERN, lower):
+        return "symptom", None
+    return "unknown", None
+
+
+def _throughput(func, inputs, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for x in inputs:
+            func(x)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(inputs) / best
+
+
+def _latencies(func, inputs):
+    samples = []
+    for x in inputs:
+        start = time.perf_counter()
+        func(x)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+def run(n=2000, repeat=5):
+    from app.agents import coordinator, providers
+    from app.agents.intent import DEFAULT_RULES, IntentRouter
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        providers.warmup()
+    messages = mixed_messages(n)
+    lowered = [" ".join(m.lower().split()) for m in messages]
+    router = IntentRouter()
+
+    extractor = providers.extractor.get()
+    results = {
+        "messages": n,
+        "mix": Counter(extractor.parse(m).intent.name for m in messages),
+        "adhoc_ops": _throughput(adhoc_classify, messages, repeat),
+        "router_ops": _throughput(router.classify, lowered, repeat),
+    }
+
+    def uncached(message):
+        coordinator.response_cache.clear()
+        return coordinator.generate_response(message)
+
+    small_talk = [m for m in messages if extractor.parse(m).intent.short_circuit]
+    default_router = extractor.router
+    no_replies = IntentRouter(rule for rule in DEFAULT_RULES if rule.reply is None)
+    try:
+        for label, rules in (("with_short_circuit", default_router), ("without", no_replies)):
+            extractor.router = rules
+            uncached(messages[0])
+            samples = min((_latencies(uncached, messages) for _ in range(repeat)), key=sum)
+            small = min((_latencies(uncached, small_talk) for _ in range(repeat)), key=sum)
+            results[label] = {
+                "ops": len(samples) / sum(samples),
+                "p50_us": percentile(samples, 50) * 1e6,
+                "p90_us": percentile(samples, 90) * 1e6,
+                "small_talk_p50_us": percentile(small, 50) * 1e6,
+            }
+    finally:
+        extractor.router = default_router
+    return results
+
+
+def format_report(results):
+    mix = ", ".join(f"{name} {count}" for name, count in results["mix"].most_common())
+    lines = [
+        f"{results['messages']} messages: {mix}",
+        "",
+        f"{'classify':<22}{'msgs/s':>12}",
+        f"{'adhoc regexes':<22}{results['adhoc_ops']:>12,.0f}",
+        f"{'IntentRouter':<22}{results['router_ops']:>12,.0f}",
+        "",
+        f"{'generate_response':<22}{'msgs/s':>12}{'p50 us':>10}{'p90 us':>10}{'small talk p50 us':>19}",
+    ]
+    for label in ("with_short_circuit", "without"):
+        r = results[label]
+        lines.append(f"{label:<22}{r['ops']:>12,.0f}{r['p50_us']:>10.1f}{r['p90_us']:>10.1f}"
+                     f"{r['small_talk_p50_us']:>19.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Intent routing throughput over a mixed corpus.")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.messages, args.repeat)
+    print(format_report(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
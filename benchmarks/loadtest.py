@@ -0,0 +1,108 @@
+"""
+Minimal HTTP load generator for the /api/chat endpoint (stdlib only).
+
+    python -m benchmarks.loadtest --url http://127.0.0.1:5000/api/chat \
+        --concurrency 16 --requests 2000
+
+Reports requests/sec and latency percentiles.
+"""
+import argparse
+import http.client
+import json
+import math
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_MESSAGES = [
+    "I have itching and skin rash",
+    "what is malaria",
+    "I feel fatigue, high fever and headache",
+    "tell me about diabetes",
+    "vomiting and stomach pain since yesterday",
+    "cough, breathlessness and phlegm",
+    "joint pain and muscle weakness",
+    "what is dengue",
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def run(url, concurrency, total_requests, messages=DEFAULT_MESSAGES):
+    target = urlparse(url)
+    latencies = []
+    errors = [0]
+    counter = iter(range(total_requests))
+    lock = threading.Lock()
+
+    def worker():
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            body = json.dumps({"message": messages[i % len(messages)]})
+            start = time.perf_counter()
+            try:
+                conn.request("POST", target.path, body, {"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                resp.read()
+                ok = resp.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+            local.append(time.perf_counter() - start)
+            if not ok:
+                with lock:
+                    errors[0] += 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the MediAssist chat API.")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api/chat")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    result = run(args.url, args.concurrency, args.requests)
+    print(f"{result['requests']} requests, {result['errors']} errors in {result['seconds']:.2f}s")
+    print(f"{result['rps']:.1f} req/s | p50 {result['p50_ms']:.1f} ms | "
+          f"p95 {result['p95_ms']:.1f} ms | p99 {result['p99_ms']:.1f} ms")
+    return result
+
+
+if __name__ == "__main__":
+    main()
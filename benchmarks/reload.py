@@ -0,0 +1,97 @@
+"""
+Hot-reload stress run: chat threads keep answering while the model and
+knowledge base are reloaded over and over.
+
+    python -m benchmarks.reload --threads 8 --reloads 20
+
+Every request must succeed; reports reload time and request latency while
+reloads are in flight.
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.corpus import chat_messages
+from benchmarks.loadtest import percentile
+
+
+def run(threads=8, reloads=20, messages=None):
+    from app.agents import reloader
+    from app.agents.coordinator import generate_response, response_cache, warmup
+
+    warmup()
+    messages = messages or chat_messages(500)
+    stop = threading.Event()
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        local = []
+        i = offset
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                response = generate_response(messages[i % len(messages)])
+                if not isinstance(response, str) or not response:
+                    raise ValueError(f"empty response: {response!r}")
+            except Exception as e:
+                with lock:
+                    failures.append(repr(e))
+            local.append(time.perf_counter() - start)
+            i += threads
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+
+    reload_seconds = []
+    reload_errors = 0
+    try:
+        for _ in range(reloads):
+            response_cache.clear()
+            start = time.perf_counter()
+            results = reloader.reload_agents("all")
+            reload_seconds.append(time.perf_counter() - start)
+            reload_errors += sum(not r["ok"] for r in results.values())
+    finally:
+        stop.set()
+        for t in workers:
+            t.join()
+
+    latencies.sort()
+    reload_seconds.sort()
+    return {
+        "threads": threads,
+        "reloads": reloads,
+        "reload_errors": reload_errors,
+        "reload_p50_ms": percentile(reload_seconds, 50) * 1000,
+        "reload_max_ms": (reload_seconds[-1] if reload_seconds else 0.0) * 1000,
+        "requests": len(latencies),
+        "request_errors": len(failures),
+        "first_error": failures[0] if failures else None,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress hot reload under concurrent chat traffic.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--reloads", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    result = run(args.threads, args.reloads)
+    print(f"{result['reloads']} reloads ({result['reload_errors']} failed) | "
+          f"p50 {result['reload_p50_ms']:.1f} ms | max {result['reload_max_ms']:.1f} ms")
+    print(f"{result['requests']} requests, {result['request_errors']} errors | "
+          f"p50 {result['p50_ms']:.2f} ms | p99 {result['p99_ms']:.2f} ms")
+    if result["first_error"]:
+        print(f"first error: {result['first_error']}")
+    return 1 if result["request_errors"] or result["reload_errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
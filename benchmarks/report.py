@@ -0,0 +1,153 @@
+"""
+Streamlit rerun cost of the PDF report as the consultation grows.
+
+    python -m benchmarks.report --messages 10 100 1000
+
+For each history size it times one rerun after a new message arrived:
+
+    rebuild    the old sidebar: create_pdf() over the whole history, every rerun
+    sync       ReportBuilder.sync(): only the new message is sanitized
+    pdf        ReportBuilder.pdf_bytes() from scratch, on the first download
+    next pdf   pdf_bytes() again after one more message: only it is laid out
+"""
+import argparse
+import re
+import time
+
+from benchmarks.corpus import chat_messages
+from benchmarks.loadtest import percentile
+
+_OLD_SAFE_MAP = {
+    "\u2018": "'", "\u2019": "'", "\u201C": '"', "\u201D": '"',
+    "\u2013": "-", "\u2014": "-", "\u2022": "-", "\u2212": "-",
+    "\u00A0": " ", "\u200B": "", "\uFEFF": "",
+}
+
+
+def old_sanitize_to_latin1(text):
+    """The sanitizer the Streamlit apps used before ReportBuilder."""
+    if not isinstance(text, str):
+        text = str(text)
+    for bad, good in _OLD_SAFE_MAP.items():
+        text = text.replace(bad, good)
+    text = text.encode("latin-1", "ignore").decode("latin-1")
+    text = re.sub(r"[^\x09\x0A\x0D\x20-\x7E\xA0-\xFF]", "", text)
+    return text
+
+
+def old_create_pdf(chat_history):
+    """The create_pdf the Streamlit apps ran on every rerun."""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 10, txt="MediAssist AI - Consultation Report", ln=True, align='C')
+    pdf.ln(5)
+
+    for msg in chat_history:
+        role = "Patient" if msg.get("role") == "user" else "MediAssist AI"
+        raw = (msg.get("content") or "").replace("**", "").replace("*", "")
+        text = old_sanitize_to_latin1(raw)
+
+        pdf.set_font("Arial", style='B', size=12)
+        pdf.cell(0, 8, old_sanitize_to_latin1(f"{role}:"), ln=True)
+        pdf.set_font("Arial", size=12)
+        pdf.multi_cell(0, 8, text)
+        pdf.ln(1)
+
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def consultation(n):
+    """n chat messages alternating patient / assistant, with real answers."""
+    from app.agents.coordinator import generate_response
+
+    history = []
+    for message in chat_messages((n + 1) // 2):
+        history.append({"role": "user", "content": message})
+        history.append({"role": "assistant", "content": generate_response(message)})
+    return history[:n]
+
+
+def _time(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return percentile(samples, 50)
+
+
+def run(sizes=(10, 100, 1000), repeat=5):
+    from frontend.report import ReportBuilder
+
+    results = []
+    for n in sizes:
+        base = consultation(n)
+
+        # Steady state: the builder has seen everything up to the new message
+        def sync_one():
+            builder = ReportBuilder().sync(base[:-1])
+            start = time.perf_counter()
+            builder.sync(base)
+            return time.perf_counter() - start
+
+        sync_s = sorted(sync_one() for _ in range(repeat))
+
+        # Download clicked again after one more message
+        def next_pdf():
+            builder = ReportBuilder().sync(base[:-1])
+            builder.pdf_bytes()
+            start = time.perf_counter()
+            builder.sync(base).pdf_bytes()
+            return time.perf_counter() - start
+
+        next_pdf_s = sorted(next_pdf() for _ in range(repeat))
+        grown = ReportBuilder().sync(base[:-1])
+        grown.pdf_bytes()
+        grown_bytes = grown.sync(base).pdf_bytes()
+        builder = ReportBuilder().sync(base)
+        pdf_bytes = builder.pdf_bytes()
+
+        results.append({
+            "messages": n,
+            "rebuild_s": _time(lambda: old_create_pdf(base), repeat),
+            "sync_s": percentile(sync_s, 50),
+            "pdf_s": _time(lambda: ReportBuilder().sync(base).pdf_bytes(), repeat),
+            "next_pdf_s": percentile(next_pdf_s, 50),
+            "same_pdf": (_strip_date(pdf_bytes) == _strip_date(old_create_pdf(base))
+                         == _strip_date(grown_bytes)),
+        })
+    return results
+
+
+def _strip_date(pdf):
+    # FPDF stamps the creation time into the document
+    return re.sub(rb"/CreationDate \(D:\d+\)", b"", pdf)
+
+
+def format_table(results):
+    lines = [f"{'messages':>9} {'rebuild/rerun':>14} {'sync/rerun':>11} {'speedup':>9} {'pdf on click':>13} {'next pdf':>10} {'same':>5}"]
+    for r in results:
+        lines.append(f"{r['messages']:>9} {r['rebuild_s'] * 1000:>12.2f}ms {r['sync_s'] * 1e6:>9.1f}us "
+                     f"{r['rebuild_s'] / max(r['sync_s'], 1e-9):>8.0f}x {r['pdf_s'] * 1000:>11.2f}ms "
+                     f"{r['next_pdf_s'] * 1000:>8.2f}ms {str(r['same_pdf']):>5}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the PDF report's cost per Streamlit rerun.")
+    parser.add_argument("--messages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.messages, args.repeat)
+    print(format_table(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
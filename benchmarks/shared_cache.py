@@ -0,0 +1,124 @@
+"""
+Shared SQLite response cache across worker processes.
+
+    python -m benchmarks.shared_cache --workers 4 --messages 500
+
+Every worker is a fresh process answering the same chat messages, each in
+its own order, the way a pool of gunicorn workers sees repeated traffic.
+Three phases:
+
+    per-worker   MEDIASSIST_SHARED_CACHE=off: each worker computes every answer
+    shared       the same workers, all concurrent, on one SQLite cache file
+    restarted    one new worker afterwards, on the now warm file
+
+For each phase it reports where answers came from (this process's cache, the
+shared file, or computed), per-message latency and the CPU all workers used.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.loadtest import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_WORKER = """
+import contextlib, io, json, random, sys, time
+n, seed = int(sys.argv[1]), int(sys.argv[2])
+with contextlib.redirect_stdout(io.StringIO()):
+    from app.agents import coordinator
+    from app.agents.cache import get_shared_cache
+    from benchmarks.corpus import chat_messages
+    coordinator.warmup()
+    shared = get_shared_cache()
+messages = chat_messages(n)
+random.Random(seed).shuffle(messages)
+print("ready", flush=True)
+sys.stdin.readline()
+
+samples = []
+cpu = time.process_time()
+for message in messages:
+    start = time.perf_counter()
+    coordinator.generate_response(message)
+    samples.append(time.perf_counter() - start)
+print(json.dumps({
+    "samples": samples,
+    "cpu_s": time.process_time() - cpu,
+    "local_hits": coordinator.response_cache.hits,
+    "shared_hits": shared.hits if shared else 0,
+}))
+"""
+
+
+def _phase(workers, n, env, first_seed=0):
+    """Runs `workers` processes at once (started together once all are warm)."""
+    procs = [subprocess.Popen([sys.executable, "-c", _WORKER, str(n), str(first_seed + i)], cwd=ROOT, env=env,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+             for i in range(workers)]
+    for proc in procs:
+        if proc.stdout.readline().strip() != "ready":
+            raise RuntimeError("benchmark worker failed to start")
+    for proc in procs:
+        proc.stdin.write("go\n")
+        proc.stdin.flush()
+    reports = []
+    for proc in procs:
+        out, _ = proc.communicate()
+        if proc.returncode:
+            raise RuntimeError(f"benchmark worker exited with {proc.returncode}")
+        reports.append(json.loads(out.strip().splitlines()[-1]))
+
+    samples = sorted(s for r in reports for s in r["samples"])
+    local_hits = sum(r["local_hits"] for r in reports)
+    shared_hits = sum(r["shared_hits"] for r in reports)
+    return {
+        "workers": workers,
+        "messages": len(samples),
+        "local_hits": local_hits,
+        "shared_hits": shared_hits,
+        "computed": len(samples) - local_hits - shared_hits,
+        "p50_us": percentile(samples, 50) * 1e6,
+        "p90_us": percentile(samples, 90) * 1e6,
+        "cpu_s": sum(r["cpu_s"] for r in reports),
+    }
+
+
+def run(workers=4, n=500):
+    with tempfile.TemporaryDirectory() as tmp:
+        base = dict(os.environ, MEDIASSIST_METRICS="0", MEDIASSIST_SHARED_CACHE_DB=os.path.join(tmp, "cache.sqlite3"))
+        off = dict(base, MEDIASSIST_SHARED_CACHE="off")
+        shared = dict(base, MEDIASSIST_SHARED_CACHE="sqlite")
+        return {
+            "per-worker": _phase(workers, n, off),
+            "shared": _phase(workers, n, shared),
+            "restarted": _phase(1, n, shared, first_seed=workers),
+        }
+
+
+def format_table(results):
+    lines = [f"{'phase':<12}{'workers':>8}{'msgs':>7}{'local':>7}{'shared':>8}{'computed':>10}"
+             f"{'hit rate':>10}{'p50 us':>9}{'p90 us':>10}{'CPU s':>8}"]
+    for phase, r in results.items():
+        hit_rate = (r["local_hits"] + r["shared_hits"]) / r["messages"]
+        lines.append(f"{phase:<12}{r['workers']:>8}{r['messages']:>7}{r['local_hits']:>7}{r['shared_hits']:>8}"
+                     f"{r['computed']:>10}{hit_rate:>10.1%}{r['p50_us']:>9.1f}{r['p90_us']:>10.1f}{r['cpu_s']:>8.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared SQLite response cache across worker processes.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    results = run(args.workers, args.messages)
+    print(format_table(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Benchmark cases. Each case is a setup function returning (func, inputs);
+agents are imported inside the setup so a missing dependency only skips the
+cases that need it.
+"""
+from benchmarks import corpus
+
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("extract.parse")
+def _extract(n):
+    from app.agents.providers import extractor
+    return extractor.get().parse, corpus.chat_messages(n)
+
+
+@case("intent.classify")
+def _intent(n):
+    from app.agents.intent import IntentRouter
+    router = IntentRouter()
+    return router.classify, [" ".join(m.lower().split()) for m in corpus.mixed_messages(n)]
+
+
+@case("triage.check_triage")
+def _triage(n):
+    from app.agents.triage_agent import triage_agent
+    return triage_agent.check_triage, corpus.chat_messages(n)
+
+
+@case("triage.assess_severity")
+def _severity(n):
+    from app.agents.triage_agent import triage_agent
+    return triage_agent.assess_severity, corpus.symptom_messages(n)
+
+
+@case("symptom.predict_disease")
+def _predict(n):
+    from app.agents.symptom_agent import symptom_agent
+    return symptom_agent.predict_disease, corpus.symptom_messages(n)
+
+
+@case("symptom.predict_disease.prefilter")
+def _predict_prefilter(n):
+    from app.agents.symptom_agent import symptom_agent
+
+    def predict(message):
+        return symptom_agent.predict_disease_batch([message], prefilter=True)[0]
+
+    return predict, corpus.symptom_messages(n)
+
+
+@case("disease_index.rank")
+def _disease_rank(n):
+    from app.agents.providers import disease_index, extractor
+    return disease_index.get().rank, [extractor.get().parse(m).symptoms for m in corpus.symptom_messages(n)]
+
+
+def _knowledge(kind, n):
+    from app.agents.knowledge_agent import knowledge_agent
+    topics = corpus.knowledge_topics(kind, n, synonyms=knowledge_agent.synonyms)
+    return knowledge_agent.get_info, topics
+
+
+@case("knowledge.get_info.exact")
+def _knowledge_exact(n):
+    return _knowledge("exact", n)
+
+
+@case("knowledge.get_info.synonym")
+def _knowledge_synonym(n):
+    return _knowledge("synonym", n)
+
+
+@case("knowledge.get_info.fuzzy")
+def _knowledge_fuzzy(n):
+    return _knowledge("fuzzy", n)
+
+
+@case("knowledge.get_info.miss")
+def _knowledge_miss(n):
+    return _knowledge("miss", n)
+
+
+def _fuzzy(matcher_name, size, n):
+    from app.agents import fuzzy
+    names = corpus.synthetic_disease_names(size)
+    matcher = getattr(fuzzy, matcher_name)(names)
+    # difflib is linear in catalog size; keep its big runs short
+    n = n if matcher_name != "DifflibMatcher" else max(5, n * 50 // size)
+    return matcher.match, corpus.fuzzy_queries(names, min(n, 500))
+
+
+for _size in (50, 5000, 50000):
+    case(f"fuzzy.ngram.{_size}")(lambda n, size=_size: _fuzzy("NGramMatcher", size, n))
+    case(f"fuzzy.difflib.{_size}")(lambda n, size=_size: _fuzzy("DifflibMatcher", size, n))
+
+
+@case("coordinator.format_prediction")
+def _format(n):
+    from app.agents import coordinator
+    from app.agents.symptom_agent import symptom_agent
+    pinned = coordinator._Pinned()
+    predictions = symptom_agent.predict_disease_batch(corpus.symptom_messages(n))
+
+    def format_prediction(prediction):
+        return coordinator._format_prediction(prediction, "SAFE", "", pinned)
+
+    return format_prediction, predictions
+
+
+@case("coordinator.generate_response")
+def _end_to_end(n):
+    from app.agents import coordinator
+
+    def uncached(message):
+        coordinator.response_cache.clear()
+        return coordinator.generate_response(message)
+
+    return uncached, corpus.chat_messages(n)
+
+
+@case("coordinator.generate_response.mixed")
+def _end_to_end_mixed(n):
+    from app.agents import coordinator
+
+    def uncached(message):
+        coordinator.response_cache.clear()
+        return coordinator.generate_response(message)
+
+    return uncached, corpus.mixed_messages(n)
+
+
+@case("coordinator.generate_response.cached")
+def _end_to_end_cached(n):
+    from app.agents import coordinator
+    coordinator.response_cache.clear()
+    # Small pool of repeated messages, like real traffic
+    return coordinator.generate_response, corpus.chat_messages(50) * max(1, n // 50)
+
+
+@case("coordinator.generate_response.session")
+def _end_to_end_session(n):
+    from app.agents import coordinator
+    # 20 concurrent conversations; each turn adds one symptom message
+    messages = corpus.symptom_messages(n)
+    turns = iter(range(len(messages) * 1000))
+
+    def in_session(message):
+        return coordinator.generate_response(message, session_id=f"bench-{next(turns) % 20}")
+
+    return in_session, messages
+
+
+def _first_part(messages):
+    from app.agents import coordinator
+
+    def first_part(message):
+        # Time to the first streamed part, e.g. the emergency warning
+        coordinator.response_cache.clear()
+        parts = coordinator.iter_response(message)
+        first = next(parts)
+        parts.close()
+        return first
+
+    return first_part, messages
+
+
+@case("coordinator.stream.first_part")
+def _stream_first_part(n):
+    return _first_part(corpus.symptom_messages(n))
+
+
+@case("coordinator.stream.first_part.emergency")
+def _stream_first_part_emergency(n):
+    return _first_part([corpus.EMERGENCY_MESSAGES[i % len(corpus.EMERGENCY_MESSAGES)] for i in range(n)])
+
+
+@case("api.chat")
+def _flask_api(n):
+    from app.main import app
+    from app.agents import coordinator
+    client = app.test_client()
+
+    def post(message):
+        coordinator.response_cache.clear()
+        resp = client.post("/api/chat", json={"message": message})
+        assert resp.status_code == 200
+        return resp
+
+    return post, corpus.chat_messages(n)
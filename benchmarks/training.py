@@ -0,0 +1,179 @@
+"""
+Training-time comparison on a synthetically scaled dataset.csv.
+
+    python -m benchmarks.training --scale 1 10 100
+
+For every scale factor N a temporary CSV with the dataset repeated N times
+(symptom order shuffled per copy) is written, then timed:
+
+    rowwise     the old df.apply(combine_symptoms, axis=1) feature builder
+    vectorized  train_model.build_features (pandas string ops per column)
+    eager       train_model.train(dedup=False): every row, TF-IDF on the text
+    dedup       train_model.train: unique symptom sets + sample weights,
+                CSR built from symptom IDs
+    streaming   train_model.train_streaming: chunks + HashingVectorizer + partial_fit
+
+Each training mode runs in a fresh process, so peak RSS is its own. The
+dedup model is compared with the eager one (max probability difference).
+Models are written to a temporary directory, never to ml_models/.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import DATA_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_TRAIN_PROBE = """
+import contextlib, io, json, resource, sys, time
+import train_model
+dataset, model_dir, mode, chunksize = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    if mode == "streaming":
+        accuracy = train_model.train_streaming(dataset, model_dir, chunksize)
+    else:
+        accuracy = train_model.train(dataset, model_dir, dedup=(mode == "dedup"))
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "accuracy": accuracy,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+TRAIN_MODES = ("eager", "dedup", "streaming")
+
+
+def scale_dataset(dst, factor, src=None, seed=0):
+    """Writes dataset.csv repeated `factor` times to dst; returns the row count."""
+    src = src or os.path.join(DATA_DIR, "dataset.csv")
+    rng = random.Random(seed)
+    with open(src, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+
+    width = len(header) - 1
+    with open(dst, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for _ in range(factor):
+            for row in rows:
+                symptoms = [cell for cell in row[1:] if cell]
+                rng.shuffle(symptoms)
+                writer.writerow([row[0]] + symptoms + [""] * (width - len(symptoms)))
+    return len(rows) * factor
+
+
+def rowwise_features(df, clean_text):
+    """The per-row feature builder train_model used before build_features."""
+    symptom_cols = [col for col in df.columns if 'Symptom' in col]
+
+    def combine_symptoms(row):
+        symptoms = [str(row[c]) for c in symptom_cols if row[c] != '']
+        cleaned_symptoms = [clean_text(s) for s in symptoms]
+        return " ".join(cleaned_symptoms)
+
+    return df.apply(combine_symptoms, axis=1)
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def _train(dataset, model_dir, mode, chunksize):
+    os.makedirs(model_dir, exist_ok=True)
+    env = dict(os.environ, MEDIASSIST_METRICS="0")
+    out = subprocess.run([sys.executable, "-c", _TRAIN_PROBE, dataset, model_dir, mode, str(chunksize)],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _max_proba_diff(model_dir_a, model_dir_b, texts):
+    import joblib
+    import numpy as np
+
+    a = joblib.load(os.path.join(model_dir_a, "symptom_model.pkl"))
+    b = joblib.load(os.path.join(model_dir_b, "symptom_model.pkl"))
+    if list(a.classes_) != list(b.classes_):
+        return float("inf")
+    return float(np.abs(a.predict_proba(texts) - b.predict_proba(texts)).max())
+
+
+def run(scales=(1, 10, 50), chunksize=None, train=True):
+    import pandas as pd
+    import train_model
+
+    chunksize = chunksize or train_model.DEFAULT_CHUNKSIZE
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = os.path.join(tmp, "dataset.csv")
+        for factor in scales:
+            n_rows = scale_dataset(dataset, factor)
+            df = pd.read_csv(dataset).fillna('')
+
+            rowwise_s, expected = _timed(rowwise_features, df, train_model.clean_text)
+            vectorized_s, actual = _timed(train_model.build_features, df)
+            result = {
+                "scale": factor,
+                "rows": n_rows,
+                "rowwise_s": rowwise_s,
+                "vectorized_s": vectorized_s,
+                "features_match": bool((expected == actual).all()),
+            }
+            probe = list(actual.sample(min(len(actual), 2000), random_state=0))
+            del df, expected, actual
+
+            if train:
+                for mode in TRAIN_MODES:
+                    result[mode] = _train(dataset, os.path.join(tmp, mode), mode, chunksize)
+                result["dedup"]["max_proba_diff"] = _max_proba_diff(
+                    os.path.join(tmp, "eager"), os.path.join(tmp, "dedup"), probe)
+            results.append(result)
+    return results
+
+
+def format_table(results):
+    lines = [f"{'rows':>10} {'rowwise':>9} {'vector':>9} {'speedup':>8} {'same':>5}"]
+    for r in results:
+        lines.append(f"{r['rows']:>10,} {r['rowwise_s']:>8.2f}s {r['vectorized_s']:>8.2f}s "
+                     f"{r['rowwise_s'] / max(r['vectorized_s'], 1e-9):>7.1f}x {str(r['features_match']):>5}")
+
+    if any("eager" in r for r in results):
+        lines += ["", f"{'rows':>10} {'mode':<10}{'train':>9}{'peak RSS':>11}{'accuracy':>10}{'max |dp|':>11}"]
+        for r in results:
+            for mode in TRAIN_MODES:
+                t = r[mode]
+                diff = f"{t['max_proba_diff']:>11.1e}" if "max_proba_diff" in t else ""
+                lines.append(f"{r['rows']:>10,} {mode:<10}{t['seconds']:>8.2f}s{t['max_rss_mb']:>8.0f} MB"
+                             f"{t['accuracy'] * 100:>9.2f}%{diff}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare training preprocessing and modes on a scaled dataset.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 50],
+                        help="How many copies of dataset.csv to train on")
+    parser.add_argument("--chunksize", type=int, default=None, help="Rows per chunk for the streaming mode")
+    parser.add_argument("--features-only", action="store_true", help="Only time feature building")
+    args = parser.parse_args(argv)
+
+    results = run(args.scale, args.chunksize, train=not args.features_only)
+    print(format_table(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
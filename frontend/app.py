@@ -1,11 +1,15 @@
 import streamlit as st
 import requests
-from fpdf import FPDF
 import speech_recognition as sr
-import re
+import json
+
+from report import ReportBuilder
 
 # --- CONFIGURATION ---
 ST_API_URL = "http://127.0.0.1:5000/api/chat"
+ST_STREAM_URL = "http://127.0.0.1:5000/api/chat/stream"
+# (connect, read) seconds; a reply can take a while on a cold backend
+ST_TIMEOUT = (5, 60)
 
 st.set_page_config(
     page_title="MediAssist AI",
@@ -16,6 +20,8 @@ st.set_page_config(
 # --- SESSION STATE ---
 if "messages" not in st.session_state:
     st.session_state.messages = []
+if "report" not in st.session_state:
+    st.session_state.report = ReportBuilder()
 
 # --- SAFE RERUN FUNCTION (Fixes Version Errors) ---
 def safe_rerun():
@@ -101,58 +107,6 @@ def apply_theme(mode):
         # Fallback if styling fails
         print(f"Theme Error: {e}")
 
-# --- TEXT SANITIZER (fixes latin-1 crashes) ---
-_LATIN1_SAFE_MAP = {
-    "\u2018": "'",  # left single quote
-    "\u2019": "'",  # right single quote
-    "\u201C": '"',  # left double quote
-    "\u201D": '"',  # right double quote
-    "\u2013": "-",  # en dash
-    "\u2014": "-",  # em dash
-    "\u2022": "-",  # bullet
-    "\u2212": "-",  # minus sign
-    "\u00A0": " ",  # non-breaking space
-    "\u200B": "",   # zero-width space
-    "\uFEFF": "",   # BOM/ZWNBSP
-}
-
-def sanitize_to_latin1(text: str) -> str:
-    if not isinstance(text, str):
-        text = str(text)
-    # Replace common troublemakers
-    for bad, good in _LATIN1_SAFE_MAP.items():
-        text = text.replace(bad, good)
-    # Strip other non-latin-1 code points while keeping readable content
-    # (encode/decode trick)
-    text = text.encode("latin-1", "ignore").decode("latin-1")
-    # Collapse accidental control characters except newlines/tabs
-    text = re.sub(r"[^\x09\x0A\x0D\x20-\x7E\xA0-\xFF]", "", text)
-    return text
-
-# --- PDF GENERATOR ---
-def create_pdf(chat_history):
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, txt="MediAssist AI - Consultation Report", ln=True, align='C')
-    pdf.ln(5)
-
-    for msg in chat_history:
-        role = "Patient" if msg.get("role") == "user" else "MediAssist AI"
-        # Remove markdown emphasis then sanitize to latin-1
-        raw = (msg.get("content") or "").replace("**", "").replace("*", "")
-        text = sanitize_to_latin1(raw)
-
-        pdf.set_font("Arial", style='B', size=12)
-        pdf.cell(0, 8, sanitize_to_latin1(f"{role}:"), ln=True)
-        pdf.set_font("Arial", size=12)
-        pdf.multi_cell(0, 8, text)
-        pdf.ln(1)
-
-    # FPDF classic produces a str for dest='S'; Streamlit needs bytes
-    return pdf.output(dest='S').encode('latin-1')
-
 # --- VOICE RECORDER ---
 def record_voice():
     r = sr.Recognizer()
@@ -166,15 +120,56 @@ def record_voice():
             return None
 
 # --- BACKEND API CALL ---
+@st.cache_resource
+def api_session():
+    """One keep-alive connection pool per Streamlit server, shared by every rerun."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 def get_bot_response(user_text):
     try:
-        response = requests.post(ST_API_URL, json={"message": user_text})
+        response = api_session().post(ST_API_URL, json={"message": user_text}, timeout=ST_TIMEOUT)
         if response.status_code == 200:
             return response.json().get("response", "Error: Empty response.")
         return "Error: Backend returned failure status."
     except Exception as e:
         return f"Error: Could not connect to server. ({str(e)})"
 
+def stream_bot_response(user_text):
+    """Yields the reply so far each time the backend sends another part (SSE)."""
+    reply = ""
+    try:
+        with api_session().post(ST_STREAM_URL, json={"message": user_text}, stream=True, timeout=ST_TIMEOUT) as response:
+            if response.status_code != 200:
+                yield get_bot_response(user_text)
+                return
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: done"):
+                    break
+                if line.startswith("data: "):
+                    reply += json.loads(line[len("data: "):]).get("delta", "")
+                    yield reply
+    except Exception:
+        if not reply:
+            # Older backend without /api/chat/stream, or the stream broke before any part
+            yield get_bot_response(user_text)
+            return
+    if not reply:
+        yield "Error: Empty response."
+
+def show_streamed_reply(user_text):
+    """Renders the reply part by part and returns the full text."""
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        bot_reply = ""
+        for bot_reply in stream_bot_response(user_text):
+            placeholder.markdown(bot_reply + " ▌")
+        placeholder.markdown(bot_reply)
+    return bot_reply
+
 # --- SIDEBAR ---
 with st.sidebar:
     st.header("⚙️ Settings")
@@ -188,14 +183,16 @@ with st.sidebar:
             safe_rerun()
     with col2:
         if st.session_state.messages:
-            pdf_data = create_pdf(st.session_state.messages)
-            st.download_button(
-                "💾 PDF",
-                data=pdf_data,
-                file_name="Report.pdf",
-                mime="application/pdf",
-                use_container_width=True,
-            )
+            # Only new messages are processed per rerun; the PDF is built on request
+            report = st.session_state.report.sync(st.session_state.messages)
+            if report.ready or st.button("📄 PDF", use_container_width=True):
+                st.download_button(
+                    "💾 PDF",
+                    data=report.pdf_bytes(),
+                    file_name="Report.pdf",
+                    mime="application/pdf",
+                    use_container_width=True,
+                )
 
 # --- MAIN PAGE ---
 
@@ -228,16 +225,18 @@ with col_mic:
         voice_text = record_voice()
         if voice_text:
             st.session_state.messages.append({"role": "user", "content": voice_text})
-            with st.spinner("Processing voice..."):
-                bot_reply = get_bot_response(voice_text)
-                st.session_state.messages.append({"role": "assistant", "content": bot_reply})
+            with st.chat_message("user"):
+                st.markdown(voice_text)
+            bot_reply = show_streamed_reply(voice_text)
+            st.session_state.messages.append({"role": "assistant", "content": bot_reply})
             safe_rerun()
 
 # TEXT INPUT
 prompt = st.chat_input("Type your symptoms here...")
 if prompt:
     st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.spinner("Thinking..."):
-        bot_reply = get_bot_response(prompt)
-        st.session_state.messages.append({"role": "assistant", "content": bot_reply})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+    bot_reply = show_streamed_reply(prompt)
+    st.session_state.messages.append({"role": "assistant", "content": bot_reply})
     safe_rerun()
@@ -0,0 +1,137 @@
+"""
+Consultation report (PDF) for the Streamlit UIs.
+
+The sidebar is redrawn on every Streamlit rerun, i.e. on every message. The
+ReportBuilder keeps the sanitized text of each message it has already seen,
+so a rerun only processes messages added since the last one, and the PDF
+itself is rendered only when it is asked for (and reused until the chat
+changes).
+
+Rendering is incremental too. Laying text out into pages is most of the
+cost, so the builder keeps one open FPDF document with every message laid
+out so far. A download lays out only the messages added since the last one,
+then finalizes a copy: output() closes a document for good, and the open
+one must keep taking messages.
+"""
+import copy
+
+REPORT_TITLE = "MediAssist AI - Consultation Report"
+
+# Characters with a readable latin-1 stand-in
+_LATIN1_SAFE_MAP = {
+    "\u2018": "'",  # left single quote
+    "\u2019": "'",  # right single quote
+    "\u201C": '"',  # left double quote
+    "\u201D": '"',  # right double quote
+    "\u2013": "-",  # en dash
+    "\u2014": "-",  # em dash
+    "\u2022": "-",  # bullet
+    "\u2212": "-",  # minus sign
+    "\u00A0": " ",  # non-breaking space
+    "\u200B": "",   # zero-width space
+    "\uFEFF": "",   # BOM/ZWNBSP
+}
+
+
+class _Latin1Table(dict):
+    """
+    str.translate table: the stand-ins above, and every other character is
+    kept if FPDF's latin-1 fonts can print it (tab/newline/CR, printable
+    ASCII, U+00A0-U+00FF) or dropped. Filled in lazily, one entry per
+    distinct character ever seen.
+    """
+
+    def __missing__(self, codepoint):
+        keep = codepoint in (0x09, 0x0A, 0x0D) or 0x20 <= codepoint <= 0x7E or 0xA0 <= codepoint <= 0xFF
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+
+_LATIN1_TABLE = _Latin1Table(str.maketrans(_LATIN1_SAFE_MAP))
+# Markdown emphasis markers are dropped from the report text
+_REPORT_TABLE = _Latin1Table({**_LATIN1_TABLE, ord("*"): None})
+
+
+def sanitize_to_latin1(text):
+    """Text FPDF's core fonts can encode, in one str.translate pass."""
+    if not isinstance(text, str):
+        text = str(text)
+    return text.translate(_LATIN1_TABLE)
+
+
+def report_text(markdown):
+    """A chat message as report text: no '*' emphasis, latin-1 only."""
+    if not isinstance(markdown, str):
+        markdown = str(markdown or "")
+    return markdown.translate(_REPORT_TABLE)
+
+
+class ReportBuilder:
+    def __init__(self, title=REPORT_TITLE):
+        self.title = title
+        self._blocks = []      # (role label, report text) per message
+        self._last = None      # last message consumed, to detect a replaced history
+        self._pdf = None       # cached PDF bytes for the current blocks
+        self._doc = None       # open FPDF document with the first _laid_out blocks
+        self._laid_out = 0
+
+    def __len__(self):
+        return len(self._blocks)
+
+    @property
+    def ready(self):
+        """True if the PDF for the current history is already rendered."""
+        return self._pdf is not None
+
+    def sync(self, messages):
+        """Catches up with `messages` (st.session_state.messages); only new ones are processed."""
+        seen = len(self._blocks)
+        if len(messages) < seen or (seen and messages[seen - 1] is not self._last):
+            # History cleared or replaced: start over
+            self._blocks = []
+            self._pdf = None
+            self._doc = None
+            self._laid_out = 0
+            seen = 0
+        if len(messages) == seen:
+            return self
+
+        for msg in messages[seen:]:
+            role = "Patient" if msg.get("role") == "user" else "MediAssist AI"
+            self._blocks.append((role + ":", report_text(msg.get("content"))))
+        self._last = messages[-1]
+        self._pdf = None
+        return self
+
+    def pdf_bytes(self):
+        """The report as PDF bytes; rendered on first call after the history changed."""
+        if self._pdf is None:
+            self._pdf = self._render()
+        return self._pdf
+
+    def _render(self):
+        if self._doc is None:
+            self._doc = self._new_document()
+            self._laid_out = 0
+        pdf = self._doc
+        for role, text in self._blocks[self._laid_out:]:
+            pdf.set_font("Arial", style='B', size=12)
+            pdf.cell(0, 8, role, ln=True)
+            pdf.set_font("Arial", size=12)
+            pdf.multi_cell(0, 8, text)
+            pdf.ln(1)
+        self._laid_out = len(self._blocks)
+
+        # FPDF classic produces a str for dest='S'; Streamlit needs bytes
+        return copy.deepcopy(pdf).output(dest='S').encode('latin-1')
+
+    def _new_document(self):
+        from fpdf import FPDF  # only needed when a report is actually downloaded
+
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        pdf.cell(0, 10, txt=sanitize_to_latin1(self.title), ln=True, align='C')
+        pdf.ln(5)
+        return pdf
@@ -0,0 +1,21 @@
+# Production server config:  gunicorn -c gunicorn.conf.py app.asgi:app
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get("MEDIASSIST_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("MEDIASSIST_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 30
+keepalive = 5
+
+# Import the app (and load the model + CSVs) ONCE in the master; workers are
+# forked from it and share those pages copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the GC's reach, so collections in
+    # the workers don't touch (and copy) the shared pages.
+    gc.freeze()
+    server.log.info("MediAssist: agents preloaded, forking %s workers", workers)
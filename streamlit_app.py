@@ -1,7 +1,5 @@
 import streamlit as st
-from fpdf import FPDF
 import speech_recognition as sr
-import re
 import sys
 import os
 
@@ -9,15 +7,15 @@ import os
 # This allows the app to find your 'app' folder on Streamlit Cloud
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from frontend.report import ReportBuilder
+
 # Import the Coordinator Agent directly (No API/Flask needed)
-try:
+# Cached once per Streamlit server: reruns and new browser sessions reuse
+# the loaded model and knowledge base instead of loading them again.
+@st.cache_resource(show_spinner="Loading medical knowledge...")
+def load_coordinator_agent():
     from app.agents.coordinator import coordinator_agent
-except ImportError:
-    st.error("⚠️ Error: Could not import 'coordinator_agent'. Please check your project structure.")
-    # Fallback to prevent crash if file is missing
-    class MockAgent:
-        def process_message(self, msg): return "Error: Agent not found."
-    coordinator_agent = MockAgent()
+    return coordinator_agent.warmup()
 
 # --- CONFIGURATION ---
 st.set_page_config(
@@ -26,9 +24,21 @@ st.set_page_config(
     layout="centered"
 )
 
+# Loaded after set_page_config, which must be the first Streamlit call
+try:
+    coordinator_agent = load_coordinator_agent()
+except ImportError:
+    st.error("⚠️ Error: Could not import 'coordinator_agent'. Please check your project structure.")
+    # Fallback to prevent crash if file is missing
+    class MockAgent:
+        def process_message(self, msg): return "Error: Agent not found."
+    coordinator_agent = MockAgent()
+
 # --- SESSION STATE ---
 if "messages" not in st.session_state:
     st.session_state.messages = []
+if "report" not in st.session_state:
+    st.session_state.report = ReportBuilder()
 
 # --- SAFE RERUN FUNCTION ---
 def safe_rerun():
@@ -106,44 +116,6 @@ def apply_theme(mode):
     except Exception as e:
         print(f"Theme Error: {e}")
 
-# --- TEXT SANITIZER ---
-_LATIN1_SAFE_MAP = {
-    "\u2018": "'", "\u2019": "'", "\u201C": '"', "\u201D": '"',
-    "\u2013": "-", "\u2014": "-", "\u2022": "-", "\u2212": "-",
-    "\u00A0": " ", "\u200B": "", "\uFEFF": ""
-}
-
-def sanitize_to_latin1(text: str) -> str:
-    if not isinstance(text, str):
-        text = str(text)
-    for bad, good in _LATIN1_SAFE_MAP.items():
-        text = text.replace(bad, good)
-    text = text.encode("latin-1", "ignore").decode("latin-1")
-    text = re.sub(r"[^\x09\x0A\x0D\x20-\x7E\xA0-\xFF]", "", text)
-    return text
-
-# --- PDF GENERATOR ---
-def create_pdf(chat_history):
-    pdf = FPDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, txt="MediAssist AI - Consultation Report", ln=True, align='C')
-    pdf.ln(5)
-
-    for msg in chat_history:
-        role = "Patient" if msg.get("role") == "user" else "MediAssist AI"
-        raw = (msg.get("content") or "").replace("**", "").replace("*", "")
-        text = sanitize_to_latin1(raw)
-
-        pdf.set_font("Arial", style='B', size=12)
-        pdf.cell(0, 8, sanitize_to_latin1(f"{role}:"), ln=True)
-        pdf.set_font("Arial", size=12)
-        pdf.multi_cell(0, 8, text)
-        pdf.ln(1)
-
-    return pdf.output(dest='S').encode('latin-1')
-
 # --- VOICE RECORDER ---
 def record_voice():
     # NOTE: This works locally but may fail on Cloud (Servers have no mic)
@@ -179,14 +151,16 @@ with st.sidebar:
             safe_rerun()
     with col2:
         if st.session_state.messages:
-            pdf_data = create_pdf(st.session_state.messages)
-            st.download_button(
-                "💾 PDF",
-                data=pdf_data,
-                file_name="Report.pdf",
-                mime="application/pdf",
-                use_container_width=True,
-            )
+            # Only new messages are processed per rerun; the PDF is built on request
+            report = st.session_state.report.sync(st.session_state.messages)
+            if report.ready or st.button("📄 PDF", use_container_width=True):
+                st.download_button(
+                    "💾 PDF",
+                    data=report.pdf_bytes(),
+                    file_name="Report.pdf",
+                    mime="application/pdf",
+                    use_container_width=True,
+                )
 
 # --- MAIN PAGE ---
 
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+from app import asgi
+from app.agents.coordinator import MAX_BATCH
+from app.main import app as flask_app
+
+
+def _flask_post(path, body):
+    response = flask_app.test_client().post(path, json=body)
+    return response.status_code, response.get_json()
+
+
+def _asgi_post(path, body):
+    sent = []
+    chunks = [{"type": "http.request", "body": json.dumps(body).encode(), "more_body": False}]
+
+    async def receive():
+        return chunks.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "method": "POST", "headers": []}
+    asyncio.run(asgi.app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.fixture(params=[_flask_post, _asgi_post], ids=["flask", "asgi"])
+def post(request):
+    return request.param
+
+
+@pytest.fixture
+def post_batch(post):
+    return lambda body: post("/api/chat/batch", body)
+
+
+@pytest.mark.parametrize("path", ["/api/chat", "/api/chat/stream"])
+@pytest.mark.parametrize("body", [{"message": 5}, {"message": None}, {"message": ["hi"]}, ["hi"], "hi"])
+def test_chat_rejects_a_non_string_message(post, path, body):
+    status, payload = post(path, body)
+    assert status == 400
+    assert payload["error"] in ("'message' must be a string.", "Expected a JSON object.")
+
+
+def test_batch_rejects_a_non_object_body(post_batch):
+    status, payload = post_batch(["hi"])
+    assert status == 400
+    assert payload["error"] == "Expected a JSON object."
+
+
+def test_chat_answers_a_string_message(post):
+    status, payload = post("/api/chat", {"message": "  what is malaria  "})
+    assert status == 200
+    assert "Malaria" in payload["response"]
+
+
+def test_batch_answers_every_message(post_batch):
+    status, payload = post_batch({"messages": ["what is malaria", " ", "I have itching and skin rash"]})
+    assert status == 200
+    assert len(payload["responses"]) == 3
+    assert payload["responses"][1] == "Please enter a message."
+
+
+@pytest.mark.parametrize("messages", [["hello", 5], [None], "what is malaria", {"0": "hi"}])
+def test_batch_rejects_anything_but_a_list_of_strings(post_batch, messages):
+    status, payload = post_batch({"messages": messages})
+    assert status == 400
+    assert "list of strings" in payload["error"]
+
+
+def test_batch_size_is_capped(post_batch):
+    status, payload = post_batch({"messages": ["hi"] * (MAX_BATCH + 1)})
+    assert status == 413
+    assert str(MAX_BATCH) in payload["error"]
+
+
+def test_json_answer_explains_related_conditions():
+    from app.agents import coordinator
+    from app.agents.providers import disease_index, extractor
+
+    message = "I have itching and skin rash and nodal skin eruptions"
+    payload = coordinator.generate_response(message, fmt="json")
+    symptoms = extractor.get().parse(message).symptoms
+    expected = disease_index.get().rank(symptoms)
+    related = payload["related_conditions"]
+    assert [r["condition"] for r in related] == [m.disease for m in expected]
+    assert [r["score"] for r in related] == sorted((r["score"] for r in related), reverse=True)
+    for entry in related:
+        assert entry["matched_symptoms"] and set(entry["matched_symptoms"]) <= set(symptoms)
+    # Cached answers carry it too
+    assert coordinator.generate_response(message, fmt="json")["related_conditions"] == related
+
+
+@pytest.mark.parametrize("message", ["what is malaria", "I have itching and skin rash and nodal skin eruptions"])
+def test_json_answers_are_the_callers_to_modify(message):
+    from app.agents import coordinator
+
+    agent = coordinator.CoordinatorAgent()
+    expected = agent.process_message(message, fmt="json")
+    for answer in (agent.process_message(message, fmt="json"),  # cached by now
+                   agent.process_messages([message], fmt="json")[0],
+                   *agent.iter_message(message, fmt="json")):
+        for value in list(answer.values()):
+            if isinstance(value, list):
+                value.append("tampered")
+                value.clear()
+        answer.clear()
+    assert agent.process_message(message, fmt="json") == expected
+    assert agent.process_messages([message], fmt="json")[0] == expected
+    assert coordinator.templates.join(agent.iter_message(message, fmt="json"), "json") == expected
@@ -0,0 +1,132 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from app.agents import artifact
+from app.agents.disease_index import read_disease_symptoms
+from app.agents.extraction import DATA_DIR, load_vocabulary
+from app.agents.inference import NaiveBayesScorer
+from app.agents.knowledge_agent import KnowledgeAgent
+from app.agents.severity import read_weights
+
+SOURCES = ("symptom_Description.csv", "symptom_precaution.csv", "Symptom-severity.csv", "dataset.csv")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A private copy of the CSVs, so their mtimes and contents can be changed."""
+    directory = tmp_path / "data"
+    directory.mkdir()
+    for name in os.listdir(DATA_DIR):
+        if os.path.isfile(os.path.join(DATA_DIR, name)):
+            shutil.copy2(os.path.join(DATA_DIR, name), directory / name)
+    return str(directory)
+
+
+@pytest.fixture
+def built(tmp_path, data_dir):
+    return artifact.build(str(tmp_path / "test.artifact"), data_dir=data_dir)
+
+
+def test_layout(built):
+    with open(built, "rb") as f:
+        raw = f.read()
+    magic, header_len = artifact._PREAMBLE.unpack_from(raw, 0)
+    assert magic == artifact.MAGIC
+    header = json.loads(raw[artifact._PREAMBLE.size:artifact._PREAMBLE.size + header_len])
+    assert header["format"] == artifact.FORMAT
+
+    compiled = artifact.Artifact(built)
+    end = artifact._PREAMBLE.size + header_len
+    for name, spec in header["arrays"].items():
+        assert spec["offset"] % 64 == 0 and spec["offset"] >= end
+        view = compiled.array(name)
+        assert list(view.shape) == spec["shape"]
+        assert not view.flags.writeable
+        assert view.base is not None  # a view into the mapping, not a copy
+        expected = np.frombuffer(raw, dtype=spec["dtype"], count=view.size, offset=spec["offset"])
+        np.testing.assert_array_equal(view.ravel(), expected)
+        end = spec["offset"] + view.nbytes
+
+
+def test_sections_match_the_csv_path(built, data_dir):
+    compiled = artifact.load(built)
+    agent = KnowledgeAgent(desc_path=os.path.join(data_dir, "symptom_Description.csv"),
+                           prec_path=os.path.join(data_dir, "symptom_precaution.csv"), use_artifact=False)
+    assert compiled.knowledge == [[r["name"], r["description"], list(r["precautions"])]
+                                  for r in agent.index.records.values()]
+    assert compiled.synonyms == agent.synonyms
+    assert compiled.severity_weights == read_weights(os.path.join(data_dir, "Symptom-severity.csv"))
+    assert compiled.vocabulary == sorted(load_vocabulary(data_dir))
+    assert compiled.disease_symptoms == read_disease_symptoms(os.path.join(data_dir, "dataset.csv"))
+
+    scorer = NaiveBayesScorer.load(artifact.model_source())
+    texts = ["itching skin rash", "high fever cough", "zzyzx", ""]
+    mapped = compiled.scorer()
+    assert list(mapped.classes_) == list(scorer.classes_)
+    np.testing.assert_allclose(mapped.predict_proba(texts), scorer.predict_proba(texts), rtol=0, atol=1e-12)
+
+
+def test_changed_sources_are_not_matched(built, data_dir):
+    compiled = artifact.Artifact(built)
+    paths = {role: os.path.join(data_dir, name)
+             for role, name in zip(("description", "precautions", "severity", "dataset"), SOURCES)}
+    assert compiled.matches(paths)
+
+    # Copied around (new mtime, same bytes): rescued by the SHA-1
+    stat = os.stat(paths["dataset"])
+    os.utime(paths["dataset"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert compiled.matches(paths)
+
+    # Same size, different bytes
+    with open(paths["severity"], "r+b") as f:
+        first = f.read(1)
+        f.seek(0)
+        f.write(b"X" if first != b"X" else b"Y")
+    assert not compiled.matches(paths)
+    assert compiled.matches({role: path for role, path in paths.items() if role != "severity"})
+
+    # Different size, missing file, another file name, unknown role
+    with open(paths["dataset"], "ab") as f:
+        f.write(b"\n")
+    assert not compiled.matches({"dataset": paths["dataset"]})
+    assert not compiled.matches({"description": os.path.join(data_dir, "missing.csv")})
+    assert not compiled.matches({"description": paths["precautions"]})
+    assert not compiled.matches({"unknown": paths["description"]})
+
+
+def _write(path, magic=artifact.MAGIC, header=None, raw=None):
+    with open(path, "wb") as f:
+        if raw is not None:
+            f.write(raw)
+            return
+        encoded = json.dumps(header or {}).encode()
+        f.write(artifact._PREAMBLE.pack(magic, len(encoded)) + encoded)
+
+
+@pytest.mark.parametrize("contents", [
+    {"magic": b"NOTMINE\x00", "header": {"format": artifact.FORMAT, "version": "x"}},
+    {"header": {"format": artifact.FORMAT + 1, "version": "x"}},
+    {"header": {"format": artifact.FORMAT}},  # no version
+    {"raw": b""},
+    {"raw": b"MEDI"},
+    {"raw": artifact._PREAMBLE.pack(artifact.MAGIC, 500) + b"{\"format\""},
+], ids=["magic", "format", "header", "empty", "truncated", "short-header"])
+def test_unreadable_artifacts_are_ignored(tmp_path, capsys, contents):
+    path = str(tmp_path / "bad.artifact")
+    _write(path, **contents)
+    assert artifact.load(path) is None
+    assert f"Artifact: ignoring {path}" in capsys.readouterr().out
+
+
+def test_load_maps_each_file_version_once(built, tmp_path, data_dir):
+    assert artifact.load("0") is None
+    assert artifact.load(str(tmp_path / "missing.artifact")) is None
+    first = artifact.load(built)
+    assert artifact.load(built) is first
+    artifact.build(built, data_dir=data_dir)  # replaced with a new inode
+    second = artifact.load(built)
+    assert second is not first and second.version == first.version
@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from app.agents import cache, coordinator, events
+from app.agents.cache import ResponseCache, SQLiteCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    responses = ResponseCache(maxsize=8, ttl=60, clock=clock)
+    responses.set("fever", "answer")
+    clock.now += 59
+    assert responses.get("fever") == "answer"
+    clock.now += 1
+    assert responses.get("fever") is None
+    assert len(responses) == 0
+    assert responses.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_at_capacity():
+    responses = ResponseCache(maxsize=2, ttl=0)
+    responses.set("a", 1)
+    responses.set("b", 2)
+    assert responses.get("a") == 1  # "b" is now the least recently used
+    responses.set("c", 3)
+    assert responses.get("b") is None
+    assert (responses.get("a"), responses.get("c")) == (1, 3)
+    assert responses.stats()["evictions"] == 1
+
+
+def test_maxsize_zero_disables_caching():
+    responses = ResponseCache(maxsize=0)
+    responses.set("a", 1)
+    assert responses.get("a") is None
+    assert len(responses) == 0
+
+
+@pytest.mark.parametrize("event", [events.MODEL_RELOADED, events.KNOWLEDGE_RELOADED])
+def test_reload_events_clear_the_response_cache(event):
+    coordinator.warmup()
+    coordinator.generate_response("what is malaria")
+    assert len(coordinator.response_cache)
+    invalidations = coordinator.response_cache.invalidations
+    events.publish(event)
+    assert len(coordinator.response_cache) == 0
+    assert coordinator.response_cache.invalidations == invalidations + 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer, reader = SQLiteCache(path), SQLiteCache(path)
+    writer.set("k", {"condition": "Malaria", "precautions": ["rest"]})
+    assert reader.get("k") == {"condition": "Malaria", "precautions": ["rest"]}
+    assert reader.get("missing") is None
+    assert (reader.hits, reader.misses) == (1, 1)
+
+    # Connections are per thread
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(reader.get("k")))
+    thread.start()
+    thread.join()
+    assert seen == [{"condition": "Malaria", "precautions": ["rest"]}]
+
+    reader.clear()
+    assert writer.get("k") is None
+
+
+def test_sqlite_cache_expires_and_prunes(tmp_path):
+    clock = FakeClock()
+    shared = SQLiteCache(str(tmp_path / "cache.sqlite3"), maxsize=3, ttl=60, prune_every=1000, clock=clock)
+    shared.set("old", 1)
+    clock.now += 61
+    assert shared.get("old") is None
+    assert shared.expirations == 1
+    for n in range(5):
+        clock.now += 1
+        shared.set(f"k{n}", n)
+    shared.prune()
+    assert len(shared) == 3
+    assert [shared.get(f"k{n}") for n in range(5)] == [None, None, 2, 3, 4]
+
+
+@pytest.fixture
+def shared_tier(tmp_path, monkeypatch):
+    shared = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(cache, "_shared", shared)
+    monkeypatch.setattr(cache, "_shared_created", True)
+    coordinator.warmup()
+    coordinator.response_cache.clear()
+    yield shared
+    coordinator.response_cache.clear()
+
+
+def test_shared_tier_warms_a_cold_process_cache(shared_tier):
+    message = "I have itching and skin rash"
+    first = coordinator.generate_response(message)
+    assert len(shared_tier) == 1
+
+    coordinator.response_cache.clear()  # e.g. a freshly started worker
+    assert coordinator.generate_response(message) == first
+    assert shared_tier.hits == 1
+    # Read-through: the next hit is served by this process
+    assert coordinator.generate_response(message) == first
+    assert shared_tier.hits == 1
+
+
+def test_shared_keys_carry_the_content_versions(shared_tier):
+    coordinator.generate_response("what is malaria")
+    (key,) = [row[0] for row in shared_tier._connection().execute("SELECT key FROM responses")]
+    assert key.startswith(coordinator._Pinned().versions() + "/")
@@ -0,0 +1,29 @@
+import numpy as np
+
+from app.agents.disease_index import DiseaseIndex
+
+TABLE = {
+    "Flu": ["chills", "cough", "high_fever"],
+    "Cold": ["cough", "runny_nose"],
+    "Migraine": ["headache", "nausea"],
+}
+WEIGHTS = {"chills": 3, "cough": 4, "high_fever": 7, "runny_nose": 5, "headache": 3, "nausea": 5}
+
+
+def test_columns_are_the_diseases_sharing_a_symptom_plus_unindexed_classes():
+    index = DiseaseIndex(TABLE, WEIGHTS)
+    classes = np.array(["Migraine", "Unlisted", "Cold", "Flu"])
+    assert index.columns(["cough"], classes) == [1, 2, 3]
+    assert index.columns(["nausea", "unknown"], classes) == [0, 1]
+    assert index.columns(["unknown"], classes) is None
+    assert index.columns([], classes) is None
+
+
+def test_rank_scores_by_weighted_jaccard_and_explains_matches():
+    index = DiseaseIndex(TABLE, WEIGHTS)
+    ranked = index.rank(["cough", "high_fever", "cough"])
+    assert [m.disease for m in ranked] == ["Flu", "Cold"]
+    assert ranked[0].matched == ("cough", "high_fever")
+    assert ranked[0].score == (4 + 7) / (4 + 3 + 7)
+    assert ranked[1].score == 4 / (11 + 9 - 4)
+    assert index.rank(["unknown"]) == []
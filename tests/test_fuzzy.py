@@ -0,0 +1,40 @@
+import random
+import string
+
+import pytest
+
+from app.agents.fuzzy import DifflibMatcher, NGramMatcher
+from app.agents.knowledge_agent import KnowledgeAgent
+from benchmarks import corpus
+
+
+def _random_queries(n, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(string.ascii_lowercase + " ") for _ in range(rng.randint(3, 14))) for _ in range(n)]
+
+
+@pytest.fixture(scope="module")
+def disease_names():
+    return KnowledgeAgent().index.matcher.choices
+
+
+@pytest.mark.parametrize("limit", [1, 3])
+def test_matches_difflib_on_the_disease_catalog(disease_names, limit):
+    ngram, difflib = NGramMatcher(disease_names), DifflibMatcher(disease_names)
+    queries = (["coronavirus", "spotting rash", "sore throat", "mild", "pahn"]
+               + corpus.fuzzy_queries(disease_names, 500) + _random_queries(500))
+    for query in queries:
+        assert ngram.match(query, limit) == difflib.match(query, limit), query
+
+
+def test_matches_difflib_on_a_large_catalog():
+    names = corpus.synthetic_disease_names(2000)
+    ngram, difflib = NGramMatcher(names), DifflibMatcher(names)
+    for query in corpus.fuzzy_queries(names, 50) + _random_queries(50, seed=1):
+        assert ngram.match(query, 3) == difflib.match(query, 3), query
+
+
+def test_weak_matches_stay_below_the_cutoff(disease_names):
+    matcher = NGramMatcher(disease_names)
+    assert matcher.match("coronavirus") == []
+    assert matcher.match("sore throat") == [("arthritis", 0.5)]
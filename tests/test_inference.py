@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+import train_model
+from app.agents.inference import NaiveBayesScorer, export_pipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OUT_OF_VOCABULARY = [
+    "",
+    "zzyzx quux",
+    "I feel absolutely wonderful today",
+    "itching zzyzx skin rash quux",
+    "Fever!!! and a COUGH, since yesterday...",
+]
+
+
+@pytest.fixture(scope="module")
+def dataset_texts():
+    df = pd.read_csv(train_model.DEFAULT_DATASET).fillna("")
+    return list(train_model.build_features(df)), list(df["Disease"])
+
+
+def _parity(pipeline, texts, tmp_path):
+    path = tmp_path / "model.npz"
+    assert export_pipeline(pipeline, str(path))
+    scorer = NaiveBayesScorer.load(str(path))
+    assert list(scorer.classes_) == list(pipeline.classes_)
+    np.testing.assert_allclose(scorer.predict_proba(texts), pipeline.predict_proba(texts), rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("vectorizer_params", [
+    {"stop_words": "english"},
+    {"stop_words": "english", "ngram_range": (1, 2), "sublinear_tf": True},
+    {"norm": None},
+])
+def test_scorer_matches_the_sklearn_pipeline(dataset_texts, tmp_path, vectorizer_params):
+    X, y = dataset_texts
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(**vectorizer_params)),
+        ("clf", MultinomialNB()),
+    ]).fit(X, y)
+    _parity(pipeline, X[::7] + OUT_OF_VOCABULARY, tmp_path)
+
+
+def test_unexportable_pipeline_is_rejected(tmp_path):
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(analyzer="char")),
+        ("clf", MultinomialNB()),
+    ]).fit(["itching rash", "cough fever"], ["a", "b"])
+    assert not export_pipeline(pipeline, str(tmp_path / "model.npz"))
+    assert not (tmp_path / "model.npz").exists()
+
+
+def test_committed_arrays_match_the_committed_pickle(dataset_texts):
+    import joblib
+
+    # train_model.py writes both; serving prefers the arrays
+    pipeline = joblib.load(os.path.join(ROOT, "ml_models", "symptom_model.pkl"))
+    scorer = NaiveBayesScorer.load(os.path.join(ROOT, "ml_models", "symptom_model.npz"))
+    texts = dataset_texts[0][::7] + OUT_OF_VOCABULARY
+    assert list(scorer.classes_) == list(pipeline.classes_)
+    np.testing.assert_allclose(scorer.predict_proba(texts), pipeline.predict_proba(texts), rtol=0, atol=1e-9)
+
+
+def test_serving_does_not_import_sklearn():
+    code = (
+        "import sys\n"
+        "from app.agents.symptom_agent import get_symptom_agent\n"
+        "assert get_symptom_agent().predict_disease('itching and skin rash')\n"
+        "assert 'sklearn' not in sys.modules and 'joblib' not in sys.modules, 'sklearn imported'\n"
+    )
+    env = dict(os.environ, MEDIASSIST_ARTIFACT="0")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
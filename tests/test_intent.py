@@ -0,0 +1,61 @@
+import pytest
+
+from app.agents import coordinator, templates
+from app.agents.extraction import parse
+from app.agents.intent import GREETING, KNOWLEDGE, SYMPTOM, UNKNOWN, IntentRouter, IntentRule
+
+
+@pytest.mark.parametrize("message, name, confidence, topic, short_circuit", [
+    ("hi", GREETING, 1.0, None, True),
+    ("Hello there!", GREETING, 1.0, None, True),
+    ("good morning.", GREETING, 1.0, None, True),
+    ("thanks a lot", GREETING, 1.0, None, True),
+    ("ok bye", GREETING, 1.0, None, True),
+    # Greetings only count as the whole message
+    ("hi, I have a fever", SYMPTOM, 0.9, None, False),
+    ("what is malaria?", KNOWLEDGE, 0.9, "malaria", False),
+    ("What is  Malaria ?", KNOWLEDGE, 0.9, "malaria", False),
+    ("tell me about acne", KNOWLEDGE, 0.9, "acne", False),
+    ("explain diabetes", KNOWLEDGE, 0.9, "diabetes", False),
+    ("what is", KNOWLEDGE, 0.9, "", False),
+    ("I have a fever and cough", SYMPTOM, 0.9, None, False),
+    ("itching and skin rash", SYMPTOM, 0.9, None, False),
+    # A symptom cue with no vocabulary symptom extracted
+    ("my head hurts", SYMPTOM, 0.6, None, False),
+    ("asdf qwerty", UNKNOWN, 0.0, None, False),
+])
+def test_routing(message, name, confidence, topic, short_circuit):
+    intent = parse(message).intent
+    assert (intent.name, intent.confidence, intent.topic, intent.short_circuit) == (
+        name, confidence, topic, short_circuit)
+
+
+@pytest.mark.parametrize("message, reply", [
+    ("hello", templates.GREETING_MSG),
+    ("Thank you so much!", templates.CLOSING_MSG),
+    ("what is", templates.NO_ANALYSIS_MSG),
+    ("asdf qwerty", templates.NO_ANALYSIS_MSG),
+])
+def test_replies(message, reply):
+    assert coordinator.generate_response(message) == reply
+
+
+def test_greeting_replies_skip_the_cache():
+    coordinator.response_cache.clear()
+    coordinator.generate_response("hi")
+    assert len(coordinator.response_cache) == 0
+
+
+def test_custom_rules_most_confident_wins_and_ties_go_to_the_earlier_match():
+    router = IntentRouter([
+        IntentRule("billing", r"\b(invoice|refund)\b", 0.7),
+        IntentRule("complaint", r"\b(refund|broken)\b", 0.7),
+        IntentRule("urgent", r"\bnow\b", 0.95, reply="On it."),
+        IntentRule(KNOWLEDGE, r"^define\b", 0.8, topic=True),
+    ])
+    assert router.classify("broken, refund please").name == "complaint"
+    assert router.classify("refund please").name == "billing"
+    urgent = router.classify("define refund now")
+    assert (urgent.name, urgent.topic, urgent.reply, urgent.short_circuit) == ("urgent", "refund now", "On it.", True)
+    assert router.classify("nothing here").name == UNKNOWN
+    assert router.classify("nothing here", symptoms=("cough",)).name == SYMPTOM
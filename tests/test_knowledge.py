@@ -0,0 +1,39 @@
+import random
+import string
+
+import pytest
+
+from app.agents.knowledge_agent import KnowledgeAgent, SubstringIndex
+from benchmarks import corpus
+
+
+def _first_containing(names, records, text):
+    """What the old every-substring dict returned: the first name (CSV order) containing `text`."""
+    return next((record for name, record in zip(names, records) if text and text in name), None)
+
+
+def _queries(names, n, seed=0):
+    rng = random.Random(seed)
+    substrings = [name[a:b] for name in names for a in range(len(name)) for b in range(a + 1, len(name) + 1)]
+    return (rng.sample(substrings, min(n, len(substrings)))
+            + ["".join(rng.choice(string.ascii_lowercase + " ") for _ in range(rng.randint(1, 12))) for _ in range(n)]
+            + [name + "x" for name in names] + ["", "zzzz"])
+
+
+@pytest.fixture(scope="module")
+def disease_names():
+    return list(KnowledgeAgent().index.records)
+
+
+@pytest.mark.parametrize("size", [None, 2000])
+def test_partial_lookup_matches_first_containing_name(disease_names, size):
+    names = disease_names if size is None else corpus.synthetic_disease_names(size)
+    records = [object() for _ in names]
+    index = SubstringIndex(names, records)
+    for text in _queries(names, 2000):
+        assert index.get(text) is _first_containing(names, records, text), text
+
+
+def test_partial_index_is_linear_in_name_length(disease_names):
+    index = SubstringIndex(disease_names, disease_names)
+    assert len(index._name) == sum(len(name) for name in disease_names)
@@ -0,0 +1,98 @@
+import csv
+import os
+import threading
+import time
+
+import pytest
+
+from app.agents import providers, reloader
+from app.agents.coordinator import generate_response, response_cache, warmup
+from app.agents.extraction import DATA_DIR
+from app.agents.knowledge_agent import KnowledgeAgent
+from benchmarks.corpus import chat_messages
+
+TAGS = ("snapshotalpha", "snapshotomega")
+RELOADS = 10
+# Reloads take milliseconds to a few hundred on a cold disk; far below this
+MAX_RELOAD_SECONDS = 5.0
+
+
+def _write_tagged(source, target, tag, columns):
+    """Copies a knowledge CSV with `tag` appended to the given columns."""
+    with open(source, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    for row in rows[1:]:
+        for col in columns:
+            if col < len(row) and row[col].strip():
+                row[col] = f"{row[col]} {tag}"
+    tmp = f"{target}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    os.replace(tmp, target)  # readers see the old file or the new one, never half of it
+
+
+@pytest.fixture
+def tagged_knowledge(tmp_path):
+    desc = str(tmp_path / "symptom_Description.csv")
+    prec = str(tmp_path / "symptom_precaution.csv")
+
+    def publish(tag):
+        _write_tagged(os.path.join(DATA_DIR, "symptom_Description.csv"), desc, tag, [1])
+        _write_tagged(os.path.join(DATA_DIR, "symptom_precaution.csv"), prec, tag, [1, 2, 3, 4])
+
+    warmup()
+    publish(TAGS[0])
+    original = providers.knowledge._agent
+    providers.knowledge._agent = KnowledgeAgent(desc_path=desc, prec_path=prec, use_artifact=False)
+    response_cache.clear()
+    try:
+        yield publish
+    finally:
+        providers.knowledge._agent = original
+        response_cache.clear()
+
+
+def test_reload_under_load_serves_one_snapshot_per_response(tagged_knowledge):
+    messages = [m for m in chat_messages(200)] + ["what is malaria", "what is typhoid", "tell me about acne"]
+    stop = threading.Event()
+    failures = []
+    seen = {tag: 0 for tag in TAGS}
+    lock = threading.Lock()
+
+    def worker(offset):
+        i = offset
+        while not stop.is_set():
+            try:
+                response = generate_response(messages[i % len(messages)]).lower()
+                tags = [tag for tag in TAGS if tag in response]
+                if len(tags) > 1:
+                    raise AssertionError(f"response mixes snapshots: {response[:200]!r}")
+                with lock:
+                    for tag in tags:
+                        seen[tag] += 1
+            except Exception as e:
+                with lock:
+                    failures.append(repr(e))
+            i += 4
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+
+    reload_seconds = []
+    try:
+        for n in range(RELOADS):
+            tagged_knowledge(TAGS[(n + 1) % 2])
+            start = time.perf_counter()
+            results = reloader.reload_agents("all")
+            reload_seconds.append(time.perf_counter() - start)
+            assert all(r["ok"] for r in results.values()), results
+            time.sleep(0.02)  # let requests run on each snapshot
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    assert not failures, failures[:3]
+    assert all(seen.values()), seen
+    assert max(reload_seconds) < MAX_RELOAD_SECONDS
@@ -0,0 +1,41 @@
+import re
+
+import pytest
+
+pytest.importorskip("fpdf")
+
+from frontend.report import ReportBuilder
+
+
+def _history(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant",
+             "content": f"Message {i}: **fever** and a headache \u2013 " + "word " * 40}
+            for i in range(n)]
+
+
+def _strip_date(pdf):
+    return re.sub(rb"/CreationDate \(D:\d+\)", b"", pdf)
+
+
+def test_incremental_pdf_matches_fresh_render():
+    history = _history(30)
+    builder = ReportBuilder()
+    for n in (1, 2, 10, 30):
+        builder.sync(history[:n]).pdf_bytes()
+    fresh = ReportBuilder().sync(history).pdf_bytes()
+    assert _strip_date(builder.pdf_bytes()) == _strip_date(fresh)
+
+
+def test_pdf_can_be_downloaded_twice():
+    builder = ReportBuilder().sync(_history(3))
+    first = builder.pdf_bytes()
+    builder._pdf = None  # force a second render of the same document
+    assert _strip_date(builder.pdf_bytes()) == _strip_date(first)
+
+
+def test_replaced_history_starts_a_new_document():
+    builder = ReportBuilder().sync(_history(6))
+    builder.pdf_bytes()
+    other = [{"role": "user", "content": "A different chat"}]
+    fresh = ReportBuilder().sync(other).pdf_bytes()
+    assert _strip_date(builder.sync(other).pdf_bytes()) == _strip_date(fresh)
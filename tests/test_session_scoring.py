@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from app.agents.extraction import parse
+from app.agents.inference import NaiveBayesScorer, export_pipeline
+from app.agents.sessions import Session
+from app.agents.symptom_agent import get_symptom_agent
+
+TRANSCRIPTS = [
+    ["I have itching", "and a skin rash", "nodal skin eruptions too"],
+    ["high fever", "", "zzyzx quux", "chills and high fever again", "vomiting"],
+    ["cough", "cough", "cough cough breathlessness"],
+]
+
+
+class FakeSnapshot:
+    def __init__(self, data, version):
+        self.data = data
+        self.version = version
+
+
+def _scorer(tmp_path, name, **vectorizer_params):
+    texts = ["itching skin rash", "high fever chills vomiting", "cough breathlessness chest",
+             "skin rash high fever", "chills cough"]
+    pipeline = Pipeline([("tfidf", TfidfVectorizer(**vectorizer_params)), ("clf", MultinomialNB())])
+    pipeline.fit(texts, ["Fungal", "Malaria", "Asthma", "Chicken pox", "Flu"])
+    path = str(tmp_path / f"{name}.npz")
+    assert export_pipeline(pipeline, path)
+    return NaiveBayesScorer.load(path)
+
+
+@pytest.fixture
+def scorers(tmp_path):
+    return {
+        "bundled": get_symptom_agent().model,
+        "sublinear-l1": _scorer(tmp_path, "sublinear", sublinear_tf=True, norm="l1"),
+        "no-norm": _scorer(tmp_path, "none", norm=None),
+    }
+
+
+@pytest.mark.parametrize("name", ["bundled", "sublinear-l1", "no-norm"])
+@pytest.mark.parametrize("turns", TRANSCRIPTS)
+def test_accumulated_evidence_matches_the_joined_transcript(scorers, name, turns):
+    scorer = scorers[name]
+    assert scorer.incremental
+    evidence = scorer.new_evidence()
+    texts = []
+    for turn in turns:
+        text = parse(turn).model_text
+        scorer.accumulate(evidence, text)
+        texts.append(text)
+        joined = scorer.predict_proba([" ".join(texts)])
+        np.testing.assert_allclose(scorer.evidence_proba(evidence), joined, rtol=0, atol=1e-12)
+
+
+def _predict_turns(agent, session, snapshot, turns):
+    result = None
+    for turn in turns:
+        result = agent.predict_session(session, turn, snapshot=snapshot)
+    return result
+
+
+def _expected(model, session, top_k=3, threshold=0.1):
+    probs = model.predict_proba([" ".join(session.texts)])[0]
+    order = np.argsort(-probs)[:top_k]
+    return {model.classes_[i]: probs[i] for i in order if probs[i] > threshold}
+
+
+def test_session_survives_a_serialized_round_trip_and_a_model_change(scorers):
+    agent = get_symptom_agent()
+    session = Session("s")
+    first = FakeSnapshot(scorers["bundled"], "v1")
+    _predict_turns(agent, session, first, TRANSCRIPTS[0][:2])
+    session = Session.from_dict(session.to_dict())  # e.g. via the SQLite store
+
+    result = agent.predict_session(session, TRANSCRIPTS[0][2], snapshot=first)
+    assert result.keys() == _expected(first.data, session).keys()
+    for disease, confidence in _expected(first.data, session).items():
+        assert result[disease] == pytest.approx(confidence, abs=1e-12)
+
+    # The model was reloaded: the kept turns are replayed into new evidence
+    second = FakeSnapshot(scorers["sublinear-l1"], "v2")
+    result = agent.predict_session(session, "vomiting", snapshot=second)
+    assert session.model_version == "v2"
+    expected = _expected(second.data, session)
+    assert result.keys() == expected.keys()
+    for disease, confidence in expected.items():
+        assert result[disease] == pytest.approx(confidence, abs=1e-12)
+
+
+def test_bigram_models_rescore_the_joined_transcript(tmp_path):
+    agent = get_symptom_agent()
+    scorer = _scorer(tmp_path, "bigram", ngram_range=(1, 2))
+    assert not scorer.incremental
+    session = Session("s")
+    snapshot = FakeSnapshot(scorer, "v1")
+    # "cough breathlessness" spans the two turns
+    turns = ["chills cough", "breathlessness"]
+    evidence = scorer.new_evidence()
+    for turn in turns:
+        scorer.accumulate(evidence, parse(turn).model_text)
+    joined = scorer.predict_proba([" ".join(parse(turn).model_text for turn in turns)])
+    assert np.abs(scorer.evidence_proba(evidence) - joined).max() > 1e-3
+
+    result = _predict_turns(agent, session, snapshot, turns)
+    assert session.evidence is None
+    expected = _expected(scorer, session)
+    assert result.keys() == expected.keys()
+    for disease, confidence in expected.items():
+        assert result[disease] == pytest.approx(confidence, abs=1e-12)
@@ -0,0 +1,64 @@
+import multiprocessing
+import sqlite3
+import time
+
+from app.agents.sessions import Session, SQLiteSessionStore
+
+PROCESSES = 4
+TURNS = 25
+
+
+def _add_turns(path, worker):
+    store = SQLiteSessionStore(path)
+
+    def add_turn(session):
+        time.sleep(0.001)  # widen the read-modify-write window
+        session.turns += 1
+        session.add_symptoms([f"symptom_{worker}_{session.turns}"])
+        session.add_text(f"worker {worker}")
+
+    for _ in range(TURNS):
+        store.update("shared", add_turn)
+
+
+def test_concurrent_turns_from_several_processes_are_not_lost(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    SQLiteSessionStore(path)  # create the schema once, before the workers race
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_add_turns, args=(path, n)) for n in range(PROCESSES)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(60)
+        assert p.exitcode == 0
+
+    session = SQLiteSessionStore(path).get("shared")
+    assert session.turns == PROCESSES * TURNS
+    assert len(session.symptoms) == PROCESSES * TURNS
+
+
+def test_update_returns_the_session_and_the_result(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+
+    def add_turn(session):
+        session.turns += 1
+        return session.turns
+
+    assert store.update("a", add_turn)[1] == 1
+    session, turns = store.update("a", add_turn)
+    assert turns == 2 and session.turns == 2
+    assert store.get("a").turns == 2
+
+
+def test_files_without_a_version_column_are_upgraded(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE sessions (id TEXT PRIMARY KEY, data TEXT NOT NULL, last_used REAL NOT NULL)")
+    conn.commit()
+    conn.close()
+
+    store = SQLiteSessionStore(path)
+    store.save(Session("old"))
+    store.update("old", lambda session: setattr(session, "turns", 3))
+    assert store.get("old").turns == 3
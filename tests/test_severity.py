@@ -0,0 +1,82 @@
+import csv
+import os
+
+import pytest
+
+from app.agents.extraction import DATA_DIR, canonical_symptom, parse
+from app.agents.severity import URGENT_SCORE, SeverityScorer
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return SeverityScorer.load()
+
+
+@pytest.mark.parametrize("message", [
+    "high fever and itching",
+    "runny nose, sneezing, chills, headache",
+    "I have itching and skin rash",
+    "I have a mild fever and a cough",
+    "high fever",
+])
+def test_benign_sets_are_normal(scorer, message):
+    assert scorer.score(parse(message).symptoms).level == "NORMAL"
+
+
+@pytest.mark.parametrize("message", [
+    "I have a high fever and swelling of stomach",
+    "I have high fever and weakness in limbs",
+    "high fever, coma",
+])
+def test_two_critical_symptoms_are_urgent(scorer, message):
+    result = scorer.score(parse(message).symptoms)
+    assert result.level == "URGENT"
+    assert result.critical == 2
+
+
+def test_many_serious_symptoms_are_urgent(scorer):
+    result = scorer.score(parse("I have vomiting, nausea, stomach pain, shivering, phlegm, congestion "
+                                "and a runny nose").symptoms)
+    assert result.critical == 0
+    assert result.score >= URGENT_SCORE
+    assert result.level == "URGENT"
+
+
+def test_one_serious_symptom_short_of_the_score_is_normal(scorer):
+    result = scorer.score(parse("vomiting, nausea, stomach pain, shivering, phlegm, congestion").symptoms)
+    assert result.score < URGENT_SCORE
+    assert result.level == "NORMAL"
+
+
+def test_light_symptoms_never_add_up_to_urgent(scorer):
+    light = [symptom for symptom, weight in scorer.weights.items() if weight < scorer.serious_weight]
+    result = scorer.score(light)
+    assert result.score == 0
+    assert not result.urgent
+
+
+def test_repeated_symptoms_count_once(scorer):
+    assert not scorer.score(["high_fever", "high_fever"]).urgent
+    assert not scorer.score(["vomiting"] * 10).urgent
+
+
+def test_urgent_message_names_the_symptoms_behind_the_rule():
+    from app.agents.triage_agent import TriageAgent
+
+    triage = TriageAgent()
+    status, message = triage.check_triage("high fever with weakness in limbs and itching")
+    assert status == "URGENT"
+    assert "high fever, weakness in limbs" in message and "itching" not in message
+    status, message = triage.check_triage("vomiting, nausea, stomach pain, shivering, phlegm, congestion, "
+                                          "runny nose and itching")
+    assert status == "URGENT"
+    assert "vomiting" in message and "itching" not in message
+
+
+def test_only_a_small_tail_of_the_dataset_is_urgent(scorer):
+    with open(os.path.join(DATA_DIR, "dataset.csv"), newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))[1:]
+    urgent = [row[0] for row in rows
+              if scorer.score([canonical_symptom(cell) for cell in row[1:] if cell.strip()]).urgent]
+    assert len(urgent) / len(rows) < 0.10
+    assert "Allergy" not in urgent and "Migraine" not in urgent
@@ -0,0 +1,81 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+import train_model
+
+# Repeated sets, shuffled columns, underscores/case/spacing variants, empty
+# cells, a stop word inside a symptom and a symptom only one disease lists
+FIXTURE = [
+    ("Flu", "high_fever", " cough", "chills", ""),
+    ("Flu", "cough", "High_Fever", "", "chills"),
+    ("Flu", "high_fever", "cough", "chills", ""),
+    ("Flu", "high_fever", "muscle_pain", "", ""),
+    ("Cold", "cough", "runny_nose", "", ""),
+    ("Cold", "runny_nose", "cough", "", ""),
+    ("Cold", "runny_nose", "sneezing", "cough", ""),
+    ("Allergy", "sneezing", "itching", "watering_from_eyes", ""),
+    ("Allergy", "itching", "sneezing", "", ""),
+    ("Allergy", "itching", "sneezing", "", ""),
+    ("Gastritis", "stomach_pain", "acidity", "pain_during_bowel_movements", "vomiting"),
+    ("Gastritis", "vomiting", "stomach_pain", "", ""),
+]
+QUERIES = ["high fever cough", "sneezing", "itching watering from eyes", "vomiting pain", "zzyzx", "",
+           "runny nose cough chills"]
+
+
+def _frame():
+    return pd.DataFrame(FIXTURE, columns=["Disease", "Symptom_1", "Symptom_2", "Symptom_3", "Symptom_4"])
+
+
+def _eager(df):
+    df = df.fillna("")
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(stop_words="english")),
+        ("clf", MultinomialNB()),
+    ]).fit(train_model.build_features(df), df["Disease"])
+
+
+def _deduplicated(df):
+    symptoms, diseases, keys, _, counts = train_model.canonical_rows(df.astype("category"))
+    return train_model.fit_deduplicated(keys, counts, symptoms, diseases)
+
+
+def _assert_same_model(a, b, texts):
+    assert list(a.classes_) == list(b.classes_)
+    np.testing.assert_allclose(a.predict_proba(texts), b.predict_proba(texts), rtol=0, atol=1e-12)
+
+
+def test_canonical_rows_collapse_reordered_and_respelled_rows():
+    symptoms, diseases, keys, inverse, counts = train_model.canonical_rows(_frame().astype("category"))
+    assert counts.sum() == len(FIXTURE)
+    assert inverse[0] == inverse[1] == inverse[2]
+    assert inverse[4] == inverse[5]
+    assert len(keys) == 8
+    assert "high fever" in symptoms and "" not in symptoms
+
+
+def test_deduplicated_fit_matches_eager_fit_on_a_fixture():
+    df = _frame()
+    eager = _eager(df)
+    dedup = _deduplicated(df)
+    assert dedup.named_steps["tfidf"].vocabulary_ == eager.named_steps["tfidf"].vocabulary_
+    _assert_same_model(dedup, eager, QUERIES + list(train_model.build_features(df)))
+
+
+def test_train_gives_the_same_model_and_accuracy_with_and_without_dedup(tmp_path):
+    eager_dir, dedup_dir = tmp_path / "eager", tmp_path / "dedup"
+    eager_dir.mkdir()
+    dedup_dir.mkdir()
+    eager_accuracy = train_model.train(model_dir=str(eager_dir), dedup=False)
+    dedup_accuracy = train_model.train(model_dir=str(dedup_dir), dedup=True)
+    assert dedup_accuracy == pytest.approx(eager_accuracy, abs=1e-12)
+
+    df = pd.read_csv(train_model.DEFAULT_DATASET).fillna("")
+    texts = list(train_model.build_features(df)[::11]) + QUERIES
+    _assert_same_model(joblib.load(dedup_dir / "symptom_model.pkl"),
+                       joblib.load(eager_dir / "symptom_model.pkl"), texts)
@@ -0,0 +1,83 @@
+import re
+
+import pytest
+
+from app.agents.triage_agent import TriageAgent
+
+
+@pytest.fixture(scope="module")
+def triage():
+    return TriageAgent()
+
+
+def _loop_outcome(triage, message):
+    """The nested substring loop the PhraseMatcher replaced: "anaphylaxis", a category or None."""
+    text = re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", message.lower())).strip()
+    if any(food in text for food in triage.allergy_triggers) and any(cue in text for cue in triage.airway_cues):
+        return "anaphylaxis"
+    for category, keywords in triage.emergency_keywords.items():
+        if any(keyword in text for keyword in keywords):
+            return category
+    return None
+
+
+def _outcome(triage, message):
+    status, reply = triage.check_triage(message)
+    if status != "EMERGENCY":
+        return None
+    if "ANAPHYLAXIS" in reply:
+        return "anaphylaxis"
+    return re.search(r"\*\*(\w+) emergency\*\*", reply).group(1).lower()
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("I have chest pain", "cardiac"),
+    ("sharp chest pains since this morning", "cardiac"),
+    ("Chest   Pain!!", "cardiac"),
+    ("tightness in chest and sweating", "cardiac"),
+    ("my face drooping and slurred speech", "stroke"),
+    ("I can't breathe", "respiratory"),
+    ("shortness of breath when walking", "respiratory"),
+    ("he is coughing up blood", "trauma"),
+    ("had a seizure", "general"),
+    ("two seizures today", "general"),
+    ("food poisoning I think", "general"),
+    ("I fainted at work", "general"),
+    # Several categories: the first in emergency_keywords order wins
+    ("numbness and chest pain", "cardiac"),
+    ("seizure and wheezing", "respiratory"),
+    # Allergen plus an airway cue
+    ("I ate peanuts and my throat feels tight", "anaphylaxis"),
+    ("ate shellfish, now short of breath", "anaphylaxis"),
+    ("egg allergy and my lips are swelling", "anaphylaxis"),
+    ("I ate peanuts and now have hives and my throat is closing", "anaphylaxis"),
+    # An allergen or an airway cue alone is not an emergency
+    ("I ate peanuts", None),
+    ("my throat is sore", None),
+    ("swelling of the ankle", None),
+    ("I have a headache and a mild fever", None),
+    ("itching and skin rash", None),
+])
+def test_outcomes_match_the_old_keyword_loop(triage, message, expected):
+    assert _outcome(triage, message) == expected
+    assert _loop_outcome(triage, message) == expected
+
+
+@pytest.mark.parametrize("message, expected, loop", [
+    # Phrases must start on a word boundary now; the loop fired inside words
+    ("I sort old archives all day", None, "allergic"),
+    ("singing reggae hurt my throat", None, "anaphylaxis"),
+    # They may still end inside a longer word, as before
+    ("chest painful when coughing", "cardiac", "cardiac"),
+    ("throat closing up after peanut butter", "anaphylaxis", "anaphylaxis"),
+])
+def test_word_boundaries(triage, message, expected, loop):
+    assert _outcome(triage, message) == expected
+    assert _loop_outcome(triage, message) == loop
+
+
+def test_every_keyword_is_found_in_a_sentence(triage):
+    for category, keywords in triage.emergency_keywords.items():
+        for keyword in keywords:
+            labels = [label for label, _, _, _ in triage.find_matches(f"since yesterday {keyword}, help")]
+            assert category in labels, keyword
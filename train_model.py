@@ -1,12 +1,39 @@
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
+from sklearn.base import clone
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import ComplementNB, MultinomialNB
 from sklearn.pipeline import Pipeline
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
 from sklearn.metrics import accuracy_score
+from sklearn.preprocessing import normalize
+from scipy import sparse
+import argparse
 import joblib
+import numpy as np
 import os
 import re
+import tempfile
+import time
+from app.agents import artifact
+from app.agents.inference import NaiveBayesScorer, export_pipeline
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATASET = os.path.join(BASE_DIR, 'app', 'data', 'dataset.csv')
+
+# Streaming mode defaults: rows per chunk, and hashed feature space size
+# (MultinomialNB keeps n_classes x n_features dense arrays, so keep it modest)
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_N_FEATURES = 2 ** 14
+
+# --search grid. Only classifiers with predict_proba: the server ranks diseases
+# by probability, so e.g. LinearSVC can't be served.
+_NGRAMS = {'tfidf__ngram_range': [(1, 1), (1, 2)], 'tfidf__sublinear_tf': [False, True]}
+SEARCH_GRID = [
+    {**_NGRAMS, 'clf': [MultinomialNB()], 'clf__alpha': [0.01, 0.1, 0.5, 1.0]},
+    {**_NGRAMS, 'clf': [ComplementNB()], 'clf__alpha': [0.1, 1.0]},
+    {**_NGRAMS, 'clf': [LogisticRegression(max_iter=1000)], 'clf__C': [1.0, 10.0]},
+]
 
 def clean_text(text):
     """
@@ -18,72 +45,432 @@ def clean_text(text):
     text = re.sub(r'\s+', ' ', text)
     return text
 
-def train():
-    print("🚀 Starting Model Training...")
+def clean_column(column):
+    """clean_text for a whole Series at once (pandas string ops, no Python loop)."""
+    return (column.astype(str).str.lower().str.strip()
+            .str.replace('_', ' ', regex=False)
+            .str.replace(r'\s+', ' ', regex=True))
+
+def build_features(df):
+    """
+    Joins the cleaned, non-empty symptom cells of every row into one string.
+    Works column by column, so the cost is a handful of vectorized ops per
+    symptom column instead of a Python call per row and cell.
+    """
+    symptom_cols = [col for col in df.columns if 'Symptom' in col]
+    features = pd.Series('', index=df.index, dtype=object)
+    for col in symptom_cols:
+        present = df[col] != ''
+        features = features + (' ' + clean_column(df[col])).where(present, '')
+    # Every kept cell added a leading separator; drop the first one
+    return features.str[1:]
+
+def canonical_rows(df):
+    """
+    Every CSV row as a canonical symptom set: the IDs of its cleaned symptoms,
+    sorted, so rows that only differ in column order are the same row. Each
+    distinct cell value is cleaned once (categorical codes), not every cell.
+    Returns (symptoms, diseases, keys, inverse, counts):
+        symptoms   cleaned symptom names; a symptom's ID is its position
+        diseases   disease names; a disease's ID is its position
+        keys       (n_unique, 1 + width) ints: disease ID, then the sorted
+                   symptom IDs padded with -1
+        inverse    the unique row of every CSV row
+        counts     how many CSV rows each unique row stands for
+    """
+    symptom_cols = [col for col in df.columns if 'Symptom' in col]
+    symptom_ids = {}
+    ids = np.empty((len(df), len(symptom_cols)), dtype=np.int32)
+    for j, col in enumerate(symptom_cols):
+        column = df[col].astype('category')
+        # Code -1 (missing) picks the trailing -1
+        lookup = np.array([symptom_ids.setdefault(name, len(symptom_ids)) if name else -1
+                           for name in map(clean_text, column.cat.categories)] + [-1], dtype=np.int32)
+        ids[:, j] = lookup[column.cat.codes.to_numpy()]
+    ids.sort(axis=1)
+
+    disease_column = df['Disease'].astype('category')
+    diseases = [str(d) for d in disease_column.cat.categories] + ['']  # '' for a missing label
+    disease_ids = disease_column.cat.codes.to_numpy().astype(np.int32)
+    disease_ids[disease_ids < 0] = len(diseases) - 1
+
+    keys, inverse, counts = np.unique(np.column_stack([disease_ids, ids]), axis=0,
+                                      return_inverse=True, return_counts=True)
+    return list(symptom_ids), diseases, keys, inverse.ravel(), counts
 
-    # 1. Setup File Paths (RELATIVE TO THE MAIN FOLDER)
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Path to dataset: app/data/dataset.csv
-    dataset_path = os.path.join(base_dir, 'app', 'data', 'dataset.csv')
-    
+def symptom_matrix(keys, n_symptoms):
+    """CSR (n_rows, n_symptoms) of symptom counts, built straight from the padded ID rows."""
+    ids = keys[:, 1:]
+    present = ids >= 0
+    indptr = np.concatenate([[0], np.cumsum(present.sum(axis=1))])
+    return sparse.csr_matrix((np.ones(int(indptr[-1])), ids[present], indptr), shape=(len(keys), n_symptoms))
+
+def symptom_texts(keys, symptoms):
+    """The feature text of each unique row, as build_features would write it (order aside)."""
+    return [' '.join(symptoms[i] for i in row[1:] if i >= 0) for row in keys]
+
+def fit_deduplicated(keys, counts, symptoms, diseases):
+    """
+    The TF-IDF + Naive Bayes pipeline `train` fits, fitted on unique rows
+    weighted by how often they occur. Each distinct symptom is tokenized
+    once; a row's term counts are its symptom IDs times that symptom x term
+    matrix. IDF document frequencies are weighted by the counts as well, so
+    the model is the one the full CSV would give.
+    """
+    rows = symptom_matrix(keys, len(symptoms))
+    used = np.flatnonzero(np.asarray(rows.sum(axis=0)).ravel())
+    counter = CountVectorizer(stop_words='english')
+    terms = counter.fit_transform([symptoms[i] for i in used])
+    X = (rows[:, used] @ terms).tocsr()
+
+    n_docs = counts.sum()
+    doc_freq = (X > 0).T @ counts
+    # TfidfVectorizer's smooth_idf formula
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+    X = normalize(X @ sparse.diags(idf), norm='l2')
+
+    vectorizer = TfidfVectorizer(stop_words='english')
+    vectorizer.vocabulary_ = counter.vocabulary_
+    vectorizer.idf_ = idf
+    clf = MultinomialNB().fit(X, np.asarray(diseases, dtype=object)[keys[:, 0]], sample_weight=counts)
+    return Pipeline([('tfidf', vectorizer), ('clf', clf)])
+
+def default_model_dir():
     # Path to save model: app/ml_models/symptom_model.pkl
     # (We check if 'app/ml_models' exists, if not we try just 'ml_models')
-    model_dir = os.path.join(base_dir, 'app', 'ml_models')
+    model_dir = os.path.join(BASE_DIR, 'app', 'ml_models')
     if not os.path.exists(model_dir):
         # Fallback: maybe the folder is in the root?
-        model_dir = os.path.join(base_dir, 'ml_models')
+        model_dir = os.path.join(BASE_DIR, 'ml_models')
         os.makedirs(model_dir, exist_ok=True) # Create it if it doesn't exist
-        
-    model_save_path = os.path.join(model_dir, 'symptom_model.pkl')
+    return model_dir
 
-    # 2. Load Data
-    if not os.path.exists(dataset_path):
-        print(f"❌ Error: Dataset not found at {dataset_path}")
-        print("Please check that 'dataset.csv' is inside the 'app/data' folder.")
-        return
+def _check_dataset(dataset_path):
+    if os.path.exists(dataset_path):
+        print(f"📂 Loading dataset from: {dataset_path}")
+        return True
+    print(f"❌ Error: Dataset not found at {dataset_path}")
+    print("Please check that 'dataset.csv' is inside the 'app/data' folder.")
+    return False
+
+def train(dataset_path=DEFAULT_DATASET, model_dir=None, dedup=True):
+    """
+    Trains the TF-IDF + Naive Bayes pipeline on the whole CSV. Returns the test accuracy.
+    With `dedup` (default) repeated symptom sets are trained on once, weighted
+    by their count; the model and the accuracy are the same.
+    """
+    print("🚀 Starting Model Training...")
+
+    # 1. Load Data
+    if not _check_dataset(dataset_path):
+        return None
+    if dedup:
+        # Categorical columns: each distinct cell string is stored once
+        return _train_deduplicated(pd.read_csv(dataset_path, dtype='category'), model_dir)
 
-    print(f"📂 Loading dataset from: {dataset_path}")
     df = pd.read_csv(dataset_path)
-    
+
     # Fill NaN values
     df = df.fillna('')
 
-    # 3. Preprocess Data
+    # 2. Preprocess Data
     print("⚙️  Preprocessing symptom data...")
-    symptom_cols = [col for col in df.columns if 'Symptom' in col]
-    
-    def combine_symptoms(row):
-        symptoms = [str(row[c]) for c in symptom_cols if row[c] != '']
-        cleaned_symptoms = [clean_text(s) for s in symptoms]
-        return " ".join(cleaned_symptoms)
-
-    df['features'] = df.apply(combine_symptoms, axis=1)
-    
-    X = df['features']
+    X = build_features(df)
     y = df['Disease']
 
-    # 4. Create Pipeline
+    # 3. Create Pipeline
     pipeline = Pipeline([
         ('tfidf', TfidfVectorizer(stop_words='english')),
         ('clf', MultinomialNB())
     ])
 
-    # 5. Train Model
+    # 4. Train Model
     print(f"🧠 Training on {len(df)} records...")
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
+
     pipeline.fit(X_train, y_train)
 
-    # 6. Evaluate
+    # 5. Evaluate
     predictions = pipeline.predict(X_test)
     accuracy = accuracy_score(y_test, predictions)
     print(f"✅ Model Accuracy: {accuracy * 100:.2f}%")
 
-    # 7. Save Model
+    # 6. Save Model (+ lean inference arrays, parity-checked against sklearn)
+    save_model(pipeline, model_dir or default_model_dir(), X_test)
+    print("🎉 Training Complete!")
+    return accuracy
+
+def _train_deduplicated(df, model_dir):
+    # 2. Canonical symptom sets, deduplicated
+    print("⚙️  Preprocessing symptom data...")
+    symptoms, diseases, keys, inverse, counts = canonical_rows(df)
+    print(f"🧬 {len(df)} records -> {len(keys)} unique disease/symptom sets")
+
+    # 3. Same split as the row-by-row path, then each side deduplicated
+    train_rows, test_rows = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+    train_ids, train_counts = np.unique(inverse[train_rows], return_counts=True)
+    test_ids, test_counts = np.unique(inverse[test_rows], return_counts=True)
+
+    # 4. Train Model
+    print(f"🧠 Training on {len(train_rows)} records ({len(train_ids)} unique, weighted)...")
+    pipeline = fit_deduplicated(keys[train_ids], train_counts, symptoms, diseases)
+
+    # 5. Evaluate: every unique test row counts as many times as it occurs
+    X_test = symptom_texts(keys[test_ids], symptoms)
+    y_test = np.asarray(diseases, dtype=object)[keys[test_ids, 0]]
+    accuracy = accuracy_score(y_test, pipeline.predict(X_test), sample_weight=test_counts)
+    print(f"✅ Model Accuracy: {accuracy * 100:.2f}%")
+
+    # 6. Save Model (+ lean inference arrays, parity-checked against sklearn)
+    save_model(pipeline, model_dir or default_model_dir(), X_test)
+    print("🎉 Training Complete!")
+    return accuracy
+
+def iter_chunks(dataset_path, chunksize):
+    """Yields the CSV as DataFrames of at most `chunksize` rows, NaN filled with ''."""
+    for chunk in pd.read_csv(dataset_path, chunksize=chunksize, dtype=str):
+        yield chunk.fillna('')
+
+def _holdout_mask(n_rows, chunk_no, test_size, random_state):
+    # Seeded per chunk, so every pass over the file picks the same test rows
+    rng = np.random.default_rng([random_state, chunk_no])
+    return rng.random(n_rows) < test_size
+
+def train_streaming(dataset_path=DEFAULT_DATASET, model_dir=None, chunksize=DEFAULT_CHUNKSIZE,
+                    n_features=DEFAULT_N_FEATURES, test_size=0.2, random_state=42):
+    """
+    Trains chunk by chunk so memory stays bounded by `chunksize`, whatever the
+    size of the CSV. TF-IDF needs the whole corpus up front, so this mode uses
+    a stateless HashingVectorizer and MultinomialNB.partial_fit instead.
+
+    Three passes over the file: the label set, training, and the held-out
+    rows (the same ~test_size share of every chunk). Returns the test accuracy.
+    """
+    print(f"🚀 Starting streaming training (chunks of {chunksize:,} rows)...")
+    if not _check_dataset(dataset_path):
+        return None
+
+    # 1. partial_fit needs every label on the first call
+    labels = set()
+    for chunk in pd.read_csv(dataset_path, usecols=['Disease'], chunksize=chunksize, dtype=str):
+        labels.update(chunk['Disease'].dropna())
+    classes = np.array(sorted(labels), dtype=object)
+    print(f"🏷️  {len(classes)} diseases found")
+
+    pipeline = Pipeline([
+        ('hash', HashingVectorizer(stop_words='english', n_features=n_features,
+                                   alternate_sign=False, norm='l2')),
+        ('clf', MultinomialNB())
+    ])
+    vectorizer = pipeline.named_steps['hash']
+    clf = pipeline.named_steps['clf']
+
+    # 2. Train incrementally
+    n_train = 0
+    for chunk_no, chunk in enumerate(iter_chunks(dataset_path, chunksize)):
+        rows = chunk[~_holdout_mask(len(chunk), chunk_no, test_size, random_state)]
+        rows = rows[rows['Disease'] != '']
+        if rows.empty:
+            continue
+        clf.partial_fit(vectorizer.transform(build_features(rows)), rows['Disease'], classes=classes)
+        n_train += len(rows)
+        print(f"🧠 Chunk {chunk_no + 1}: trained on {n_train:,} records so far")
+
+    if not n_train:
+        print("❌ Error: No training rows found.")
+        return None
+
+    # 3. Evaluate on the held-out rows
+    correct = total = 0
+    for chunk_no, chunk in enumerate(iter_chunks(dataset_path, chunksize)):
+        rows = chunk[_holdout_mask(len(chunk), chunk_no, test_size, random_state)]
+        rows = rows[rows['Disease'] != '']
+        if rows.empty:
+            continue
+        predictions = pipeline.predict(build_features(rows))
+        correct += int((predictions == rows['Disease'].to_numpy()).sum())
+        total += len(rows)
+
+    accuracy = correct / total if total else float('nan')
+    print(f"✅ Model Accuracy: {accuracy * 100:.2f}% ({total:,} held-out records)")
+
+    # 4. Save Model. Hashed features can't be exported to the NumPy scorer,
+    #    so this also clears arrays left behind by an earlier TF-IDF model.
+    save_model(pipeline, model_dir or default_model_dir(), [])
+    print("🎉 Training Complete!")
+    return accuracy
+
+def _describe(params):
+    clf = params['clf']
+    args = {k.split('__', 1)[1]: v for k, v in params.items() if k.startswith('clf__')}
+    clf_desc = f"{type(clf).__name__}({', '.join(f'{k}={v}' for k, v in args.items())})"
+    return f"{clf_desc} ngram={params['tfidf__ngram_range']} sublinear_tf={params['tfidf__sublinear_tf']}"
+
+def serving_model(pipeline, tmp_dir):
+    """What the server would actually run: the NumPy scorer when the pipeline exports, else sklearn."""
+    arrays_path = os.path.join(tmp_dir, 'candidate.npz')
+    if export_pipeline(pipeline, arrays_path):
+        return NaiveBayesScorer.load(arrays_path), 'numpy'
+    return pipeline, 'sklearn'
+
+def measure_latency(model, texts):
+    """Median seconds for one single-message predict_proba call (how the API scores)."""
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        model.predict_proba([text])
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def search(dataset_path=DEFAULT_DATASET, model_dir=None, cv=5, tolerance=0.005, n_jobs=-1,
+           latency_samples=200):
+    """
+    Cross-validated grid search over SEARCH_GRID on all cores, then picks the
+    candidate that is cheapest to serve among those within `tolerance` of the
+    best CV accuracy. Writes the leaderboard CSV and the winning model.
+    """
+    print("🔎 Starting hyperparameter search...")
+    if not _check_dataset(dataset_path):
+        return None
+    df = pd.read_csv(dataset_path).fillna('')
+    X = build_features(df)
+    y = df['Disease']
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model_dir = model_dir or default_model_dir()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. CV grid. The pipeline memory caches each fitted TF-IDF per
+        #    (vectorizer params, fold) on disk, so the loky workers reuse it
+        #    for every classifier/alpha instead of refitting it.
+        cached = Pipeline([
+            ('tfidf', TfidfVectorizer(stop_words='english')),
+            ('clf', MultinomialNB())
+        ], memory=joblib.Memory(os.path.join(tmp_dir, 'cache'), verbose=0))
+        folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42)
+        grid = GridSearchCV(cached, SEARCH_GRID, cv=folds, scoring='accuracy', n_jobs=n_jobs, refit=False)
+
+        n_candidates = sum(int(np.prod([len(v) for v in g.values()])) for g in SEARCH_GRID)
+        print(f"🧠 {n_candidates} candidates x {cv} folds on {len(X_train)} records...")
+        with joblib.parallel_config(backend='loky'):
+            grid.fit(X_train, y_train)
+
+        results = grid.cv_results_
+        leaderboard = pd.DataFrame({
+            'candidate': [_describe(p) for p in results['params']],
+            'cv_accuracy': results['mean_test_score'],
+            'cv_std': results['std_test_score'],
+            'fit_seconds': results['mean_fit_time'],
+            'test_accuracy': np.nan,
+            'latency_ms': np.nan,
+            'serving': '',
+        })
+
+        # 2. Serving cost of the finalists: refit on the training split and
+        #    time single-message scoring with the model the server would load.
+        best_cv = leaderboard['cv_accuracy'].max()
+        finalists = leaderboard.index[leaderboard['cv_accuracy'] >= best_cv - tolerance]
+        probe = list(X_test.iloc[:latency_samples])
+        fitted = {}
+        for i in finalists:
+            params = {k: clone(v, safe=False) for k, v in results['params'][i].items()}
+            pipeline = clone(cached).set_params(memory=None, **params)
+            pipeline.fit(X_train, y_train)
+            model, kind = serving_model(pipeline, tmp_dir)
+            leaderboard.loc[i, 'test_accuracy'] = accuracy_score(y_test, pipeline.predict(X_test))
+            leaderboard.loc[i, 'latency_ms'] = measure_latency(model, probe) * 1000
+            leaderboard.loc[i, 'serving'] = kind
+            fitted[i] = pipeline
+
+    # 3. Fastest finalist wins; CV accuracy breaks ties
+    ranked = leaderboard.loc[finalists].sort_values(['latency_ms', 'cv_accuracy'], ascending=[True, False])
+    winner = ranked.index[0]
+    leaderboard = leaderboard.sort_values(['cv_accuracy', 'latency_ms'], ascending=[False, True])
+
+    leaderboard_path = os.path.join(model_dir, 'symptom_model_search.csv')
+    leaderboard.to_csv(leaderboard_path, index=False)
+    print(leaderboard.head(10).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print(f"📋 Leaderboard ({len(leaderboard)} candidates) saved to: {leaderboard_path}")
+
+    row = leaderboard.loc[winner]
+    print(f"🏆 Winner: {row['candidate']} | CV {row['cv_accuracy'] * 100:.2f}% | "
+          f"test {row['test_accuracy'] * 100:.2f}% | {row['latency_ms']:.3f} ms/message ({row['serving']}) "
+          f"- fastest of {len(finalists)} within {tolerance * 100:.2f}% of the best CV accuracy")
+
+    save_model(fitted[winner], model_dir, X_test)
+    print("🎉 Search Complete!")
+    return leaderboard
+
+def save_model(pipeline, model_dir, X_check):
+    model_save_path = os.path.join(model_dir, 'symptom_model.pkl')
     joblib.dump(pipeline, model_save_path)
     print(f"💾 Model saved to: {model_save_path}")
-    print("🎉 Training Complete!")
+    export_inference_arrays(pipeline, model_save_path, X_check)
+    build_artifact(model_dir)
+
+def build_artifact(model_dir):
+    """Recompiles the serving artifact so it picks up the new model."""
+    try:
+        path = artifact.build(model_dir=model_dir)
+    except Exception as e:
+        print(f"⚠️  Artifact not rebuilt ({e}); the server will read the CSVs and model files.")
+        return None
+    print(f"📦 Serving artifact saved to: {path}")
+    return path
+
+def export_inference_arrays(pipeline, model_save_path, X_check):
+    """
+    Writes symptom_model.npz next to the pickle so the server can score with
+    NumPy only. The export is verified against the sklearn pipeline and
+    removed again if the two disagree.
+    """
+    arrays_path = os.path.splitext(model_save_path)[0] + '.npz'
+
+    if not export_pipeline(pipeline, arrays_path):
+        # Don't leave arrays from an older model lying around
+        if os.path.exists(arrays_path):
+            os.remove(arrays_path)
+        print("ℹ️  Pipeline can't be exported to NumPy arrays; the server will use the pickle.")
+        return False
+
+    scorer = NaiveBayesScorer.load(arrays_path)
+    texts = list(X_check)
+    expected = pipeline.predict_proba(texts)
+    actual = scorer.predict_proba(texts)
+
+    if list(scorer.classes_) != list(pipeline.classes_) or not np.allclose(actual, expected, rtol=0, atol=1e-9):
+        os.remove(arrays_path)
+        print("❌ Parity check failed: NumPy scorer disagrees with the sklearn pipeline. Export removed.")
+        return False
+
+    print(f"⚡ Inference arrays saved to: {arrays_path} "
+          f"(parity OK on {len(texts)} rows, max diff {np.abs(actual - expected).max():.2e})")
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the MediAssist symptom model.")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="CSV with Disease + Symptom_* columns")
+    parser.add_argument("--model-dir", default=None, help="Where to write symptom_model.pkl/.npz")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--streaming", action="store_true",
+                      help="Read the CSV in chunks and train incrementally (for corpora that don't fit in memory)")
+    mode.add_argument("--search", action="store_true",
+                      help="Cross-validated hyperparameter search; keeps the cheapest-to-serve near-best model")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Train on every CSV row instead of the unique symptom sets with sample weights")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk in --streaming mode")
+    parser.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES,
+                        help="Hashed feature space size in --streaming mode")
+    parser.add_argument("--cv", type=int, default=5, help="Folds in --search mode")
+    parser.add_argument("--tolerance", type=float, default=0.005,
+                        help="--search: CV accuracy a faster model may give up vs the best (0.005 = 0.5 points)")
+    parser.add_argument("--jobs", type=int, default=-1, help="--search worker processes (-1 = all cores)")
+    args = parser.parse_args(argv)
+
+    if args.search:
+        return search(args.dataset, args.model_dir, args.cv, args.tolerance, args.jobs)
+    if args.streaming:
+        return train_streaming(args.dataset, args.model_dir, args.chunksize, args.n_features)
+    return train(args.dataset, args.model_dir, dedup=not args.no_dedup)
 
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+    main()
\ No newline at end of file